@@ -0,0 +1,48 @@
+"""Mede o ganho da associação residência-ponto em tiles paralelos de 1 até N processos.
+
+Uso:
+	python benchmarks/benchmark_associador_paralelo.py --residencias 500000 --pontos 5000 --workers 8
+"""
+
+import argparse
+import os
+import time
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from quali_bus.utils.associador import Associador
+
+
+def gerar_dados(n_residencias: int, n_pontos: int, semente: int = 0) -> tuple[pd.DataFrame, gpd.GeoDataFrame, pd.DataFrame]:
+	"""Gera pontos de ônibus e residências sintéticos em uma região do tamanho de um estado."""
+	rng = np.random.default_rng(semente)
+	limites_lon, limites_lat = (-46.0, -42.0), (-18.0, -15.0)
+	pontos = pd.DataFrame({"longitude": rng.uniform(*limites_lon, n_pontos), "latitude": rng.uniform(*limites_lat, n_pontos)})
+	residencias = pd.DataFrame({"longitude": rng.uniform(*limites_lon, n_residencias), "latitude": rng.uniform(*limites_lat, n_residencias)})
+	return pontos, gpd.GeoDataFrame({"id_linha": []}, geometry=[], crs=Associador.EARTH_CRS), residencias
+
+
+def main():
+	"""Executa o benchmark e imprime o tempo e o ganho em relação a um único processo."""
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--residencias", type=int, default=500_000)
+	parser.add_argument("--pontos", type=int, default=5_000)
+	parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+	parser.add_argument("--tamanho-tile", type=float, default=Associador.TAMANHO_TILE)
+	args = parser.parse_args()
+
+	associador = Associador(*gerar_dados(args.residencias, args.pontos))
+
+	tempo_base = None
+	for n_workers in range(1, args.workers + 1):
+		inicio = time.perf_counter()
+		associador.associar_residencias_a_pontos_em_paralelo(n_workers=n_workers, tamanho_tile=args.tamanho_tile)
+		tempo = time.perf_counter() - inicio
+		tempo_base = tempo_base or tempo
+		print(f"workers={n_workers:>3}  tempo={tempo:8.3f}s  ganho={tempo_base / tempo:5.2f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -17,7 +17,7 @@ def viagens_por_rota(df: pd.DataFrame) -> pd.Series:
 		102      30
 		103      20
 	"""
-	return df.groupby("id_linha")["empresa"].count()
+	return df.groupby("id_linha", observed=True)["empresa"].count()
 
 
 def media_passageiros_por_rota(df: pd.DataFrame) -> pd.Series:
@@ -36,7 +36,7 @@ def media_passageiros_por_rota(df: pd.DataFrame) -> pd.Series:
 		102      30.5
 		103      22.3
 	"""
-	return df.groupby("id_linha")["qtpsg"].mean()
+	return df.groupby("id_linha", observed=True)["qtpsg"].mean()
 
 
 def valor_arrecadado_por_rota(df: pd.DataFrame) -> pd.Series:
@@ -55,7 +55,7 @@ def valor_arrecadado_por_rota(df: pd.DataFrame) -> pd.Series:
 		102      8500.5
 		103      9200.2
 	"""
-	return df.groupby("id_linha")["valor_jornada"].sum()
+	return df.groupby("id_linha", observed=True)["valor_jornada"].sum()
 
 
 def tempo_medio_operacao(df: pd.DataFrame) -> pd.Series:
@@ -74,7 +74,7 @@ def tempo_medio_operacao(df: pd.DataFrame) -> pd.Series:
 		102     37.5
 		103     50.2
 	"""
-	return df.groupby("id_linha")["duracao"].mean()
+	return df.groupby("id_linha", observed=True)["duracao"].mean()
 
 
 def demanda_comparativa(df: pd.DataFrame) -> pd.Series:
@@ -93,7 +93,7 @@ def demanda_comparativa(df: pd.DataFrame) -> pd.Series:
 		101     2500
 		102     2000
 	"""
-	return df.groupby("id_linha")["qtpsg"].sum().sort_values(ascending=False)
+	return df.groupby("id_linha", observed=True)["qtpsg"].sum().sort_values(ascending=False)
 
 
 def comparacao_valores(df: pd.DataFrame) -> pd.Series:
@@ -112,7 +112,7 @@ def comparacao_valores(df: pd.DataFrame) -> pd.Series:
 		101     12000.5
 		102      9500.0
 	"""
-	return df.groupby("id_linha")["valor_jornada"].sum().sort_values(ascending=False)
+	return df.groupby("id_linha", observed=True)["valor_jornada"].sum().sort_values(ascending=False)
 
 
 def agrupar_por_dia(df: pd.DataFrame) -> pd.DataFrame:
@@ -130,7 +130,7 @@ def agrupar_por_dia(df: pd.DataFrame) -> pd.DataFrame:
 		0  2023-01-01  101     100      1500.0
 		1  2023-01-02  102      80      1200.0
 	"""
-	return df.groupby(["data", "id_linha"])[["qtpsg", "valor_jornada"]].sum().reset_index()
+	return df.groupby(["data", "id_linha"], observed=True)[["qtpsg", "valor_jornada"]].sum().reset_index()
 
 
 def agrupar_duracao_por_mes(df: pd.DataFrame) -> pd.DataFrame:
@@ -150,4 +150,4 @@ def agrupar_duracao_por_mes(df: pd.DataFrame) -> pd.DataFrame:
 		2   2     103      45.2
 	"""
 	df["mes"] = df["data"].dt.month
-	return df.groupby(["mes", "id_linha"])["duracao_minutos"].mean().reset_index()
+	return df.groupby(["mes", "id_linha"], observed=True)["duracao_minutos"].mean().reset_index()
@@ -1,14 +1,32 @@
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import reduce
+from typing import Iterable, Optional
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-from shapely.geometry import LineString, Point
-from shapely.wkt import loads
+import shapely
 
-from ..utils import Associador, modelos
-from ..utils.cores import cor_iqt
+from ..utils import Associador, CacheAssociacoes, comprimentos_geodesicos, converter_unicos, duracao_em_segundos, modelos, otimizar_memoria
+from ..utils.cores import cores_iqt
+from .carregadar_dados import COLUNAS_ENTRADA, ler_tabela
 from .classificar_indicadores import ClassificarIndicadores
+from .grafo_indicadores import GrafoIndicadores
+
+
+def _associar_geometrias(df_pontos_onibus: pd.DataFrame, dados_linhas: gpd.GeoDataFrame, df_residencias: pd.DataFrame):
+	"""Executa a etapa de associações geográficas; função de módulo para poder ser enviada a um pool de processos."""
+	associador = Associador(df_pontos_onibus, dados_linhas, df_residencias)
+	return associador, associador.consolidar_associacoes()
+
+
+def _executar_etapa(metodo: str, df: pd.DataFrame, perfil_memoria: bool) -> pd.DataFrame:
+	"""Executa uma etapa de carga em uma instância nova, que só leva o perfil de memória (tipo de 'id_linha').
+
+	Função de módulo para que o pool de processos não precise serializar a instância original,
+	cujo grafo de indicadores guarda funções locais.
+	"""
+	return getattr(CalcularIndicadores(perfil_memoria=perfil_memoria), metodo)(df)
 
 
 class CalcularIndicadores:
@@ -20,10 +38,16 @@ class CalcularIndicadores:
 	infraestrutura e atendimento.
 	"""
 
-	def __init__(self):
+	def __init__(self, perfil_memoria: bool = False):
 		"""
 		Inicializa a classe com os valores predefinidos dos indicadores e suas prioridades.
+
+		Args:
+			perfil_memoria (bool): Se True, as entradas de `carregar_dados` passam por `otimizar_memoria`
+				(chaves e enumerações como categorias, numéricos reduzidos, horários de jornada em
+				segundos) e 'id_linha' permanece categórico em todas as etapas.
 		"""
+		self.perfil_memoria = perfil_memoria
 		self.indicadores_prioridades = {
 			"nomeclatura": ["I1", "I2", "I3", "I4", "I5", "I6", "I7", "I8", "I9", "I10"],
 			"prioridade": [0.1526, 0.1121, 0.0997, 0.2269, 0.0992, 0.0831, 0.0954, 0.0756, 0.0277, 0.0277],
@@ -41,30 +65,266 @@ class CalcularIndicadores:
 			],
 		}
 
-	def carregar_dados(self, df_linhas: pd.DataFrame, df_frequencia: pd.DataFrame, df_pontualidade: pd.DataFrame):
+	TIPOS_POOL = ("thread", "processo")
+
+	def carregar_dados(
+		self,
+		df_linhas: pd.DataFrame,
+		df_frequencia: pd.DataFrame,
+		df_pontualidade: pd.DataFrame,
+		df_pontos_onibus: Optional[pd.DataFrame] = None,
+		df_residencias: Optional[pd.DataFrame] = None,
+		n_workers: int = 1,
+		tipo_pool: str = "thread",
+	):
 		"""Carrega todos os dados necessários para o cálculo dos indicadores.
 
+		Frequência, pontualidade, cumprimento e, se os pontos de ônibus forem informados, as
+		associações geográficas são etapas independentes entre si. Com `n_workers` > 1 elas são
+		executadas simultaneamente em um pool, e o tempo total tende ao da etapa mais lenta.
+
 		Args:
 			df_linhas (pd.DataFrame): DataFrame contendo os dados das linhas de transporte.
 			df_frequencia (pd.DataFrame): DataFrame contendo os dados de frequência de atendimento.
-			df_pontualidade (pd.DataFrame): DataFrame contendo os dados de pontualidade.
-			df_cumprimento (pd.DataFrame): DataFrame contendo os dados de cumprimento de itinerário.
+			df_pontualidade (pd.DataFrame): DataFrame contendo os dados de pontualidade e de cumprimento de itinerário.
+			df_pontos_onibus (Optional[pd.DataFrame]): Pontos de ônibus. Se informado, também executa `carregar_dados_geometrias`.
+			df_residencias (Optional[pd.DataFrame]): Residências usadas com `df_pontos_onibus`.
+			n_workers (int): Número de workers do pool. Default (1) executa as etapas em sequência.
+			tipo_pool (str): "thread" ou "processo". Processos evitam a disputa pelo GIL, mas
+				copiam os DataFrames de entrada para cada worker.
 		"""
+		if tipo_pool not in self.TIPOS_POOL:
+			raise ValueError(f"Tipo de pool inválido: {tipo_pool}. Use um de {self.TIPOS_POOL}.")
+
+		if self.perfil_memoria:
+			df_linhas = otimizar_memoria(df_linhas)
+			df_frequencia = otimizar_memoria(df_frequencia, colunas_horario=["horario_inicio_jornada", "horario_fim_jornada"])
+			df_pontualidade = otimizar_memoria(df_pontualidade)
+
 		self.dados_linhas = self.carregar_dados_linha(df_linhas)
-		self.frequencia = self.carregar_frequencia_atendimento_pontuacao(df_frequencia)
-		self.pontualidade = self.carregar_pontualidade(df_pontualidade)
-		self.cumprimento = self.carregar_cumprimento(df_pontualidade)
 
-	def carregar_dados_geometrias(self, df_pontos_onibus: pd.DataFrame, df_residencias: pd.DataFrame):
+		etapas = {
+			"frequencia": (_executar_etapa, "carregar_frequencia_atendimento_pontuacao", df_frequencia, self.perfil_memoria),
+			"pontualidade": (_executar_etapa, "carregar_pontualidade", df_pontualidade, self.perfil_memoria),
+			"cumprimento": (_executar_etapa, "carregar_cumprimento", df_pontualidade, self.perfil_memoria),
+		}
+		if df_pontos_onibus is not None:
+			etapas["geometrias"] = (_associar_geometrias, df_pontos_onibus, self.dados_linhas.copy(), df_residencias)
+
+		if n_workers == 1:
+			resultados = {nome: funcao(*argumentos) for nome, (funcao, *argumentos) in etapas.items()}
+		else:
+			tipo_executor = ThreadPoolExecutor if tipo_pool == "thread" else ProcessPoolExecutor
+			with tipo_executor(max_workers=min(n_workers, len(etapas))) as executor:
+				futuros = {nome: executor.submit(funcao, *argumentos) for nome, (funcao, *argumentos) in etapas.items()}
+				resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
+
+		self.frequencia = resultados["frequencia"]
+		self.pontualidade = resultados["pontualidade"]
+		self.cumprimento = resultados["cumprimento"]
+		if "geometrias" in resultados:
+			self.associador, self.dados_geograficos = resultados["geometrias"]
+
+	def carregar_dados_arquivos(self, caminho_linhas: str, caminho_frequencia: str, caminho_pontualidade: str, **opcoes):
+		"""Lê as entradas de arquivos Parquet, Feather ou CSV e carrega os dados com `carregar_dados`.
+
+		De cada arquivo são lidas apenas as colunas usadas pelos indicadores (`COLUNAS_ENTRADA`).
+
+		Args:
+			caminho_linhas (str): Arquivo com os dados das linhas de transporte.
+			caminho_frequencia (str): Arquivo com os dados de frequência de atendimento.
+			caminho_pontualidade (str): Arquivo com os dados de pontualidade e cumprimento.
+			**opcoes: Demais argumentos de `carregar_dados` (ex.: `n_workers`).
+		"""
+		self.carregar_dados(
+			ler_tabela(caminho_linhas, COLUNAS_ENTRADA["linhas"]),
+			ler_tabela(caminho_frequencia, COLUNAS_ENTRADA["frequencia"]),
+			ler_tabela(caminho_pontualidade, COLUNAS_ENTRADA["pontualidade"]),
+			**opcoes,
+		)
+
+	def carregar_dados_geometrias(self, df_pontos_onibus: pd.DataFrame, df_residencias: pd.DataFrame, diretorio_cache: Optional[str] = None):
 		"""Carrega os dados geométricos de pontos de ônibus e residências.
 
 		Args:
 			df_pontos_onibus (pd.DataFrame): DataFrame contendo os dados dos pontos de ônibus.
 			df_residencias (pd.DataFrame): DataFrame contendo os dados das residências.
+			diretorio_cache (Optional[str]): Diretório do cache das associações. Se informado,
+				entradas inalteradas reaproveitam as associações calculadas em execuções anteriores.
 		"""
-		self.associador = Associador(df_pontos_onibus, self.dados_linhas.copy(), df_residencias)
+		cache = CacheAssociacoes(diretorio_cache) if diretorio_cache is not None else None
+		self.associador = Associador(df_pontos_onibus, self.dados_linhas.copy(), df_residencias, cache=cache)
 		self.dados_geograficos = self.associador.consolidar_associacoes()
 
+	def carregar_dados_geometrias_em_lotes(self, df_pontos_onibus: pd.DataFrame, lotes_residencias: Iterable[pd.DataFrame]):
+		"""Carrega os dados geométricos processando as residências em lotes.
+
+		Útil para cadastros de endereços que não cabem em memória, por exemplo
+		`pd.read_csv(caminho, chunksize=500_000)`.
+
+		Args:
+			df_pontos_onibus (pd.DataFrame): DataFrame contendo os dados dos pontos de ônibus.
+			lotes_residencias (Iterable[pd.DataFrame]): Lotes com as coordenadas das residências.
+		"""
+		self.associador = Associador(df_pontos_onibus, self.dados_linhas.copy())
+		self.dados_geograficos = self.associador.consolidar_associacoes_em_lotes(lotes_residencias)
+
+	# Nó do grafo que fornece a coluna de entrada de cada indicador
+	ORIGEM_INDICADORES = {
+		"I1": "dados_linhas",
+		"I2": "dados_geograficos",
+		"I3": "dados_linhas",
+		"I4": "pontualidade",
+		"I5": "frequencia",
+		"I6": "cumprimento_itinerario",
+		"I7": "dados_geograficos",
+		"I8": "dados_linhas",
+		"I9": "dados_linhas",
+		"I10": "dados_linhas",
+	}
+
+	def preparar_indicadores(
+		self,
+		df_linhas: pd.DataFrame,
+		df_frequencia: pd.DataFrame,
+		df_pontualidade: pd.DataFrame,
+		df_pontos_onibus: Optional[pd.DataFrame] = None,
+		df_residencias: Optional[pd.DataFrame] = None,
+	) -> GrafoIndicadores:
+		"""Monta o grafo de avaliação sob demanda dos indicadores, sem calcular nenhum deles.
+
+		Cada indicador (I1 a I10) e cada etapa intermediária (frequência, pontualidade,
+		cumprimento, associações geográficas) é um nó do grafo. `calcular_indicadores` avalia
+		apenas os nós necessários e memoriza os resultados enquanto o grafo existir.
+
+		Args:
+			df_linhas (pd.DataFrame): DataFrame contendo os dados das linhas de transporte.
+			df_frequencia (pd.DataFrame): DataFrame contendo os dados de frequência de atendimento.
+			df_pontualidade (pd.DataFrame): DataFrame contendo os dados de pontualidade e cumprimento.
+			df_pontos_onibus (Optional[pd.DataFrame]): Pontos de ônibus, necessários para I2 e I7.
+			df_residencias (Optional[pd.DataFrame]): Residências, necessárias para I2 e I7.
+
+		Returns:
+			GrafoIndicadores: Grafo montado, também disponível em `self.grafo`.
+		"""
+		grafo = GrafoIndicadores()
+		grafo.adicionar_entrada("entrada_linhas", df_linhas)
+		grafo.adicionar_entrada("entrada_frequencia", df_frequencia)
+		grafo.adicionar_entrada("entrada_pontualidade", df_pontualidade)
+
+		grafo.registrar("dados_linhas", self.carregar_dados_linha, ["entrada_linhas"], ["id_linha", "geometria_linha"])
+		grafo.registrar(
+			"frequencia",
+			self.carregar_frequencia_atendimento_pontuacao,
+			["entrada_frequencia"],
+			["id_linha", "horario_inicio_jornada", "horario_fim_jornada", "data_jornada"],
+		)
+		grafo.registrar(
+			"pontualidade",
+			self.carregar_pontualidade,
+			["entrada_pontualidade"],
+			["id_linha", "sentido", "descricao_trajeto", "chegada_planejada", "chegada_real", "partida_planejada", "partida_real"],
+		)
+		grafo.registrar("cumprimento", self.carregar_cumprimento, ["entrada_pontualidade"], ["id_linha", "km_executado"])
+		grafo.registrar("distancia_km", self._calcular_distancia_km, ["dados_linhas"], ["id_linha", "geometria_linha"])
+		grafo.registrar(
+			"cumprimento_itinerario", self._calcular_cumprimento_itinerario, ["cumprimento", "distancia_km"], ["km_executado", "distancia_km"]
+		)
+		if df_pontos_onibus is not None:
+			grafo.adicionar_entrada("entrada_pontos_onibus", df_pontos_onibus)
+			grafo.adicionar_entrada("entrada_residencias", df_residencias)
+			grafo.registrar(
+				"dados_geograficos",
+				lambda linhas, pontos, residencias: _associar_geometrias(pontos, linhas.copy(), residencias)[1],
+				["dados_linhas", "entrada_pontos_onibus", "entrada_residencias"],
+				["id_linha", "geometria_linha", "longitude", "latitude"],
+			)
+
+		classificador = ClassificarIndicadores()
+		tipo_id = self._tipo_id_comum(df_linhas["id_linha"], df_frequencia["id_linha"], df_pontualidade["id_linha"])
+		for indicador, coluna in classificador.COLUNAS_INDICADORES.items():
+			grafo.registrar(
+				indicador, self._no_indicador(classificador, indicador, coluna, tipo_id), [self.ORIGEM_INDICADORES[indicador]], ["id_linha", coluna]
+			)
+		nomeclatura = self.indicadores_prioridades["nomeclatura"]
+		grafo.registrar("iqt", self._no_iqt, nomeclatura, ["id_linha"] + nomeclatura)
+
+		self.grafo = grafo
+		return grafo
+
+	@staticmethod
+	def _no_indicador(classificador: ClassificarIndicadores, indicador: str, coluna: str, tipo_id):
+		def calcular(df: pd.DataFrame) -> pd.DataFrame:
+			return pd.DataFrame({
+				"id_linha": df["id_linha"].astype(tipo_id).array,
+				coluna: df[coluna].to_numpy(),
+				indicador: classificador.pontuar_indicador(
+					indicador, df[coluna].to_numpy(), strip=indicador in classificador.INDICADORES_APARADOS_LINHAS
+				),
+			})
+
+		return calcular
+
+	def _no_iqt(self, *indicadores: pd.DataFrame) -> pd.DataFrame:
+		nomeclatura = self.indicadores_prioridades["nomeclatura"]
+		tabela = pd.concat([df.set_index("id_linha")[[nome]] for nome, df in zip(nomeclatura, indicadores, strict=True)], axis=1, join="inner")
+		tabela["iqt"] = self.calcular_iqt_lote(tabela[nomeclatura].to_numpy(dtype=np.float64))
+		return tabela.reset_index()
+
+	def _calcular_distancia_km(self, dados_linhas: gpd.GeoDataFrame) -> pd.DataFrame:
+		return pd.DataFrame({"id_linha": dados_linhas["id_linha"].to_numpy(), "distancia_km": comprimentos_geodesicos(dados_linhas.geometry) / 1000})
+
+	@staticmethod
+	def _calcular_cumprimento_itinerario(cumprimento: pd.DataFrame, distancia_km: pd.DataFrame) -> pd.DataFrame:
+		df_temp = pd.merge(cumprimento, distancia_km, on="id_linha")
+		df_temp["cumprimento_itinerario"] = df_temp["km_executado"] / df_temp["distancia_km"]
+		return df_temp
+
+	def calcular_indicadores(self, indicadores: Iterable[str]) -> pd.DataFrame:
+		"""Calcula sob demanda apenas os indicadores solicitados.
+
+		Requer `preparar_indicadores`. Somente os nós necessários são avaliados, e os resultados
+		intermediários ficam memorizados: pedir "I4" e depois "I4" e "I5" não recalcula a pontualidade.
+
+		Args:
+			indicadores (Iterable[str]): Nomes dos indicadores ("I1" a "I10") e/ou "iqt".
+
+		Returns:
+			pd.DataFrame: Uma linha por 'id_linha' presente em todos os resultados, com as colunas
+			de entrada e as pontuações de cada indicador solicitado.
+
+		Example:
+			>>> calculadora.preparar_indicadores(
+			...     df_linhas, df_freq, df_pont
+			... )
+			>>> calculadora.calcular_indicadores(["I4"])
+		"""
+		if not hasattr(self, "grafo"):
+			raise RuntimeError("Chame preparar_indicadores antes de calcular_indicadores.")
+
+		resultado = None
+		for df in self.grafo.calcular_varios(indicadores).values():
+			if resultado is None:
+				resultado = df
+				continue
+			novas_colunas = ["id_linha"] + [coluna for coluna in df.columns if coluna not in resultado.columns]
+			resultado = pd.merge(resultado, df[novas_colunas], on="id_linha")
+		return resultado if resultado is not None else pd.DataFrame({"id_linha": pd.Series(dtype=self._tipo_id_linha)})
+
+	@property
+	def _tipo_id_linha(self) -> str:
+		"""Tipo de 'id_linha' nos resultados das etapas: categórico no perfil de memória, texto caso contrário."""
+		return "category" if self.perfil_memoria else "string"
+
+	def _tipo_id_comum(self, *colunas: pd.Series):
+		"""Tipo de 'id_linha' para juntar tabelas: no perfil de memória, uma única categoria com a união dos ids; texto caso contrário."""
+		if not self.perfil_memoria:
+			return "string"
+		categorias = [
+			coluna.cat.categories if isinstance(coluna.dtype, pd.CategoricalDtype) else pd.Index(coluna.dropna().unique()) for coluna in colunas
+		]
+		return pd.CategoricalDtype(reduce(pd.Index.union, categorias))
+
 	def carregar_dados_linha(self, df_line: pd.DataFrame) -> gpd.GeoDataFrame:
 		"""
 		Carrega os dados de frequência de atendimento a partir de um DataFrame.
@@ -81,33 +341,66 @@ class CalcularIndicadores:
 
 			df_copy = df_line.copy()
 
-			dados_linhas = gpd.GeoDataFrame(df_copy)
-			if not self._validar_geometry_wkt(dados_linhas).all():
+			# As geometrias são lidas uma única vez; validação e conversão reaproveitam o resultado
+			df_copy["geometria_linha"] = self._ler_geometrias(df_copy["geometria_linha"])
+			if not self._validar_geometry_wkt(df_copy).all():
 				raise
 
-			return self._converter_geometry_para_linestring(dados_linhas)
+			return self._converter_geometry_para_linestring(df_copy)
 		except Exception as error:
 			print("Erro ao carregar dados de linha: ", error)
 			return gpd.GeoDataFrame()
 
+	@staticmethod
+	def _ler_geometrias(valores: Iterable) -> np.ndarray:
+		"""
+		Converte, em lote, uma coluna de geometrias em WKT, WKB ou WKB hexadecimal para objetos Shapely.
+
+		Valores que já são geometrias são mantidos; valores inválidos ou ausentes resultam em None.
+
+		Args:
+			valores (Iterable): Valores da coluna de geometrias.
+
+		Returns:
+			np.ndarray: Array de geometrias Shapely (ou None).
+		"""
+		valores = np.asarray(valores, dtype=object)
+		geometrias = np.full(len(valores), None, dtype=object)
+
+		e_geometria = shapely.is_geometry(valores)
+		geometrias[e_geometria] = valores[e_geometria]
+
+		tipos = pd.Series(valores, dtype=object).map(type)
+		e_texto = tipos.eq(str).to_numpy()
+		e_binario = tipos.isin([bytes, bytearray]).to_numpy()
+		e_hex = np.zeros(len(valores), dtype=bool)
+		e_hex[e_texto] = pd.Series(valores[e_texto], dtype="string").str.fullmatch(r"[0-9A-Fa-f]+").to_numpy(dtype=bool)
+		e_wkt = e_texto & ~e_hex
+
+		geometrias[e_wkt] = shapely.from_wkt(valores[e_wkt], on_invalid="ignore")
+		e_wkb = e_binario | e_hex
+		geometrias[e_wkb] = shapely.from_wkb(valores[e_wkb], on_invalid="ignore")
+		return geometrias
+
 	def _validar_geometry_wkt(self, df, coluna="geometria_linha"):
 		"""
-		Valida se os valores da coluna geometria_linha são strings WKT.
+		Valida se os valores da coluna geometria_linha são LineStrings em WKT, WKB ou WKB hexadecimal.
 
 		Args:
 			df (pd.DataFrame): DataFrame contendo a coluna geometria_linha.
 			coluna (str): Nome da coluna geometria_linha.
 
 		Returns:
-			bool: True se todos os valores forem strings WKT, False caso contrário.
+			pd.Series: True para os valores que representam um LineString válido, False caso contrário.
 		"""
-		return df[coluna].apply(lambda x: isinstance(x, str) and x.startswith("LINESTRING"))
+		geometrias = self._ler_geometrias(df[coluna])
+		return pd.Series(shapely.get_type_id(geometrias) == shapely.GeometryType.LINESTRING, index=df.index)
 
 	def _converter_geometry_para_linestring(
 		self, df: pd.DataFrame, coluna: str = "geometria_linha", crs: Optional[str] = "EPSG:4326"
 	) -> gpd.GeoDataFrame:
 		"""
-		Converte strings WKT em objetos LineString 2D e retorna um GeoDataFrame.
+		Converte geometrias em WKT, WKB ou WKB hexadecimal em objetos LineString 2D e retorna um GeoDataFrame.
 
 		Args:
 			df (pd.DataFrame): DataFrame contendo a coluna geometria_linha.
@@ -125,61 +418,50 @@ class CalcularIndicadores:
 
 		df_copy = df.copy()
 
-		def converter_para_2d(geom):
-			if geom is None:
-				return None
+		df_copy[coluna] = shapely.force_2d(self._ler_geometrias(df_copy[coluna]))
 
-			if isinstance(geom, str):
-				geom = loads(geom)
-
-			coords_2d = [(x, y) for x, y, *_ in geom.coords]
-
-			return LineString(coords_2d)
-
-		df_copy[coluna] = df_copy[coluna].apply(converter_para_2d)  # type: ignore
-
-		df_copy = df_copy.astype({"id_linha": "string"})
+		df_copy = df_copy.astype({"id_linha": self._tipo_id_linha})
 
 		gdf = gpd.GeoDataFrame(data=df_copy, geometry=coluna, crs=crs)  # type: ignore
 		return gdf
 
-	def _cria_geometry_pontos_rota(self, df: gpd.GeoDataFrame, coluna: str = "geometria_linha") -> gpd.GeoDataFrame:
+	def _cria_geometry_pontos_rota(self, df: gpd.GeoDataFrame, coluna: str = "geometria_linha", retornar_arrays: bool = False):
 		"""
 		Cria um geometry com os pontos da LineString e adiciona-os ao DataFrame.
 
+		Os vértices de todas as linhas são extraídos em uma única chamada, junto com o índice da
+		linha de origem, e o resultado é montado diretamente a partir desses arrays.
+
 		Args:
 			df (gpd.GeoDataFrame): GeoDataFrame contendo a coluna 'geometria_linha' que é um LineString.
 			coluna (str): Nome da coluna que contém o LineString.
+			retornar_arrays (bool): Se True, retorna arrays simples em vez de um GeoDataFrame de pontos.
 
 		Returns:
 			gpd.GeoDataFrame: DataFrame com a coluna geometry contendo os pontos da LineString.
+			Com `retornar_arrays=True`, retorna a tupla (id_linha, ponto_ordem, coordenadas), em que
+			`coordenadas` é um array (n, 2) com x e y de cada vértice.
 		"""
 		try:
 			if coluna not in df.columns:
 				raise ValueError(f"Coluna '{coluna}' não encontrada no DataFrame.")
 
-			novo_df_linhas = []
-
-			for idx, row in df.iterrows():
-				linha_geometry = row[coluna]
-
-				if not isinstance(linha_geometry, LineString):
-					print(f"Aviso: A geometria na linha {idx} não é um LineString. Pulando...")
-					continue
+			geometrias = np.asarray(df[coluna], dtype=object)
+			e_linestring = shapely.is_geometry(geometrias)
+			e_linestring[e_linestring] = shapely.get_type_id(geometrias[e_linestring]) == shapely.GeometryType.LINESTRING
+			for idx in df.index[~e_linestring]:
+				print(f"Aviso: A geometria na linha {idx} não é um LineString. Pulando...")
 
-				coords = list(linha_geometry.coords)
+			coordenadas, origem = shapely.get_coordinates(geometrias[e_linestring], return_index=True)
+			quantidades = np.bincount(origem, minlength=int(e_linestring.sum()))
+			inicios = np.cumsum(quantidades) - quantidades
+			ponto_ordem = np.arange(len(origem)) - inicios[origem]
+			id_linha = df["id_linha"].to_numpy()[e_linestring][origem]
 
-				for coord_idx, coord in enumerate(coords):
-					nova_linha = {}
-					nova_linha["id_linha"] = row.to_dict()["id_linha"]
+			if retornar_arrays:
+				return id_linha, ponto_ordem, coordenadas
 
-					nova_linha["geometry"] = Point(coord[0], coord[1])
-
-					nova_linha["ponto_ordem"] = coord_idx
-
-					novo_df_linhas.append(nova_linha)
-
-			gdf_pontos = gpd.GeoDataFrame(novo_df_linhas, crs=32723)  # type: ignore
+			gdf_pontos = gpd.GeoDataFrame({"id_linha": id_linha, "geometry": shapely.points(coordenadas), "ponto_ordem": ponto_ordem}, crs=32723)  # type: ignore
 
 			return gdf_pontos
 
@@ -236,9 +518,9 @@ class CalcularIndicadores:
 
 		df_temp.dropna(subset=["km_executado"], inplace=True)
 		df_temp["km_executado"] = pd.to_numeric(df_temp["km_executado"], errors="coerce")
-		df_temp = df_temp.groupby(["id_linha"])["km_executado"].mean().reset_index()
+		df_temp = df_temp.groupby(["id_linha"], observed=True)["km_executado"].mean().reset_index()
 
-		df_temp = df_temp.astype({"id_linha": "string", "km_executado": "float64"})
+		df_temp = df_temp.astype({"id_linha": self._tipo_id_linha, "km_executado": "float64"})
 
 		return df_temp
 
@@ -248,11 +530,16 @@ class CalcularIndicadores:
 		"""
 		try:
 			df_temp = df_pontualidade.copy()
-			df_temp["sentido"] = df_temp["sentido"].replace({"ida": "IDA", "volta": "VOLTA"})
+			sentidos = {"ida": "IDA", "volta": "VOLTA"}
+			if isinstance(df_temp["sentido"].dtype, pd.CategoricalDtype):
+				# Em colunas categóricas o mapeamento é aplicado apenas às categorias
+				df_temp["sentido"] = df_temp["sentido"].map(lambda sentido: sentidos.get(sentido, sentido))
+			else:
+				df_temp["sentido"] = df_temp["sentido"].replace(sentidos)
 			df_temp = df_temp.drop("descricao_trajeto", axis=1)
 			df_temp.replace("-", pd.NA, inplace=True)
 			df_temp["com_horario"] = df_temp[["chegada_planejada", "chegada_real", "partida_planejada", "partida_real"]].notna().any(axis=1)
-			df_temp = df_temp.groupby("id_linha")["com_horario"].value_counts(normalize=False).unstack(fill_value=0)
+			df_temp = df_temp.groupby("id_linha", observed=True)["com_horario"].value_counts(normalize=False).unstack(fill_value=0)
 			if True not in df_temp.columns:
 				df_temp[True] = 0
 			if False not in df_temp.columns:
@@ -263,7 +550,7 @@ class CalcularIndicadores:
 
 			df_temp = df_temp.reset_index()
 
-			df_temp = df_temp.astype({"id_linha": "string", "pontualidade": "float64"})
+			df_temp = df_temp.astype({"id_linha": self._tipo_id_linha, "pontualidade": "float64"})
 
 			return df_temp
 		except Exception as error:
@@ -281,53 +568,74 @@ class CalcularIndicadores:
 		"""
 		df_temp = df_frequencia.copy()
 
-		df_temp["horario_inicio_jornada"] = pd.to_datetime(df_temp["horario_inicio_jornada"], format="%H:%M:%S")
-		df_temp["horario_fim_jornada"] = pd.to_datetime(df_temp["horario_fim_jornada"], format="%H:%M:%S")
-
-		df_temp["frequencia_atendimento_pontuacao"] = df_temp["horario_fim_jornada"] - df_temp["horario_inicio_jornada"]
-		df_temp["frequencia_atendimento_pontuacao"] = df_temp["frequencia_atendimento_pontuacao"].apply(lambda x: int(x.total_seconds() / 60))
+		duracao = duracao_em_segundos(df_temp["horario_inicio_jornada"], df_temp["horario_fim_jornada"])
+		# Minutos inteiros, truncados em direção a zero
+		df_temp["frequencia_atendimento_pontuacao"] = np.trunc(duracao.to_numpy(dtype=np.float64, na_value=np.nan) / 60)
 
-		df_temp["data_jornada"] = pd.to_datetime(df_temp["data_jornada"], format="%d/%m/%Y")
+		df_temp["data_jornada"] = converter_unicos(df_temp["data_jornada"], "%d/%m/%Y")
 
-		df_temp = df_temp.groupby(["id_linha"])["frequencia_atendimento_pontuacao"].mean().reset_index()
+		df_temp = df_temp.groupby(["id_linha"], observed=True)["frequencia_atendimento_pontuacao"].mean().reset_index()
 
-		df_temp = df_temp.astype({"id_linha": "string", "frequencia_atendimento_pontuacao": "float64"})
+		df_temp = df_temp.astype({"id_linha": self._tipo_id_linha, "frequencia_atendimento_pontuacao": "float64"})
 
 		return df_temp
 
 	def merge_dados(self):
-		"""Combina todos os dados carregados em um único DataFrame."""
-		try:
-			if not isinstance(self.dados_linhas, gpd.GeoDataFrame):
-				raise
-			crs_original = self.dados_linhas.crs
-
-			self.dados_linhas = self.dados_linhas.to_crs(epsg=31983)
-
-			if not isinstance(self.dados_linhas, gpd.GeoDataFrame):
-				raise
-
-			self.dados_linhas["distancia_km"] = self.dados_linhas.length / 1000
-
-			self.dados_linhas = self.dados_linhas.to_crs(crs_original)
+		"""Combina todos os dados carregados em um único DataFrame.
 
+		Cumprimento, frequência, pontualidade e dados geográficos são indexados por 'id_linha' e
+		unidos em uma única junção alinhada pelo índice, independentemente da ordem das linhas.
+		Somente linhas presentes em todas as fontes são mantidas; as demais são informadas em
+		`self.linhas_sem_correspondencia`.
+		"""
+		try:
 			if not isinstance(self.dados_linhas, gpd.GeoDataFrame):
 				raise
 
-			self.cumprimento["cumprimento_itinerario"] = self.cumprimento["km_executado"].astype(float) / self.dados_linhas["distancia_km"].astype(
-				float
-			)  # type: ignore
-
-			self.dados_completos = pd.merge(self.dados_linhas, self.cumprimento, on=["id_linha"])
-			self.dados_completos = pd.merge(self.dados_completos, self.frequencia, on=["id_linha"])
-			self.dados_completos = pd.merge(self.dados_completos, self.pontualidade, on=["id_linha"])
-			self.dados_completos = pd.merge(self.dados_completos, self.dados_geograficos, on=["id_linha"])
-
-			self.dados_completos = gpd.GeoDataFrame(self.dados_completos)
+			self.dados_linhas["distancia_km"] = comprimentos_geodesicos(self.dados_linhas.geometry) / 1000
+
+			fontes = {
+				"cumprimento": self.cumprimento,
+				"frequencia": self.frequencia,
+				"pontualidade": self.pontualidade,
+				"dados_geograficos": self.dados_geograficos,
+			}
+			tipo_id = self._tipo_id_comum(self.dados_linhas["id_linha"], *(df["id_linha"] for df in fontes.values()))
+
+			# Extensão por 'id_linha', para que o cumprimento não dependa da ordem das linhas
+			chaves = pd.Index(self.dados_linhas["id_linha"].astype(tipo_id))
+			distancias = pd.Series(self.dados_linhas["distancia_km"].to_numpy(dtype=float), index=chaves)
+			distancias = distancias[~distancias.index.duplicated()]
+			self.cumprimento["cumprimento_itinerario"] = (
+				self.cumprimento["km_executado"].astype(float).to_numpy()
+				/ distancias.reindex(self.cumprimento["id_linha"].astype(tipo_id)).to_numpy()
+			)
+
+			# Uma tabela por fonte, indexada por 'id_linha', unidas em uma única junção pelo índice
+			tabelas = {nome: df.set_index(df["id_linha"].astype(tipo_id)).drop(columns="id_linha") for nome, df in fontes.items()}
+			self._reportar_linhas_sem_correspondencia(chaves, tabelas)
+
+			indicadores = pd.concat(tabelas.values(), axis=1, join="inner")
+			posicoes = indicadores.index.get_indexer(chaves)
+			encontradas = posicoes >= 0
+
+			self.dados_completos = self.dados_linhas[encontradas].reset_index(drop=True)
+			for coluna in indicadores.columns:
+				self.dados_completos[coluna] = indicadores[coluna].to_numpy()[posicoes[encontradas]]
 
 		except Exception as e:
 			print(f"Erro ao mesclar os dados: {e}")
 
+	def _reportar_linhas_sem_correspondencia(self, chaves: pd.Index, tabelas: dict):
+		"""Registra e informa, por fonte, as linhas ausentes nela mas presentes em alguma outra fonte."""
+		indices = {"dados_linhas": chaves, **{nome: tabela.index for nome, tabela in tabelas.items()}}
+		todas = reduce(pd.Index.union, indices.values())
+		self.linhas_sem_correspondencia = {
+			nome: sorted(todas.difference(indice).tolist()) for nome, indice in indices.items() if len(todas.difference(indice))
+		}
+		for nome, linhas in self.linhas_sem_correspondencia.items():
+			print(f"Aviso: {len(linhas)} linha(s) ausente(s) em {nome} foram descartadas: {linhas}")
+
 	def classificar_linha(self):
 		"""Classifica as linhas de acordo com os indicadores calculados."""
 		classificador = ClassificarIndicadores()
@@ -355,18 +663,31 @@ class CalcularIndicadores:
 			print(f"Erro ao calcular IQT: {e}")
 			return 0.0
 
+	def calcular_iqt_lote(self, matriz_indicadores: np.ndarray) -> np.ndarray:
+		"""Calcula o IQT de várias linhas de uma vez como um produto matriz-vetor.
+
+		Args:
+			matriz_indicadores (np.ndarray): Matriz (n_linhas, 10) com as pontuações I1 a I10 de cada linha.
+
+		Returns:
+			np.ndarray: IQT de cada linha, equivalente a aplicar `calcular_iqt` a cada linha da matriz.
+		"""
+		prioridades = np.asarray(self.indicadores_prioridades["prioridade"], dtype=np.float64)
+		pesos = prioridades / (np.std(prioridades) * len(prioridades))
+		return np.asarray(matriz_indicadores, dtype=np.float64) @ pesos
+
 	def processar_iqt(self):
-		"""Processa o cálculo do IQT para todas as linhas classificadas."""
-		valores_iqt, cores = [], []
-		for _, row in self.classificao_linhas.iterrows():
-			valores_indicadores = row.iloc[1:].tolist()
-
-			iqt = self.calcular_iqt(valores_indicadores)
-			cor = cor_iqt(iqt)
-			valores_iqt.append(iqt)
-			cores.append(cor)
+		"""Processa o cálculo do IQT para todas as linhas classificadas.
+
+		O IQT, a cor e a classificação qualitativa ('classificacao_iqt') de todas as linhas são
+		calculados de uma só vez a partir da matriz de indicadores.
+		"""
+		matriz_indicadores = self.classificao_linhas[self.indicadores_prioridades["nomeclatura"]].to_numpy(dtype=np.float64)
+		valores_iqt = self.calcular_iqt_lote(matriz_indicadores)
+
 		self.dados_completos["iqt"] = valores_iqt
-		self.dados_completos["cor"] = cores
+		self.dados_completos["cor"] = cores_iqt(valores_iqt)
+		self.dados_completos["classificacao_iqt"] = ClassificarIndicadores().classificar_iqt(valores_iqt)
 		self._gerar_matriz()
 
 	def _gerar_matriz(self):
@@ -389,3 +710,216 @@ class CalcularIndicadores:
 
 		colunas_para_manter = ["id_linha"] + list(mapeamento.values()) + ["iqt"]
 		self.matriz = df_matriz[colunas_para_manter]
+
+	GRANULARIDADES = {"dia": "D", "semana": "W", "mes": "M"}
+	ESTATISTICAS = ["soma_frequencia", "quantidade_frequencia", "viagens_com_horario", "viagens_total", "soma_km", "quantidade_km"]
+
+	def _estatisticas_frequencia(self, df_frequencia: pd.DataFrame, tipo_id) -> pd.DataFrame:
+		"""Estatísticas aditivas, por viagem, do indicador de frequência (minutos de jornada), com 'id_linha' do tipo `tipo_id`."""
+		duracao = duracao_em_segundos(df_frequencia["horario_inicio_jornada"], df_frequencia["horario_fim_jornada"])
+		minutos = np.trunc(duracao.to_numpy(dtype=np.float64, na_value=np.nan) / 60)
+		return pd.DataFrame({
+			"id_linha": df_frequencia["id_linha"].astype(tipo_id).array,
+			"soma_frequencia": np.nan_to_num(minutos),
+			"quantidade_frequencia": (~np.isnan(minutos)).astype(np.int64),
+		})
+
+	def _estatisticas_pontualidade(self, df_pontualidade: pd.DataFrame, tipo_id) -> pd.DataFrame:
+		"""Estatísticas aditivas, por viagem, de pontualidade e cumprimento de itinerário, com 'id_linha' do tipo `tipo_id`."""
+		horarios = df_pontualidade[["chegada_planejada", "chegada_real", "partida_planejada", "partida_real"]]
+		km_executado = pd.to_numeric(df_pontualidade["km_executado"], errors="coerce").to_numpy(dtype=np.float64)
+		return pd.DataFrame({
+			"id_linha": df_pontualidade["id_linha"].astype(tipo_id).array,
+			"viagens_com_horario": (horarios.notna() & (horarios != "-")).any(axis=1).to_numpy(dtype=np.int64),
+			"viagens_total": np.ones(len(df_pontualidade), dtype=np.int64),
+			"soma_km": np.nan_to_num(km_executado),
+			"quantidade_km": (~np.isnan(km_executado)).astype(np.int64),
+		})
+
+	def _tabela_linhas(self, tipo_id) -> pd.DataFrame:
+		"""Dados fixos de cada linha (indicadores cadastrais, extensão e, se carregados, dados geográficos), com 'id_linha' do tipo `tipo_id`."""
+		colunas = ["id_linha"] + [ClassificarIndicadores.COLUNAS_INDICADORES[indicador] for indicador in ["I1", "I3", "I8", "I9", "I10"]]
+		tabela = pd.DataFrame(self.dados_linhas[colunas]).assign(distancia_km=comprimentos_geodesicos(self.dados_linhas.geometry) / 1000)
+		tabela["id_linha"] = tabela["id_linha"].astype(tipo_id)
+		if hasattr(self, "dados_geograficos"):
+			geograficos = self.dados_geograficos[["id_linha", "distancia", "proporcao"]].astype({"id_linha": tipo_id})
+			return pd.merge(tabela, geograficos, on="id_linha", how="left")
+		return tabela.assign(distancia=np.nan, proporcao=np.nan)
+
+	def _indicadores_de_estatisticas(self, estatisticas: pd.DataFrame) -> pd.DataFrame:
+		"""Calcula indicadores, pontuações e IQT a partir de estatísticas aditivas por linha (e período).
+
+		Args:
+			estatisticas (pd.DataFrame): Coluna 'id_linha', eventuais colunas de chave e as colunas de `ESTATISTICAS`.
+
+		Returns:
+			pd.DataFrame: As chaves, os valores dos indicadores, as pontuações I1 a I10, 'iqt' e 'classificacao_iqt'.
+		"""
+		colunas_id = [estatisticas["id_linha"], self.dados_linhas["id_linha"]]
+		if hasattr(self, "dados_geograficos"):
+			colunas_id.append(self.dados_geograficos["id_linha"])
+		tipo_id = self._tipo_id_comum(*colunas_id)
+		df = pd.merge(estatisticas.astype({"id_linha": tipo_id}), self._tabela_linhas(tipo_id), on="id_linha")
+		with np.errstate(divide="ignore", invalid="ignore"):
+			df["frequencia_atendimento_pontuacao"] = df["soma_frequencia"] / df["quantidade_frequencia"]
+			df["pontualidade"] = df["viagens_com_horario"] / df["viagens_total"]
+			df["cumprimento_itinerario"] = (df["soma_km"] / df["quantidade_km"]) / df["distancia_km"]
+
+		classificador = ClassificarIndicadores()
+		nomeclatura = self.indicadores_prioridades["nomeclatura"]
+		for indicador in nomeclatura:
+			valores = df[classificador.COLUNAS_INDICADORES[indicador]].to_numpy()
+			df[indicador] = classificador.pontuar_indicador(indicador, valores, strip=indicador in classificador.INDICADORES_APARADOS_LINHAS)
+		df["iqt"] = self.calcular_iqt_lote(df[nomeclatura].to_numpy(dtype=np.float64))
+		df["classificacao_iqt"] = classificador.classificar_iqt(df["iqt"])
+
+		chaves = [coluna for coluna in estatisticas.columns if coluna not in self.ESTATISTICAS]
+		colunas_valores = ["pontualidade", "frequencia_atendimento_pontuacao", "cumprimento_itinerario"]
+		return df[chaves + colunas_valores + nomeclatura + ["iqt", "classificacao_iqt"]]
+
+	def calcular_iqt_periodos(
+		self,
+		df_frequencia: pd.DataFrame,
+		df_pontualidade: pd.DataFrame,
+		granularidade: str = "mes",
+		janelas: Iterable[int] = (),
+		formato_data: str = "%d/%m/%Y",
+	) -> pd.DataFrame:
+		"""Calcula o IQT por linha e período, e em janelas móveis, em uma única passagem pelos dados.
+
+		As viagens são reduzidas a estatísticas aditivas (somas e contagens) por linha e período.
+		As janelas móveis são obtidas por somas acumuladas ao longo dos períodos, sem refiltrar os
+		dados nem recalcular o pipeline para cada janela. Requer `carregar_dados_linha` (em
+		`self.dados_linhas`); se `self.dados_geograficos` existir, também é usado para I2 e I7.
+
+		Args:
+			df_frequencia (pd.DataFrame): Viagens com 'data_jornada' e os horários de jornada.
+			df_pontualidade (pd.DataFrame): Viagens com 'data_viagem', horários e 'km_executado'.
+			granularidade (str): "dia", "semana" ou "mes".
+			janelas (Iterable[int]): Tamanhos de janelas móveis, em períodos (ex.: 30 com granularidade "dia").
+			formato_data (str): Formato das colunas de data.
+
+		Returns:
+			pd.DataFrame: Série temporal em formato longo com 'id_linha', 'periodo' (início do período),
+			'janela' (1 para o próprio período), os indicadores, as pontuações, 'iqt' e 'classificacao_iqt'.
+			Janelas móveis terminam no período indicado.
+		"""
+		if granularidade not in self.GRANULARIDADES:
+			raise ValueError(f"Granularidade inválida: {granularidade}. Use uma de {list(self.GRANULARIDADES)}.")
+		frequencia = self.GRANULARIDADES[granularidade]
+
+		tipo_id = self._tipo_id_comum(df_frequencia["id_linha"], df_pontualidade["id_linha"])
+		estatisticas = pd.concat(
+			[
+				self._estatisticas_frequencia(df_frequencia, tipo_id).assign(
+					data=converter_unicos(df_frequencia["data_jornada"], formato_data).to_numpy()
+				),
+				self._estatisticas_pontualidade(df_pontualidade, tipo_id).assign(
+					data=converter_unicos(df_pontualidade["data_viagem"], formato_data).to_numpy()
+				),
+			],
+			ignore_index=True,
+		).fillna(dict.fromkeys(self.ESTATISTICAS, 0))
+		estatisticas = estatisticas[estatisticas["data"].notna()]
+		periodos = estatisticas["data"].dt.to_period(frequencia)
+
+		codigos_linhas, linhas = pd.factorize(estatisticas["id_linha"])
+		grade = pd.period_range(periodos.min(), periodos.max(), freq=frequencia)
+		codigos_periodos = grade.get_indexer(periodos)
+
+		# Cubo (linhas, períodos, estatísticas) com as somas de cada período, acumulado ao longo dos períodos
+		cubo = np.zeros((len(linhas), len(grade) + 1, len(self.ESTATISTICAS)))
+		np.add.at(cubo, (codigos_linhas, codigos_periodos + 1), estatisticas[self.ESTATISTICAS].to_numpy(dtype=np.float64))
+		acumulado = np.cumsum(cubo, axis=1)
+
+		resultados = []
+		for janela in sorted({1, *janelas}):
+			if janela < 1:
+				raise ValueError("As janelas devem ter pelo menos um período.")
+			fim = np.arange(1, len(grade) + 1)
+			somas = acumulado[:, fim] - acumulado[:, np.maximum(fim - janela, 0)]
+			idx_linhas, idx_periodos = np.nonzero((somas[:, :, [1, 3, 5]] > 0).any(axis=2))
+			resultado = pd.DataFrame(somas[idx_linhas, idx_periodos], columns=self.ESTATISTICAS)
+			resultado.insert(0, "janela", janela)
+			resultado.insert(0, "periodo", grade[idx_periodos].start_time)
+			resultado.insert(0, "id_linha", linhas[idx_linhas])
+			resultados.append(resultado)
+
+		self.iqt_periodos = self._indicadores_de_estatisticas(pd.concat(resultados, ignore_index=True))
+		return self.iqt_periodos
+
+	def acumular_viagens(self, df_frequencia: Optional[pd.DataFrame] = None, df_pontualidade: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+		"""Incorpora um novo lote de viagens (ex.: um dia) às estatísticas acumuladas por linha.
+
+		Cada linha mantém somas e contagens suficientes para as médias de frequência, pontualidade
+		e cumprimento de itinerário; o custo é proporcional ao tamanho do lote, sem reprocessar o
+		histórico. Após a atualização, `self.frequencia`, `self.pontualidade` e `self.cumprimento`
+		refletem todo o histórico acumulado e podem seguir para `merge_dados`.
+
+		Args:
+			df_frequencia (Optional[pd.DataFrame]): Novas viagens de frequência de atendimento.
+			df_pontualidade (Optional[pd.DataFrame]): Novas viagens de pontualidade e cumprimento.
+
+		Returns:
+			pd.DataFrame: Estatísticas acumuladas, indexadas por 'id_linha'.
+		"""
+		lotes = []
+		tipo_id = self._tipo_id_comum(*(df["id_linha"] for df in [df_frequencia, df_pontualidade] if df is not None))
+		if df_frequencia is not None:
+			lotes.append(self._estatisticas_frequencia(df_frequencia, tipo_id))
+		if df_pontualidade is not None:
+			lotes.append(self._estatisticas_pontualidade(df_pontualidade, tipo_id))
+		if not hasattr(self, "estatisticas_linhas"):
+			self.estatisticas_linhas = pd.DataFrame(columns=self.ESTATISTICAS, index=pd.Index([], dtype="string", name="id_linha"), dtype=np.float64)
+
+		if lotes:
+			lote = pd.concat(lotes, ignore_index=True).groupby("id_linha", observed=True).sum().reindex(columns=self.ESTATISTICAS, fill_value=0)
+			# O histórico, uma linha por 'id_linha', é mantido com ids em texto para ser serializado
+			lote.index = lote.index.astype("string")
+			self.estatisticas_linhas = self.estatisticas_linhas.add(lote, fill_value=0).astype(np.float64)
+		self._atualizar_dados_acumulados()
+		return self.estatisticas_linhas
+
+	def _atualizar_dados_acumulados(self):
+		"""Deriva frequência, pontualidade e cumprimento (no formato de `carregar_dados`) das estatísticas acumuladas."""
+		estatisticas = self.estatisticas_linhas
+		with np.errstate(divide="ignore", invalid="ignore"):
+			medias = {
+				"frequencia": ("frequencia_atendimento_pontuacao", "soma_frequencia", "quantidade_frequencia"),
+				"pontualidade": ("pontualidade", "viagens_com_horario", "viagens_total"),
+				"cumprimento": ("km_executado", "soma_km", "quantidade_km"),
+			}
+			for atributo, (coluna, soma, quantidade) in medias.items():
+				validas = estatisticas[quantidade] > 0
+				df_temp = (estatisticas.loc[validas, soma] / estatisticas.loc[validas, quantidade]).rename(coluna).reset_index()
+				setattr(self, atributo, df_temp.astype({"id_linha": self._tipo_id_linha, coluna: "float64"}))
+
+	def indicadores_acumulados(self) -> pd.DataFrame:
+		"""Calcula indicadores, pontuações e IQT por linha a partir das estatísticas acumuladas.
+
+		Returns:
+			pd.DataFrame: Uma linha por 'id_linha' com os indicadores, I1 a I10, 'iqt' e 'classificacao_iqt'.
+		"""
+		return self._indicadores_de_estatisticas(self.estatisticas_linhas.reset_index())
+
+	def salvar_estatisticas(self, caminho: str):
+		"""Salva as estatísticas acumuladas em CSV, para continuar a acumulação em outra execução.
+
+		Args:
+			caminho (str): Caminho do arquivo CSV.
+		"""
+		self.estatisticas_linhas.to_csv(caminho)
+
+	def carregar_estatisticas(self, caminho: str) -> pd.DataFrame:
+		"""Carrega estatísticas acumuladas salvas por `salvar_estatisticas`.
+
+		Args:
+			caminho (str): Caminho do arquivo CSV.
+
+		Returns:
+			pd.DataFrame: Estatísticas acumuladas, indexadas por 'id_linha'.
+		"""
+		estatisticas = pd.read_csv(caminho, dtype={"id_linha": "string"}).set_index("id_linha")
+		self.estatisticas_linhas = estatisticas.reindex(columns=self.ESTATISTICAS, fill_value=0).astype(np.float64)
+		self._atualizar_dados_acumulados()
+		return self.estatisticas_linhas
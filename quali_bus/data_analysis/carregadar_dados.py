@@ -1,5 +1,104 @@
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
 import pandas as pd
 
+from ..utils.utils import converter_unicos, duracao_em_segundos
+
+# Colunas lidas de cada entrada de `CalcularIndicadores.carregar_dados` (as exigidas pelos validadores em `modelos`)
+COLUNAS_ENTRADA = {
+	"linhas": [
+		"id_linha",
+		"geometria_linha",
+		"indicador_via_pavimentada",
+		"tipo_integracao",
+		"indicador_treinamento_motorista",
+		"disponibilidade_informacao",
+		"valor_tarifa",
+	],
+	"frequencia": ["horario_inicio_jornada", "horario_fim_jornada", "data_jornada", "sentido_viagem", "id_linha", "quantidade_passageiros"],
+	"pontualidade": [
+		"data_viagem",
+		"id_linha",
+		"sentido",
+		"descricao_trajeto",
+		"partida_planejada",
+		"partida_real",
+		"chegada_planejada",
+		"chegada_real",
+		"km_executado",
+	],
+}
+EXTENSOES_PARQUET = (".parquet", ".pq")
+EXTENSOES_FEATHER = (".feather", ".arrow")
+
+
+def ler_tabela(file_path: Union[str, Path], colunas: Optional[list] = None, motor_csv: str = "pyarrow") -> pd.DataFrame:
+	"""Lê uma tabela em Parquet, Feather/Arrow ou CSV, carregando apenas as colunas informadas.
+
+	O formato é escolhido pela extensão do arquivo. Parquet e Feather preservam os tipos das
+	colunas (datas, inteiros, floats) e leem só as colunas pedidas, sem análise de texto. CSVs
+	são lidos pelo motor do Arrow, que é multithread. A coluna 'id_linha' é sempre lida como texto.
+
+	Args:
+		file_path (Union[str, Path]): Caminho do arquivo.
+		colunas (Optional[list]): Colunas a serem lidas. Default lê todas.
+		motor_csv (str): Motor de leitura de CSV: "pyarrow" (leitor do Arrow) ou um motor do `pd.read_csv` ("c" ou "python").
+
+	Returns:
+		pd.DataFrame: Tabela lida.
+	"""
+	extensao = Path(file_path).suffix.lower()
+	if extensao in EXTENSOES_PARQUET:
+		df = pd.read_parquet(file_path, columns=colunas)
+	elif extensao in EXTENSOES_FEATHER:
+		df = pd.read_feather(file_path, columns=colunas)
+	elif motor_csv == "pyarrow":
+		import pyarrow as pa
+		from pyarrow import csv
+
+		# Os tipos são definidos já na conversão, para que 'id_linha' preserve zeros à esquerda
+		opcoes = csv.ConvertOptions(include_columns=colunas, column_types={"id_linha": pa.string()})
+		df = csv.read_csv(file_path, convert_options=opcoes).to_pandas()
+	else:
+		df = pd.read_csv(file_path, delimiter=",", usecols=colunas, dtype={"id_linha": "string"}, engine=motor_csv)
+	if "id_linha" in df.columns:
+		df["id_linha"] = df["id_linha"].astype("string")
+	return df
+
+
+def converter_csv_para_parquet(
+	file_path: Union[str, Path],
+	destino: Optional[Union[str, Path]] = None,
+	colunas: Optional[list] = None,
+	colunas_data: Optional[list] = None,
+	formato_data: str = "%d/%m/%Y",
+) -> Path:
+	"""Converte uma exportação CSV em Parquet, para que execuções seguintes não precisem analisar o texto.
+
+	Args:
+		file_path (Union[str, Path]): Caminho do CSV.
+		destino (Optional[Union[str, Path]]): Caminho do Parquet. Default troca a extensão do CSV por .parquet.
+		colunas (Optional[list]): Colunas a manter. Default mantém todas.
+		colunas_data (Optional[list]): Colunas de data a serem gravadas já como datetime.
+		formato_data (str): Formato das colunas de data no CSV.
+
+	Returns:
+		Path: Caminho do arquivo Parquet gerado.
+
+	Example:
+		>>> converter_csv_para_parquet(
+		...     "viagens.csv", colunas_data=["data_viagem"]
+		... )
+	"""
+	destino = Path(destino) if destino is not None else Path(file_path).with_suffix(".parquet")
+	df = ler_tabela(file_path, colunas)
+	for coluna in colunas_data or []:
+		df[coluna] = converter_unicos(df[coluna], formato_data)
+	df.to_parquet(destino, index=False)
+	return destino
+
 
 def carregar_dados(file_path: str) -> pd.DataFrame:
 	"""Carrega e processa um arquivo CSV contendo dados de horários e datas, realizando as conversões necessárias para os tipos datetime.
@@ -18,14 +117,16 @@ def carregar_dados(file_path: str) -> pd.DataFrame:
 	"""
 	df = pd.read_csv(file_path, delimiter=",")
 
+	# Duração em segundos inteiros, calculada a partir dos horários distintos
+	duracao_segundos = duracao_em_segundos(df["horario_inicio_jornada"], df["horario_fim_jornada"]).to_numpy(dtype=np.int64)
+
 	# Conversões de datetime
-	df["horario_inicio_jornada"] = pd.to_datetime(df["horario_inicio_jornada"], format="%H:%M:%S")
-	df["horario_fim_jornada"] = pd.to_datetime(df["horario_fim_jornada"], format="%H:%M:%S")
-	df["duracao"] = df["horario_fim_jornada"] - df["horario_inicio_jornada"]
-	df["data"] = pd.to_datetime(df["data"], format="%d/%m/%Y")
-	df["dataf"] = pd.to_datetime(df["dataf"], format="%d/%m/%Y")
-	df["duracao_minutos"] = df["duracao"].dt.total_seconds() // 60
-	df["duracao_minutos"] = df["duracao_minutos"].astype(int)
+	df["horario_inicio_jornada"] = converter_unicos(df["horario_inicio_jornada"], "%H:%M:%S")
+	df["horario_fim_jornada"] = converter_unicos(df["horario_fim_jornada"], "%H:%M:%S")
+	df["duracao"] = pd.to_timedelta(duracao_segundos, unit="s")
+	df["data"] = converter_unicos(df["data"], "%d/%m/%Y")
+	df["dataf"] = converter_unicos(df["dataf"], "%d/%m/%Y")
+	df["duracao_minutos"] = duracao_segundos // 60
 
 	return df
 
@@ -92,3 +193,80 @@ def carregar_viagens_planejadas(file_path: str) -> pd.DataFrame:
 	agrupado["proporcao_sem_horario"] = agrupado["com_horario"] / (agrupado["sem_horario"] + agrupado["com_horario"])
 
 	return agrupado
+
+
+def _contar_viagens_com_horario(lotes, colunas_horario: list, chaves: list) -> pd.DataFrame:
+	"""Soma, lote a lote, as contagens de viagens com e sem horário por chave.
+
+	Args:
+		lotes (Iterable[pd.DataFrame]): Lotes já com as colunas de chave e de horário.
+		colunas_horario (list): Colunas cuja presença de valor indica viagem com horário.
+		chaves (list): Colunas de agrupamento.
+
+	Returns:
+		pd.DataFrame: Colunas 'sem_horario' e 'com_horario', indexado pelas chaves.
+	"""
+	contagens = None
+	for lote in lotes:
+		com_horario = lote[colunas_horario].notna().any(axis=1).rename("com_horario")
+		parcial = lote[chaves].assign(com_horario=com_horario).groupby(chaves + ["com_horario"]).size()
+		contagens = parcial if contagens is None else contagens.add(parcial, fill_value=0)
+
+	if contagens is None:
+		return pd.DataFrame(columns=["sem_horario", "com_horario"])
+	agrupado = contagens.astype(np.int64).unstack(fill_value=0).reindex(columns=[False, True], fill_value=0)
+	agrupado.columns = ["sem_horario", "com_horario"]
+	return agrupado
+
+
+def carregar_viagens_planejadas_em_lotes(file_path: str, tamanho_lote: int = 500_000) -> pd.DataFrame:
+	"""Versão em lotes de `carregar_viagens_planejadas`, com uso de memória limitado ao tamanho do lote.
+
+	Lê apenas as colunas necessárias, trata "-" como ausente já na leitura e extrai linha e
+	sentido uma vez por trajeto distinto de cada lote; as contagens parciais são somadas ao final.
+
+	Args:
+		file_path (str): Caminho completo para o arquivo CSV contendo os dados de rastreamento de viagens.
+		tamanho_lote (int): Quantidade de linhas lidas por lote.
+
+	Returns:
+		pd.DataFrame: O mesmo resultado de `carregar_viagens_planejadas`.
+	"""
+	colunas_horario = ["chegada_planejada", "partida_real", "chegada_real"]
+	leitor = pd.read_csv(file_path, delimiter=",", usecols=["descricao_trajeto"] + colunas_horario, na_values=["-"], chunksize=tamanho_lote)
+
+	def lotes():
+		for lote in leitor:
+			codigos, trajetos = pd.factorize(lote["descricao_trajeto"])
+			extraido = pd.Series(trajetos).str.extract(r"(\d+)\s*-\s*.*\((ida|volta)\)")
+			# O código -1 (trajeto ausente) aponta para a linha vazia acrescentada ao final
+			extraido = pd.concat([extraido, pd.DataFrame([[np.nan, np.nan]])], ignore_index=True).iloc[codigos]
+			lote = lote.assign(id_linha=extraido[0].to_numpy(), sentido=extraido[1].to_numpy())
+			yield lote
+
+	with leitor:
+		agrupado = _contar_viagens_com_horario(lotes(), colunas_horario, ["id_linha", "sentido"])
+	agrupado["proporcao_sem_horario"] = agrupado["com_horario"] / (agrupado["sem_horario"] + agrupado["com_horario"])
+	return agrupado
+
+
+def carregar_pontualidade_em_lotes(file_path: str, tamanho_lote: int = 500_000) -> pd.DataFrame:
+	"""Calcula a pontualidade por linha a partir de um CSV de viagens, lendo-o em lotes.
+
+	Equivale a `CalcularIndicadores.calcular_pontualidade` sobre o arquivo completo, mas lê apenas
+	as colunas necessárias, com "-" tratado como ausente na leitura, e soma contagens parciais.
+
+	Args:
+		file_path (str): Caminho do CSV com 'id_linha' e os horários planejados e reais.
+		tamanho_lote (int): Quantidade de linhas lidas por lote.
+
+	Returns:
+		pd.DataFrame: Colunas 'id_linha' e 'pontualidade'.
+	"""
+	colunas_horario = ["chegada_planejada", "chegada_real", "partida_planejada", "partida_real"]
+	leitor = pd.read_csv(file_path, usecols=["id_linha"] + colunas_horario, dtype={"id_linha": "string"}, na_values=["-"], chunksize=tamanho_lote)
+	with leitor:
+		agrupado = _contar_viagens_com_horario(leitor, colunas_horario, ["id_linha"])
+
+	agrupado["pontualidade"] = agrupado["com_horario"] / (agrupado["sem_horario"] + agrupado["com_horario"])
+	return agrupado[["pontualidade"]].reset_index().astype({"id_linha": "string", "pontualidade": "float64"})
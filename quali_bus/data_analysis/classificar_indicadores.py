@@ -1,6 +1,14 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
 
+def _acima(valor: float) -> float:
+	"""Retorna o menor float maior que `valor`, transformando limites inclusivos à direita em intervalos [a, b)."""
+	return float(np.nextafter(valor, np.inf))
+
+
 class ClassificarIndicadores:
 	"""
 	Classe para classificar os indicadores de qualidade do transporte público.
@@ -8,8 +16,50 @@ class ClassificarIndicadores:
 	Esta classe contém métodos para calcular o Índice de Qualidade do Transporte (IQT)
 	e avaliar diferentes aspectos do serviço de transporte público, como pontualidade,
 	infraestrutura e atendimento.
+
+	Os métodos escalares de pontuação são a implementação de referência; `FAIXAS` e
+	`TABELAS` reproduzem as mesmas regras para a classificação vetorizada. Em `FAIXAS`,
+	cada regra é um par (limites, pontuações) em que a pontuação `k` vale para o intervalo
+	[limites[k - 1], limites[k]); valores ausentes recebem 0.
 	"""
 
+	FAIXAS = {
+		"I1": ([0.85, 0.95, 0.99, 1.0], [0, 1, 2, 0, 3]),
+		"I2": ([_acima(100), 200, 400], [3, 2, 1, 0]),
+		"I4": ([0.80, 0.90, 0.95], [0, 1, 2, 3]),
+		"I5": ([_acima(10), _acima(15), _acima(30)], [3, 2, 1, 0]),
+		"I6": ([0.5, _acima(0.7), 0.8, _acima(0.9), 1.0], [0, 1, 0, 2, 0, 3]),
+		"I7": ([_acima(0.85), _acima(0.95), _acima(0.99), 1.0, _acima(1.0)], [0, 1, 2, 0, 3, 0]),
+		"I8": ([0.90, 0.95, _acima(0.98), 1.0], [0, 1, 2, 0, 3]),
+	}
+	TABELAS = {
+		"I3": {
+			"Sistema de transporte público totalmente integrado com terminais com o uso de bilhete eletrônico para integração intra e intermodal": 3,
+			"Sistema de transporte público totalmente integrado com terminais com o uso de bilhete eletrônico para integração intramodal somente": 2,
+			"Integração tarifária temporal ocorre em determinados pontos, apenas com transferências intramodais": 1,
+		},
+		"I9": {
+			"Possuir informações em site e aplicativo atualizados": 3,
+			"Possuir informações em site parcialmente atualizado": 2,
+			"Possuir informação em site desatualizado": 1,
+		},
+		"I10": {"Não houve aumento da tarifa": 3, "Aumento inferior ao índice": 2, "Aumento equivalente ao índice": 1},
+	}
+	COLUNAS_INDICADORES = {
+		"I1": "indicador_via_pavimentada",
+		"I2": "distancia",
+		"I3": "tipo_integracao",
+		"I4": "pontualidade",
+		"I5": "frequencia_atendimento_pontuacao",
+		"I6": "cumprimento_itinerario",
+		"I7": "proporcao",
+		"I8": "indicador_treinamento_motorista",
+		"I9": "disponibilidade_informacao",
+		"I10": "valor_tarifa",
+	}
+	FAIXAS_IQT = ([1.0, 2.0, 3.0], ["Insuficiente", "Suficiente", "Bom", "Excelente"])
+	INDICADORES_APARADOS_LINHAS = ("I3", "I9")
+
 	def pontualidade_pontuacao(self, pontualidade: float) -> int:
 		"""
 		Calcula a pontuação para o indicador de pontualidade.
@@ -167,6 +217,18 @@ class ClassificarIndicadores:
 		else:
 			return "Insuficiente"
 
+	def classificar_iqt(self, iqts) -> np.ndarray:
+		"""
+		Versão vetorizada de `classificacao_iqt_pontuacao` para um array de IQTs.
+
+		Args:
+			iqts (array-like): Valores do IQT.
+
+		Returns:
+			np.ndarray: Classificação qualitativa de cada IQT.
+		"""
+		return self.pontuar_faixas(iqts, *self.FAIXAS_IQT, padrao="Insuficiente")
+
 	def cumprimento_itinerarios_pontuacao(self, etinerario: float) -> int:
 		"""
 		Calcula a pontuação para o indicador de cumprimento de etinerários.
@@ -224,16 +286,79 @@ class ClassificarIndicadores:
 			case _:
 				return 0
 
-	def classificar_linhas(self, dados_linhas: pd.DataFrame) -> pd.DataFrame:
+	@staticmethod
+	def pontuar_faixas(valores, limites: list, pontuacoes: list, padrao=0) -> np.ndarray:
+		"""
+		Atribui pontuações a um array de valores numéricos por busca binária nos limites das faixas.
+
+		Args:
+			valores (array-like): Valores a serem pontuados.
+			limites (list): Limites crescentes das faixas, cada uma no formato [a, b).
+			pontuacoes (list): Pontuação de cada faixa (len(limites) + 1 elementos).
+			padrao: Pontuação atribuída a valores ausentes.
+
+		Returns:
+			np.ndarray: Pontuação de cada valor.
+		"""
+		valores = np.asarray(valores, dtype=np.float64)
+		pontuacoes = np.asarray(pontuacoes)
+		return np.where(np.isnan(valores), padrao, pontuacoes[np.searchsorted(limites, valores, side="right")])
+
+	@staticmethod
+	def pontuar_categorias(valores, tabela: dict, strip: bool = False) -> np.ndarray:
+		"""
+		Atribui pontuações a textos por códigos pré-calculados, comparando cada valor distinto uma única vez.
+
+		Args:
+			valores (array-like): Textos a serem pontuados.
+			tabela (dict): Mapeamento texto -> pontuação; textos ausentes recebem 0.
+			strip (bool): Se True, remove espaços nas extremidades antes da comparação.
+
+		Returns:
+			np.ndarray: Pontuação de cada valor.
+		"""
+		codigos, unicos = pd.factorize(pd.Series(valores, dtype=object))
+		if strip:
+			unicos = pd.Index([valor.strip() if isinstance(valor, str) else valor for valor in unicos])
+		# O código -1 (valor ausente ou não encontrado) aponta para a última posição, que vale 0
+		pontuacoes = np.append([tabela.get(valor, 0) for valor in unicos], 0)
+		return pontuacoes[codigos]
+
+	def pontuar_indicador(self, indicador: str, valores, strip: Optional[bool] = None) -> np.ndarray:
+		"""
+		Pontua um array de valores de um único indicador (I1 a I10) de forma vetorizada.
+
+		Args:
+			indicador (str): Nomenclatura do indicador, de "I1" a "I10".
+			valores (array-like): Valores da coluna correspondente em `COLUNAS_INDICADORES`.
+			strip (Optional[bool]): Se True, remove espaços nas extremidades dos textos antes da comparação.
+				Default reproduz o método escalar do indicador, que só apara os textos de I3.
+
+		Returns:
+			np.ndarray: Pontuação de cada valor.
+		"""
+		if indicador in self.FAIXAS:
+			pontuacoes = self.pontuar_faixas(valores, *self.FAIXAS[indicador])
+		else:
+			strip = indicador == "I3" if strip is None else strip
+			pontuacoes = self.pontuar_categorias(valores, self.TABELAS[indicador], strip=strip)
+		return pontuacoes.astype(np.int64)
+
+	def classificar_linhas(self, dados_linhas: pd.DataFrame, vetorizado: bool = True) -> pd.DataFrame:
 		"""
 		Classifica as linhas de transporte público com base nos indicadores avaliados.
 
 		Args:
 			dados_linhas (pd.DataFrame): DataFrame contendo os dados das linhas e seus indicadores.
+			vetorizado (bool): Se True (padrão), classifica todas as linhas de uma vez por faixas e
+				tabelas de códigos. Se False, aplica os métodos escalares linha a linha.
 
 		Returns:
 			pd.DataFrame: DataFrame contendo as classificações de cada linha.
 		"""
+		if vetorizado:
+			return self._classificar_linhas_vetorizado(dados_linhas)
+
 		classificacao = {"id_linha": [], "I1": [], "I2": [], "I3": [], "I4": [], "I5": [], "I6": [], "I7": [], "I8": [], "I9": [], "I10": []}
 
 		for _, linha in dados_linhas.iterrows():
@@ -250,3 +375,12 @@ class ClassificarIndicadores:
 			classificacao["I10"].append(self.valor_tarifa_pontuacao(linha["valor_tarifa"]))
 
 		return pd.DataFrame(classificacao)
+
+	def _classificar_linhas_vetorizado(self, dados_linhas: pd.DataFrame) -> pd.DataFrame:
+		"""Classifica todas as linhas de uma vez, reproduzindo as regras dos métodos escalares."""
+		classificacao = {"id_linha": dados_linhas["id_linha"].to_numpy()}
+		for indicador, coluna in self.COLUNAS_INDICADORES.items():
+			# classificar_linhas também apara os textos de I9 antes de chamar o método escalar
+			strip = indicador in self.INDICADORES_APARADOS_LINHAS
+			classificacao[indicador] = self.pontuar_indicador(indicador, dados_linhas[coluna].to_numpy(), strip=strip)
+		return pd.DataFrame(classificacao)
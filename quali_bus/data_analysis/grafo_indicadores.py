@@ -0,0 +1,161 @@
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+
+
+class NoIndicador:
+	"""
+	Nó do grafo de indicadores.
+
+	Attributes:
+		nome (str): Nome do nó (ex.: "frequencia", "I4").
+		funcao (Callable): Função que recebe os resultados das dependências, na ordem declarada, e calcula o nó.
+		dependencias (tuple[str, ...]): Nomes dos nós dos quais este nó depende.
+		colunas (tuple[str, ...]): Colunas que o nó lê dos resultados das dependências.
+	"""
+
+	def __init__(self, nome: str, funcao: Callable, dependencias: Iterable[str] = (), colunas: Iterable[str] = ()):
+		"""
+		Inicializa o nó.
+
+		Args:
+			nome (str): Nome do nó.
+			funcao (Callable): Função que calcula o nó a partir dos resultados das dependências.
+			dependencias (Iterable[str]): Nomes dos nós dos quais este nó depende.
+			colunas (Iterable[str]): Colunas de entrada exigidas nos resultados das dependências.
+		"""
+		self.nome = nome
+		self.funcao = funcao
+		self.dependencias = tuple(dependencias)
+		self.colunas = tuple(colunas)
+
+
+class GrafoIndicadores:
+	"""
+	Grafo de dependências para a avaliação preguiçosa (sob demanda) dos indicadores.
+
+	Cada nó declara suas dependências e as colunas de entrada que utiliza. Ao solicitar um
+	conjunto de nós, apenas eles e seus ancestrais são calculados, e cada resultado é
+	memorizado até `limpar` ser chamado; pedidos posteriores reaproveitam o que já foi calculado.
+
+	Example:
+		>>> grafo = GrafoIndicadores()
+		>>> grafo.adicionar_entrada("viagens", df_viagens)
+		>>> grafo.registrar("total", len, dependencias=["viagens"])
+		>>> grafo.calcular("total")
+	"""
+
+	def __init__(self):
+		"""Inicializa um grafo vazio."""
+		self.nos: dict[str, NoIndicador] = {}
+		self._resultados: dict = {}
+
+	def registrar(self, nome: str, funcao: Callable, dependencias: Iterable[str] = (), colunas: Iterable[str] = ()):
+		"""
+		Registra (ou substitui) um nó no grafo, descartando os resultados que dependiam dele.
+
+		Args:
+			nome (str): Nome do nó.
+			funcao (Callable): Função que recebe os resultados das dependências, na ordem declarada.
+			dependencias (Iterable[str]): Nomes dos nós dos quais este nó depende.
+			colunas (Iterable[str]): Colunas de entrada exigidas nos resultados das dependências.
+		"""
+		self.nos[nome] = NoIndicador(nome, funcao, dependencias, colunas)
+		self.limpar(nome)
+
+	def adicionar_entrada(self, nome: str, valor):
+		"""
+		Registra um nó de entrada com valor já conhecido (ex.: um DataFrame carregado).
+
+		Args:
+			nome (str): Nome do nó.
+			valor: Valor do nó.
+		"""
+		self.registrar(nome, lambda: valor)
+
+	def calcular(self, nome: str):
+		"""
+		Calcula um nó, avaliando apenas as dependências ainda não memorizadas.
+
+		Args:
+			nome (str): Nome do nó.
+
+		Returns:
+			Resultado do nó.
+
+		Raises:
+			KeyError: Se o nó ou alguma dependência não estiver registrado, ou se faltar alguma coluna de entrada.
+			ValueError: Se houver um ciclo de dependências.
+		"""
+		return self._calcular(nome, ())
+
+	def calcular_varios(self, nomes: Iterable[str]) -> dict:
+		"""
+		Calcula vários nós, compartilhando as dependências em comum.
+
+		Args:
+			nomes (Iterable[str]): Nomes dos nós.
+
+		Returns:
+			dict: Resultado de cada nó solicitado.
+		"""
+		return {nome: self.calcular(nome) for nome in nomes}
+
+	def _calcular(self, nome: str, caminho: tuple):
+		if nome in self._resultados:
+			return self._resultados[nome]
+		if nome in caminho:
+			raise ValueError(f"Ciclo de dependências entre indicadores: {' -> '.join(caminho + (nome,))}")
+		if nome not in self.nos:
+			raise KeyError(f"Indicador '{nome}' não registrado.")
+
+		no = self.nos[nome]
+		argumentos = [self._calcular(dependencia, caminho + (nome,)) for dependencia in no.dependencias]
+		self._verificar_colunas(no, argumentos)
+		self._resultados[nome] = no.funcao(*argumentos)
+		return self._resultados[nome]
+
+	def _verificar_colunas(self, no: NoIndicador, argumentos: list):
+		disponiveis = set()
+		for argumento in argumentos:
+			if isinstance(argumento, pd.DataFrame):
+				disponiveis.update(argumento.columns)
+		faltantes = [coluna for coluna in no.colunas if coluna not in disponiveis]
+		if faltantes:
+			raise KeyError(f"Colunas ausentes para o indicador '{no.nome}': {faltantes}")
+
+	def dependentes(self, nome: str) -> set:
+		"""
+		Retorna os nós que dependem, direta ou indiretamente, de um nó.
+
+		Args:
+			nome (str): Nome do nó.
+
+		Returns:
+			set: Nomes dos nós dependentes.
+		"""
+		dependentes, pendentes = set(), [nome]
+		while pendentes:
+			atual = pendentes.pop()
+			for no in self.nos.values():
+				if atual in no.dependencias and no.nome not in dependentes:
+					dependentes.add(no.nome)
+					pendentes.append(no.nome)
+		return dependentes
+
+	def limpar(self, nome: Optional[str] = None):
+		"""
+		Descarta resultados memorizados.
+
+		Args:
+			nome (Optional[str]): Se informado, descarta apenas o nó e seus dependentes; caso contrário, todos os resultados.
+		"""
+		if nome is None:
+			self._resultados.clear()
+			return
+		for descartado in {nome} | self.dependentes(nome):
+			self._resultados.pop(descartado, None)
+
+	def calculados(self) -> set:
+		"""Retorna os nomes dos nós com resultado memorizado."""
+		return set(self._resultados)
@@ -6,6 +6,7 @@ from shapely import wkt
 from shapely.geometry import LineString
 
 from ..utils.cores import cor_aleatoria, cor_iqt
+from ..utils.geodesia import comprimentos_geodesicos
 
 
 def carregar_camadas_linhas(path_lines: str) -> gpd.GeoDataFrame:
@@ -41,21 +42,21 @@ def filtrar_linhas(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
 
 
 def calcular_distancias(gdf_lines: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-	"""Calcula o comprimento de cada LineString no GeoDataFrame.
+	"""Calcula o comprimento geodésico de cada LineString no GeoDataFrame.
 
 	Args:
 		gdf_lines (gpd.GeoDataFrame): GeoDataFrame contendo geometrias do tipo LineString.
 
 	Returns:
 		gpd.GeoDataFrame: GeoDataFrame original com uma nova coluna 'distances' contendo
-		o comprimento de cada linha.
+		o comprimento de cada linha em metros.
 	"""
-	gdf_lines["distances"] = gdf_lines.apply(lambda row: row.geometry.length, axis=1)
+	gdf_lines["distances"] = comprimentos_geodesicos(gdf_lines.geometry)
 	return gdf_lines
 
 
 def calcular_distancias_2(gdf_lines: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-	"""Calcula distâncias em metros e quilômetros usando projeção Web Mercator (EPSG:3857).
+	"""Calcula distâncias geodésicas em metros e quilômetros sobre o elipsoide WGS84.
 
 	Args:
 		gdf_lines (gpd.GeoDataFrame): GeoDataFrame contendo geometrias do tipo LineString.
@@ -66,10 +67,10 @@ def calcular_distancias_2(gdf_lines: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
 			- 'distancia_km': comprimento da linha em quilômetros
 		O GeoDataFrame é retornado na projeção WGS84 (EPSG:4326).
 	"""
-	gdf_lines = gdf_lines.to_crs(3857)
-	gdf_lines["distancia_metros"] = gdf_lines.length
+	gdf_lines = gdf_lines.to_crs(4326)
+	gdf_lines["distancia_metros"] = comprimentos_geodesicos(gdf_lines.geometry)
 	gdf_lines["distancia_km"] = gdf_lines["distancia_metros"] / 1000
-	return gdf_lines.to_crs(4326)
+	return gdf_lines
 
 
 def criar_popup(line: pd.Series) -> str:
@@ -1,5 +1,7 @@
 from .associador import *
+from .cache import *
 from .cores import *
 from .execptions import *
+from .geodesia import *
 from .modelos import *
 from .utils import *
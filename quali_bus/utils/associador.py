@@ -1,34 +1,135 @@
 import math
-from typing import Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Iterable, Optional
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pyproj
+import shapely
+from scipy import sparse
+from scipy.spatial import cKDTree
+from shapely import STRtree
 from shapely.geometry import LineString, Point
 
+from .cache import CacheAssociacoes
+
 
 class Associador:
 	EARTH_CRS = "EPSG:4326"  # WGS 84
 	# LOCAL_CRS = "EPSG:32723"  # UTM 23S para Minas Gerais
 	MAX_DISTANCE = 1000  # metros - distância máxima aceitável
+	RAIO_TERRA = 6371000  # metros
 	REQUIRED_COLUMNS = {"latitude", "longitude"}
+	METODOS_BUSCA = ("kdtree", "forca_bruta")
+	METODOS_LINHA = ("vertices", "strtree")
+	TAMANHO_TILE = 0.05  # graus - lado dos tiles usados na execução paralela
+	LIMITE_PROPORCAO = 500  # metros - distância usada na proporção de residências atendidas
+	MEMORIA_MAX_BYTES = 64 * 1024 * 1024  # orçamento padrão para as matrizes temporárias de distância
 
-	def __init__(self, pontos_onibus: pd.DataFrame, linhas: gpd.GeoDataFrame, residencias: pd.DataFrame):
+	def __init__(
+		self,
+		pontos_onibus: pd.DataFrame,
+		linhas: gpd.GeoDataFrame,
+		residencias: Optional[pd.DataFrame] = None,
+		memoria_max_bytes: Optional[int] = None,
+		cache: Optional[CacheAssociacoes] = None,
+		modo_compacto: bool = False,
+		dtype_coordenadas: type = np.float64,
+		projecao: Optional[str] = None,
+	):
 		"""
 		Inicializa a classe com os dados necessários.
 
 		Args:
 			pontos_onibus (pd.DataFrame): DataFrame com coordenadas dos pontos de ônibus
 			linhas (pd.DataFrame): DataFrame com as linhas de ônibus
-			residencias (pd.DataFrame): DataFrame com coordenadas das residências
+			residencias (Optional[pd.DataFrame]): DataFrame com coordenadas das residências. Pode ser
+				omitido quando as residências forem processadas em lotes por `consolidar_associacoes_em_lotes`.
+			memoria_max_bytes (Optional[int]): Limite de memória (bytes) para os blocos de distâncias
+				calculados por vez. Default é MEMORIA_MAX_BYTES.
+			cache (Optional[CacheAssociacoes]): Cache em disco para os resultados de
+				`associar_residencias_a_pontos` e `associar_ponto_a_linha`.
+			modo_compacto (bool): Se True, as coordenadas são lidas diretamente das colunas
+				'longitude'/'latitude' para arrays contíguos e os GeoDataFrames só são criados
+				quando acessados, contendo apenas as colunas de coordenadas.
+			dtype_coordenadas (type): Tipo dos arrays de coordenadas no modo compacto
+				(np.float64 ou np.float32).
+			projecao (Optional[str]): Se "utm", todas as coordenadas são projetadas uma única vez
+				na zona UTM detectada a partir da extensão dos dados e as distâncias passam a ser
+				euclidianas em metros, com índices espaciais planos. Também aceita qualquer CRS
+				métrico (ex.: "EPSG:31983"). Default (None) usa Haversine sobre longitude/latitude.
 		"""
-		# Criar GeoDataFrames e arrays NumPy
-		self.gdf_residencias, self.gdf_pontos_onibus = self._criar_geodataframes(residencias, pontos_onibus)
-		# self.gdf_residencias = self.gdf_residencias.to_crs(self.LOCAL_CRS)  # UTM 23S para Minas Gerais
-		# self.gdf_pontos_onibus = self.gdf_pontos_onibus.to_crs(self.LOCAL_CRS)
+		self.projecao = projecao
+		self.cache = cache
+		self.memoria_max_bytes = memoria_max_bytes if memoria_max_bytes is not None else self.MEMORIA_MAX_BYTES
+		if self.memoria_max_bytes <= 0:
+			raise ValueError("memoria_max_bytes deve ser positivo")
+
+		if residencias is None:
+			residencias = pd.DataFrame({"longitude": pd.Series(dtype=float), "latitude": pd.Series(dtype=float)})
+
+		self.modo_compacto = modo_compacto
 		self.linhas = linhas.copy()
+		if modo_compacto:
+			# GeoDataFrames criados sob demanda a partir dos arrays de coordenadas
+			self._gdf_residencias: Optional[gpd.GeoDataFrame] = None
+			self._gdf_pontos_onibus: Optional[gpd.GeoDataFrame] = None
+			self.coords_residencias, self.coords_pontos_onibus = self._coordenadas_compactas(residencias, pontos_onibus, dtype_coordenadas)
+		else:
+			# Criar GeoDataFrames e arrays NumPy
+			self.gdf_residencias, self.gdf_pontos_onibus = self._criar_geodataframes(residencias, pontos_onibus)
+			# self.gdf_residencias = self.gdf_residencias.to_crs(self.LOCAL_CRS)  # UTM 23S para Minas Gerais
+			# self.gdf_pontos_onibus = self.gdf_pontos_onibus.to_crs(self.LOCAL_CRS)
+			self.coords_residencias, self.coords_pontos_onibus = self._extrair_coordenadas()
+		self._arvore_pontos: Optional[cKDTree] = None
+		self._crs_local = None
+		self._transformador: Optional[pyproj.Transformer] = None
+		self._projecoes: dict[str, np.ndarray] = {}
+
+	@property
+	def gdf_residencias(self) -> gpd.GeoDataFrame:
+		"""GeoDataFrame das residências (criado no primeiro acesso no modo compacto)."""
+		if self._gdf_residencias is None:
+			self._gdf_residencias = self._geodataframe_de_coordenadas(self.coords_residencias)  # type: ignore
+		return self._gdf_residencias
+
+	@gdf_residencias.setter
+	def gdf_residencias(self, gdf: gpd.GeoDataFrame):
+		self._gdf_residencias = gdf
+
+	@property
+	def gdf_pontos_onibus(self) -> gpd.GeoDataFrame:
+		"""GeoDataFrame dos pontos de ônibus (criado no primeiro acesso no modo compacto)."""
+		if self._gdf_pontos_onibus is None:
+			self._gdf_pontos_onibus = self._geodataframe_de_coordenadas(self.coords_pontos_onibus)  # type: ignore
+		return self._gdf_pontos_onibus
 
-		self.coords_residencias, self.coords_pontos_onibus = self._extrair_coordenadas()
+	@gdf_pontos_onibus.setter
+	def gdf_pontos_onibus(self, gdf: gpd.GeoDataFrame):
+		self._gdf_pontos_onibus = gdf
+
+	def _geodataframe_de_coordenadas(self, coords: np.ndarray) -> gpd.GeoDataFrame:
+		"""Cria um GeoDataFrame com as colunas 'indice', 'longitude', 'latitude' e geometry a partir de um array (n, 2)."""
+		return gpd.GeoDataFrame(
+			{"indice": np.arange(len(coords)), "longitude": coords[:, 0], "latitude": coords[:, 1]},
+			geometry=gpd.points_from_xy(coords[:, 0], coords[:, 1]),
+			crs=self.EARTH_CRS,
+		)
+
+	def _coordenadas_compactas(self, df_residencias: pd.DataFrame, df_pontos_onibus: pd.DataFrame, dtype: type) -> tuple[np.ndarray, np.ndarray]:
+		"""Lê as coordenadas das colunas 'longitude'/'latitude' para arrays contíguos, sem criar geometrias."""
+		if not self._verificar_formato_coordenadas(df_pontos_onibus):
+			raise ValueError("Coordenadas dos pontos de ônibus estão em formato incorreto!")
+
+		coords_residencias = np.ascontiguousarray(df_residencias[["longitude", "latitude"]].to_numpy(dtype=np.float64))
+		if len(coords_residencias) and not self._verificar_formato_coordenadas(df_residencias):
+			print("Normalizando coordenadas das residências...")
+			coords_residencias /= 1000000
+		coords_pontos_onibus = np.ascontiguousarray(df_pontos_onibus[["longitude", "latitude"]].to_numpy(dtype=dtype))
+		return coords_residencias.astype(dtype, copy=False), coords_pontos_onibus
 
 	def _verificar_formato_coordenadas(self, df: pd.DataFrame) -> bool:
 		"""Verifica se as coordenadas estão no formato decimal padrão."""
@@ -45,10 +146,10 @@ class Associador:
 		"""
 		# Extrair coordenadas das residências
 		if isinstance(self.gdf_pontos_onibus, gpd.GeoDataFrame) and isinstance(self.gdf_residencias, gpd.GeoDataFrame):
-			coords_residencias = np.array([[geom.x, geom.y] for geom in self.gdf_residencias.geometry])
+			coords_residencias = np.array([[geom.x, geom.y] for geom in self.gdf_residencias.geometry], dtype=np.float64).reshape(-1, 2)
 
 			# Extrair coordenadas dos pontos de ônibus
-			coords_pontos_onibus = np.array([[geom.x, geom.y] for geom in self.gdf_pontos_onibus.geometry])
+			coords_pontos_onibus = np.array([[geom.x, geom.y] for geom in self.gdf_pontos_onibus.geometry], dtype=np.float64).reshape(-1, 2)
 
 			return coords_residencias, coords_pontos_onibus
 		return None, None
@@ -58,7 +159,7 @@ class Associador:
 		residencias = df_residencias.copy()
 
 		# Normalização de coordenadas se necessário
-		if not self._verificar_formato_coordenadas(residencias):
+		if len(residencias) and not self._verificar_formato_coordenadas(residencias):
 			print("Normalizando coordenadas das residências...")
 			residencias["longitude"] = residencias["longitude"] / 1000000
 			residencias["latitude"] = residencias["latitude"] / 1000000
@@ -75,39 +176,39 @@ class Associador:
 
 		# Criar GeoDataFrames
 		gdf_residencias = gpd.GeoDataFrame(data=residencias, geometry=geometry_residencias, crs=self.EARTH_CRS)  # type: ignore
-		gdf_residencias.reset_index(inplace=True, names='indice')
+		gdf_residencias.reset_index(inplace=True, names="indice")
 
 		gdf_pontos_onibus = gpd.GeoDataFrame(data=df_pontos_onibus, geometry=geometry_onibus, crs=self.EARTH_CRS)  # type: ignore
-		gdf_pontos_onibus.reset_index(inplace=True, names='indice')
+		gdf_pontos_onibus.reset_index(inplace=True, names="indice")
 
 		return gdf_residencias, gdf_pontos_onibus
 
-	def _distancia_euclidiana(self, coord1: np.ndarray, coord2: np.ndarray, axis: int = 1) -> np.ndarray:
+	@staticmethod
+	def _distancia_euclidiana(coord1: np.ndarray, coord2: np.ndarray, axis: int = 1) -> np.ndarray:
 		"""Calcula a distância euclidiana entre dois conjuntos de coordenadas."""
 		return np.sqrt(np.sum(np.square(coord1 - coord2), axis=axis))
 
-	def _distancia_haversine(self, coord1: np.ndarray, coord2: np.ndarray) -> np.ndarray:
+	@classmethod
+	def _distancia_haversine(cls, coord1: np.ndarray, coord2: np.ndarray) -> np.ndarray:
 		"""
 		Calcula a distância de Haversine entre dois conjuntos de coordenadas.
 
 		Parameters:
 		-----------
 		coord1 : np.ndarray
-			Array com formato (1, 2) contendo a latitude e longitude de uma residência
+			Array com formato (1, 2) ou (n, 2) contendo longitude e latitude das residências
 		coord2 : np.ndarray
-			Array com formato (n, 2) contendo as latitudes e longitudes dos pontos de ônibus
+			Array com formato (n, 2) contendo longitude e latitude dos pontos de ônibus
 
 		Returns:
 		--------
 		np.ndarray
-			Array com as distâncias entre a residência e cada ponto de ônibus
+			Array com as distâncias entre as residências e os pontos de ônibus (par a par ou
+			da única residência para cada ponto)
 		"""
-		# Raio da Terra em metros
-		R = 6371000
-
-		# Extrair as latitudes e longitudes dos arrays
-		lat1, lon1 = coord1[0, 0], coord1[0, 1]
-		lat2, lon2 = coord2[:, 0], coord2[:, 1]
+		# Extrair as longitudes e latitudes dos arrays (mesma ordem de geom.x, geom.y)
+		lon1, lat1 = coord1[:, 0], coord1[:, 1]
+		lon2, lat2 = coord2[:, 0], coord2[:, 1]
 
 		# Converter as coordenadas de graus para radianos
 		lat1, lon1 = np.radians(lat1), np.radians(lon1)
@@ -122,9 +223,153 @@ class Associador:
 		c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 		# Distância em metros
-		distance = R * c
+		distance = cls.RAIO_TERRA * c
 		return distance
 
+	@staticmethod
+	def _coordenadas_esfera_unitaria(coords: np.ndarray) -> np.ndarray:
+		"""
+		Converte coordenadas (longitude, latitude) em graus para pontos cartesianos na esfera unitária.
+
+		A distância euclidiana (corda) entre dois pontos na esfera unitária cresce de forma
+		monotônica com a distância de Haversine, logo o vizinho mais próximo é o mesmo.
+
+		Args:
+			coords (np.ndarray): Array (n, 2) com longitude e latitude em graus.
+
+		Returns:
+			np.ndarray: Array (n, 3) com as coordenadas x, y, z.
+		"""
+		lon, lat = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+		cos_lat = np.cos(lat)
+		return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+	def _arvore_pontos_onibus(self) -> cKDTree:
+		"""Retorna (construindo apenas uma vez) a KD-tree dos pontos de ônibus (esfera unitária ou plano projetado)."""
+		if self._arvore_pontos is None:
+			self._arvore_pontos = cKDTree(self._pontos_indexaveis(self._coordenadas_calculo("pontos")))
+		return self._arvore_pontos
+
+	@property
+	def _metrica(self) -> str:
+		"""Métrica usada nos kernels de distância: euclidiana no modo projetado, Haversine caso contrário."""
+		return "euclidiana" if self.projecao is not None else "haversine"
+
+	def _projetar(self, coords: np.ndarray) -> np.ndarray:
+		"""Projeta coordenadas (longitude, latitude) em graus para o CRS métrico local."""
+		if self._transformador is None:
+			self._transformador = pyproj.Transformer.from_crs(self.EARTH_CRS, self._crs_metrico(), always_xy=True)
+		x, y = self._transformador.transform(coords[:, 0], coords[:, 1])
+		return np.column_stack((x, y)).reshape(-1, 2)
+
+	def _coordenadas_projetadas(self, tipo: str) -> np.ndarray:
+		"""
+		Retorna as coordenadas projetadas ("residencias" ou "pontos"), projetando apenas uma vez.
+
+		Args:
+			tipo (str): "residencias" ou "pontos".
+
+		Returns:
+			np.ndarray: Array (n, 2) com x, y em metros no CRS métrico local.
+		"""
+		if tipo not in self._projecoes:
+			self._projecoes[tipo] = self._projetar(self.coords_residencias if tipo == "residencias" else self.coords_pontos_onibus)  # type: ignore
+		return self._projecoes[tipo]
+
+	def _coordenadas_calculo(self, tipo: str) -> np.ndarray:
+		"""Retorna as coordenadas usadas nos cálculos de distância: projetadas no modo projetado ou em graus."""
+		if self.projecao is not None:
+			return self._coordenadas_projetadas(tipo)
+		return self.coords_residencias if tipo == "residencias" else self.coords_pontos_onibus  # type: ignore
+
+	def _pontos_indexaveis(self, coords: np.ndarray) -> np.ndarray:
+		"""Converte coordenadas de cálculo para o espaço da KD-tree (plano projetado ou esfera unitária)."""
+		if self.projecao is not None:
+			return np.asarray(coords, dtype=np.float64)
+		return self._coordenadas_esfera_unitaria(coords)
+
+	def _distancia_pares(self, coord1: np.ndarray, coord2: np.ndarray) -> np.ndarray:
+		"""Calcula a distância em metros entre pares de coordenadas de cálculo."""
+		if self.projecao is not None:
+			return self._distancia_euclidiana(coord1, coord2)
+		return self._distancia_haversine(coord1, coord2)
+
+	def _invalidar_pontos(self):
+		"""Descarta a KD-tree e a projeção dos pontos de ônibus após alterações nas coordenadas."""
+		self._arvore_pontos = None
+		self._projecoes.pop("pontos", None)
+
+	def _vizinho_mais_proximo_em_blocos(
+		self, consulta: np.ndarray, referencia: np.ndarray, metrica: str = "haversine"
+	) -> tuple[np.ndarray, np.ndarray]:
+		"""
+		Encontra, para cada coordenada de consulta, a coordenada de referência mais próxima.
+
+		As distâncias são calculadas em blocos de linhas x colunas que respeitam
+		`memoria_max_bytes`, mantendo apenas o mínimo e o argmin parciais de cada linha.
+		A matriz completa N x M nunca é alocada.
+
+		Args:
+			consulta (np.ndarray): Array (n, 2) com as coordenadas (x, y) de consulta.
+			referencia (np.ndarray): Array (m, 2) com as coordenadas (x, y) de referência.
+			metrica (str): "haversine" (longitude/latitude em graus, resultado em metros) ou
+				"euclidiana" (nas unidades das coordenadas).
+
+		Returns:
+			tuple[np.ndarray, np.ndarray]: Índices da referência mais próxima e as respectivas distâncias.
+		"""
+		if metrica not in ("haversine", "euclidiana"):
+			raise ValueError(f"Métrica inválida: '{metrica}'")
+
+		n, m = len(consulta), len(referencia)
+		melhor_idx = np.zeros(n, dtype=np.intp)
+		melhor_valor = np.full(n, np.inf)
+		if n == 0 or m == 0:
+			return melhor_idx, melhor_valor
+
+		# Cerca de quatro matrizes float64 temporárias por bloco
+		celulas = max(1, self.memoria_max_bytes // (4 * np.dtype(np.float64).itemsize))
+		tamanho_colunas = int(min(m, celulas))
+		tamanho_linhas = int(max(1, celulas // tamanho_colunas))
+
+		if metrica == "haversine":
+			x_ref, y_ref = np.radians(referencia[:, 0]), np.radians(referencia[:, 1])
+			cos_y_ref = np.cos(y_ref)
+		else:
+			x_ref, y_ref = referencia[:, 0], referencia[:, 1]
+
+		for inicio in range(0, n, tamanho_linhas):
+			fim = min(inicio + tamanho_linhas, n)
+			bloco = consulta[inicio:fim]
+			if metrica == "haversine":
+				x, y = np.radians(bloco[:, 0])[:, None], np.radians(bloco[:, 1])[:, None]
+				cos_y = np.cos(y)
+			else:
+				x, y = bloco[:, 0][:, None], bloco[:, 1][:, None]
+			linhas = np.arange(fim - inicio)
+
+			for inicio_col in range(0, m, tamanho_colunas):
+				fim_col = min(inicio_col + tamanho_colunas, m)
+				if metrica == "haversine":
+					# Termo "a" da fórmula de Haversine, monotônico em relação à distância
+					valores = np.sin((y_ref[inicio_col:fim_col] - y) / 2) ** 2
+					valores += cos_y * cos_y_ref[inicio_col:fim_col] * np.sin((x_ref[inicio_col:fim_col] - x) / 2) ** 2
+				else:
+					valores = np.square(x_ref[inicio_col:fim_col] - x)
+					valores += np.square(y_ref[inicio_col:fim_col] - y)
+
+				idx_local = np.argmin(valores, axis=1)
+				valor_local = valores[linhas, idx_local]
+				melhorou = valor_local < melhor_valor[inicio:fim]
+				melhor_valor[inicio:fim][melhorou] = valor_local[melhorou]
+				melhor_idx[inicio:fim][melhorou] = idx_local[melhorou] + inicio_col
+
+		if metrica == "haversine":
+			distancias = self.RAIO_TERRA * 2 * np.arctan2(np.sqrt(melhor_valor), np.sqrt(1 - melhor_valor))
+		else:
+			distancias = np.sqrt(melhor_valor)
+		return melhor_idx, distancias
+
 	def _linestring_to_array(self, linestring: LineString):
 		"""Converte uma Linestring em um array numpy com formato [[[x1,y1]], [[x2,y2]], ...].
 
@@ -142,35 +387,345 @@ class Associador:
 
 		return array
 
-	def associar_ponto_a_linha(self):
-		"""Associa os pontos de ônibus as linhas de ônibus mais próximos."""
-		# {`01`: [1, 2, 3], '02': [4, 8, 10]}
-		relacionamento = {}
+	def _crs_metrico(self) -> pyproj.CRS:
+		"""
+		Retorna (determinando apenas uma vez) o CRS métrico local.
+
+		Se `projecao` for um CRS explícito ele é usado; caso contrário, a zona UTM é detectada a
+		partir do centro da extensão dos pontos de ônibus e das residências.
+		"""
+		if self._crs_local is None:
+			if self.projecao not in (None, "utm"):
+				self._crs_local = pyproj.CRS.from_user_input(self.projecao)
+			else:
+				coords = np.vstack((self.coords_pontos_onibus, self.coords_residencias))  # type: ignore
+				centro = (coords.min(axis=0) + coords.max(axis=0)) / 2
+				zona = int((centro[0] + 180) // 6) % 60 + 1
+				self._crs_local = pyproj.CRS.from_epsg((32700 if centro[1] < 0 else 32600) + zona)
+		return self._crs_local
+
+	def associar_ponto_a_linha(self, metodo: str = "vertices", distancia_max: Optional[float] = None) -> dict:
+		"""
+		Associa os pontos de ônibus às linhas de ônibus.
+
+		Args:
+			metodo (str): "vertices" associa a cada vértice da linha o ponto mais próximo (distância
+				em graus); "strtree" usa um índice espacial STRtree para encontrar, em uma única
+				consulta, todos os pontos a até `distancia_max` metros de qualquer trecho da linha.
+			distancia_max (Optional[float]): Distância máxima em metros usada pelo método "strtree".
+				Default é MAX_DISTANCE.
+
+		Returns:
+			dict: Dicionário {id_linha: set(índices dos pontos de ônibus)}.
+
+		Raises:
+			ValueError: Se o método informado não for suportado.
+		"""
+		if metodo not in self.METODOS_LINHA:
+			raise ValueError(f"Método de associação inválido: '{metodo}'. Use um de {self.METODOS_LINHA}")
 		if self.linhas is None:
 			raise
+
+		distancia_max = self.MAX_DISTANCE if distancia_max is None else distancia_max
+		chave = None
+		if self.cache is not None:
+			chave = self.cache.gerar_chave(
+				self.coords_pontos_onibus,  # type: ignore
+				shapely.to_wkb(self.linhas.geometry.to_numpy()),
+				self.linhas["id_linha"].to_numpy(),
+				operacao="ponto_a_linha",
+				metodo=metodo,
+				distancia_max=distancia_max if metodo == "strtree" else None,
+				crs=str(self.linhas.crs),
+				projecao=str(self.projecao),
+			)
+			if (relacionamento := self.cache.obter_relacionamento(chave)) is not None:
+				return relacionamento
+
+		if metodo == "strtree":
+			relacionamento = self._associar_ponto_a_linha_strtree(distancia_max)
+		else:
+			relacionamento = self._associar_ponto_a_linha_vertices()
+
+		if chave is not None:
+			self.cache.salvar_relacionamento(chave, relacionamento)  # type: ignore
+		return relacionamento
+
+	def _associar_ponto_a_linha_vertices(self) -> dict:
+		"""Associa a cada vértice das linhas o ponto de ônibus mais próximo (em graus ou, no modo projetado, em metros)."""
+		# {`01`: [1, 2, 3], '02': [4, 8, 10]}
+		relacionamento = {}
 		for _, linha in self.linhas.iterrows():
 			nome_linha: str = linha.id_linha
 			geometria_linha = linha.geometria_linha
 			relacionamento[nome_linha] = set()
-			pontos_compoe_linhas_onibus = self._linestring_to_array(geometria_linha)
-			distancia = self._distancia_euclidiana(pontos_compoe_linhas_onibus, self.coords_pontos_onibus, axis=2)  # type: ignore
-			relacionamento[nome_linha] = set(np.argmin(distancia, axis=1))
+			vertices_linha = np.asarray(geometria_linha.coords)[:, :2]
+			if self.projecao is not None:
+				vertices_linha = self._projetar(vertices_linha)
+			idx_pontos, _ = self._vizinho_mais_proximo_em_blocos(vertices_linha, self._coordenadas_calculo("pontos"), metrica="euclidiana")
+			relacionamento[nome_linha] = set(idx_pontos)
 		return relacionamento
 
-	def associar_residencias_a_pontos(self) -> pd.DataFrame:
-		"""Associa as residências aos pontos de ônibus mais próximos."""
-		associacoes = {"residencia": [], "ponto_onibus": [], "distancia": []}
+	def _associar_ponto_a_linha_strtree(self, distancia_max: float) -> dict:
+		"""Associa às linhas todos os pontos a até `distancia_max` metros de seus trechos usando STRtree."""
+		crs = self._crs_metrico()
+		linhas = self.linhas.geometry if self.linhas.crs is not None else self.linhas.geometry.set_crs(self.EARTH_CRS)
+		geometrias_linhas = linhas.to_crs(crs).to_numpy()
+		arvore = STRtree(shapely.points(self._coordenadas_projetadas("pontos")))
+
+		idx_linhas, idx_pontos = arvore.query(geometrias_linhas, predicate="dwithin", distance=distancia_max)
+		ordem = np.argsort(idx_linhas, kind="stable")
+		limites = np.searchsorted(idx_linhas[ordem], np.arange(len(geometrias_linhas) + 1))
+		idx_pontos = idx_pontos[ordem]
+
+		return {nome_linha: set(idx_pontos[limites[i] : limites[i + 1]]) for i, nome_linha in enumerate(self.linhas["id_linha"])}
+
+	def associar_residencias_a_pontos(self, metodo: str = "kdtree") -> pd.DataFrame:
+		"""
+		Associa as residências aos pontos de ônibus mais próximos.
+
+		Args:
+			metodo (str): Estratégia de busca. "kdtree" usa uma KD-tree sobre a esfera unitária
+				(O(N log M)); "forca_bruta" compara cada residência com todos os pontos e serve
+				como referência para conferir os resultados.
+
+		Returns:
+			pd.DataFrame: DataFrame com as colunas 'residencia', 'ponto_onibus' e 'distancia' (metros).
+
+		Raises:
+			ValueError: Se o método informado não for suportado.
+		"""
+		if metodo not in self.METODOS_BUSCA:
+			raise ValueError(f"Método de busca inválido: '{metodo}'. Use um de {self.METODOS_BUSCA}")
 		if self.coords_residencias is None or self.coords_pontos_onibus is None:
 			raise
-		for i, residencia in enumerate(self.coords_residencias):
-			distancias = self._distancia_haversine(residencia.reshape(1, -1), self.coords_pontos_onibus)
-			idx_ponto_mais_proximo = np.argmin(distancias)
-			distancia = distancias[idx_ponto_mais_proximo]
-			associacoes["residencia"].append(i)
-			associacoes["ponto_onibus"].append(idx_ponto_mais_proximo)
-			associacoes["distancia"].append(distancia)
 
-		return pd.DataFrame(associacoes)
+		chave = self._chave_cache_residencias()
+		if chave is not None and (resultado := self.cache.obter_dataframe(chave)) is not None:  # type: ignore
+			return resultado
+
+		if metodo == "forca_bruta":
+			resultado = self._associar_residencias_forca_bruta()
+		else:
+			resultado = self._associar_residencias_kdtree()
+
+		if chave is not None:
+			self.cache.salvar_dataframe(chave, resultado)  # type: ignore
+		return resultado
+
+	def _chave_cache_residencias(self) -> Optional[str]:
+		"""Retorna a chave de cache da associação residência-ponto (None sem cache)."""
+		if self.cache is None:
+			return None
+		return self.cache.gerar_chave(
+			self.coords_residencias,  # type: ignore
+			self.coords_pontos_onibus,  # type: ignore
+			operacao="residencias_a_pontos",
+			projecao=str(self.projecao),
+		)
+
+	def _associar_residencias_kdtree(self) -> pd.DataFrame:
+		"""Associa cada residência ao ponto mais próximo consultando a KD-tree dos pontos."""
+		coords_residencias, coords_pontos = self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos")
+		_, idx_pontos = self._arvore_pontos_onibus().query(self._pontos_indexaveis(coords_residencias))
+		idx_pontos = np.asarray(idx_pontos, dtype=np.intp)
+		distancias = self._distancia_pares(coords_residencias, coords_pontos[idx_pontos])
+
+		return pd.DataFrame({"residencia": np.arange(len(self.coords_residencias)), "ponto_onibus": idx_pontos, "distancia": distancias})  # type: ignore
+
+	def _associar_residencias_forca_bruta(self) -> pd.DataFrame:
+		"""Associa cada residência ao ponto mais próximo comparando com todos os pontos (referência)."""
+		idx_pontos, distancias = self._vizinho_mais_proximo_em_blocos(
+			self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos"), metrica=self._metrica
+		)
+		return pd.DataFrame({"residencia": np.arange(len(idx_pontos)), "ponto_onibus": idx_pontos, "distancia": distancias})
+
+	@classmethod
+	def _associar_tile(cls, coords_residencias: np.ndarray, coords_pontos: np.ndarray, planar: bool = False) -> tuple[np.ndarray, np.ndarray]:
+		"""
+		Associa as residências de um tile aos pontos candidatos do tile (executado nos workers).
+
+		Args:
+			coords_residencias (np.ndarray): Array (n, 2) com as coordenadas das residências do tile.
+			coords_pontos (np.ndarray): Array (m, 2) com os pontos dentro do tile e de sua margem.
+			planar (bool): Se True, as coordenadas estão projetadas em metros; caso contrário,
+				são longitude e latitude em graus.
+
+		Returns:
+			tuple[np.ndarray, np.ndarray]: Índices locais (em `coords_pontos`) e distâncias em metros.
+		"""
+		if planar:
+			_, idx_pontos = cKDTree(coords_pontos).query(coords_residencias)
+			idx_pontos = np.asarray(idx_pontos, dtype=np.intp)
+			return idx_pontos, cls._distancia_euclidiana(coords_residencias, coords_pontos[idx_pontos])
+		_, idx_pontos = cKDTree(cls._coordenadas_esfera_unitaria(coords_pontos)).query(cls._coordenadas_esfera_unitaria(coords_residencias))
+		idx_pontos = np.asarray(idx_pontos, dtype=np.intp)
+		return idx_pontos, cls._distancia_haversine(coords_residencias, coords_pontos[idx_pontos])
+
+	def _dividir_em_tiles(self, tamanho_tile: float, margem: float) -> list[tuple[np.ndarray, np.ndarray]]:
+		"""
+		Divide as residências em tiles espaciais e seleciona os pontos candidatos de cada tile.
+
+		Args:
+			tamanho_tile (float): Lado do tile em graus (no modo projetado, convertido para metros
+				pelo comprimento de um grau de latitude).
+			margem (float): Margem (halo) em metros adicionada ao redor de cada tile.
+
+		Returns:
+			list[tuple[np.ndarray, np.ndarray]]: Para cada tile, os índices das residências e
+			os índices dos pontos de ônibus a até `margem` metros do tile.
+		"""
+		coords_residencias, coords_pontos = self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos")
+		if self.projecao is not None:
+			tamanho_tile = tamanho_tile * np.radians(1) * self.RAIO_TERRA
+		origem = coords_residencias.min(axis=0)  # type: ignore
+		chaves = np.floor((coords_residencias - origem) / tamanho_tile).astype(np.int64)  # type: ignore
+		_, tile_por_residencia = np.unique(chaves, axis=0, return_inverse=True)
+		tile_por_residencia = tile_por_residencia.ravel()
+		ordem = np.argsort(tile_por_residencia, kind="stable")
+		limites = np.flatnonzero(np.diff(tile_por_residencia[ordem])) + 1
+
+		margem_lat = np.degrees(margem / self.RAIO_TERRA)
+		tiles = []
+		for idx_residencias in np.split(ordem, limites):
+			minimo = coords_residencias[idx_residencias].min(axis=0)  # type: ignore
+			maximo = coords_residencias[idx_residencias].max(axis=0)  # type: ignore
+			if self.projecao is not None:
+				margem_lon = margem_lat = margem
+			else:
+				# A margem em longitude cresce com a latitude; usa a latitude mais distante do equador
+				lat_extrema = min(np.radians(max(abs(minimo[1]), abs(maximo[1])) + margem_lat), np.radians(89.9))
+				margem_lon = np.degrees(margem / (self.RAIO_TERRA * np.cos(lat_extrema)))
+			dentro = (
+				(coords_pontos[:, 0] >= minimo[0] - margem_lon)  # type: ignore
+				& (coords_pontos[:, 0] <= maximo[0] + margem_lon)  # type: ignore
+				& (coords_pontos[:, 1] >= minimo[1] - margem_lat)  # type: ignore
+				& (coords_pontos[:, 1] <= maximo[1] + margem_lat)  # type: ignore
+			)
+			tiles.append((idx_residencias, np.flatnonzero(dentro)))
+		return tiles
+
+	def associar_residencias_a_pontos_em_paralelo(self, n_workers: Optional[int] = None, tamanho_tile: Optional[float] = None) -> pd.DataFrame:
+		"""
+		Associa as residências aos pontos mais próximos processando tiles espaciais em paralelo.
+
+		Cada tile recebe apenas os pontos a até MAX_DISTANCE metros de sua extensão. Quando o
+		ponto mais próximo encontrado está além dessa margem, pode existir um ponto mais próximo
+		fora do tile; essas residências são resolvidas novamente contra todos os pontos, de modo
+		que o resultado é idêntico ao de `associar_residencias_a_pontos`.
+
+		Args:
+			n_workers (Optional[int]): Número de processos. Default é o número de CPUs.
+			tamanho_tile (Optional[float]): Lado dos tiles em graus. Default é TAMANHO_TILE.
+
+		Returns:
+			pd.DataFrame: DataFrame com as colunas 'residencia', 'ponto_onibus' e 'distancia' (metros).
+		"""
+		if self.coords_residencias is None or self.coords_pontos_onibus is None:
+			raise
+		n_workers = n_workers or os.cpu_count() or 1
+		tamanho_tile = tamanho_tile or self.TAMANHO_TILE
+
+		chave = self._chave_cache_residencias()
+		if chave is not None and (resultado := self.cache.obter_dataframe(chave)) is not None:  # type: ignore
+			return resultado
+
+		n_residencias = len(self.coords_residencias)
+		idx_pontos = np.full(n_residencias, -1, dtype=np.intp)
+		distancias = np.full(n_residencias, np.inf)
+		if n_residencias == 0:
+			return pd.DataFrame({"residencia": np.arange(0), "ponto_onibus": idx_pontos, "distancia": distancias})
+
+		coords_residencias, coords_pontos = self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos")
+		tiles = [tile for tile in self._dividir_em_tiles(tamanho_tile, self.MAX_DISTANCE) if len(tile[1])]
+		argumentos = ([coords_residencias[r] for r, _ in tiles], [coords_pontos[p] for _, p in tiles], [self.projecao is not None] * len(tiles))
+		with ProcessPoolExecutor(max_workers=n_workers) if n_workers != 1 else nullcontext() as executor:
+			if executor is None:
+				resultados = map(self._associar_tile, *argumentos)
+			else:
+				resultados = executor.map(self._associar_tile, *argumentos, chunksize=max(1, len(tiles) // (4 * n_workers)))
+
+			for (idx_residencias, candidatos), (idx_local, distancia) in zip(tiles, resultados, strict=True):
+				idx_pontos[idx_residencias] = candidatos[idx_local]
+				distancias[idx_residencias] = distancia
+
+		# Residências sem garantia de exatidão dentro do tile são resolvidas globalmente
+		pendentes = np.flatnonzero(distancias > self.MAX_DISTANCE)
+		if len(pendentes):
+			_, idx_globais = self._arvore_pontos_onibus().query(self._pontos_indexaveis(coords_residencias[pendentes]))
+			idx_pontos[pendentes] = idx_globais
+			distancias[pendentes] = self._distancia_pares(coords_residencias[pendentes], coords_pontos[idx_pontos[pendentes]])
+
+		resultado = pd.DataFrame({"residencia": np.arange(n_residencias), "ponto_onibus": idx_pontos, "distancia": distancias})
+		if chave is not None:
+			self.cache.salvar_dataframe(chave, resultado)  # type: ignore
+		return resultado
+
+	def k_pontos_mais_proximos(self, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Busca os k pontos de ônibus mais próximos de cada residência.
+
+		O resultado segue o formato CSR: os pontos da residência `i` estão em
+		`indices[offsets[i]:offsets[i + 1]]`, ordenados do mais próximo ao mais distante.
+
+		Args:
+			k (int): Quantidade de pontos por residência. Limitada ao total de pontos de ônibus.
+
+		Returns:
+			tuple[np.ndarray, np.ndarray, np.ndarray]: Arrays `offsets` (n + 1), `indices` dos
+			pontos de ônibus e `distancias` em metros. Sem pontos de ônibus, todas as residências
+			ficam sem vizinhos (offsets nulos e arrays vazios).
+		"""
+		if k < 1:
+			raise ValueError("k deve ser maior ou igual a 1.")
+		coords_residencias, coords_pontos = self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos")
+		if not len(coords_pontos):
+			return np.zeros(len(coords_residencias) + 1, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+		k = min(k, len(coords_pontos))
+
+		_, indices = self._arvore_pontos_onibus().query(self._pontos_indexaveis(coords_residencias), k=k)
+		indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+		distancias = self._distancia_pares(np.repeat(coords_residencias, k, axis=0), coords_pontos[indices])
+		return np.arange(len(coords_residencias) + 1, dtype=np.intp) * k, indices, distancias
+
+	def pontos_no_raio(self, raio: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Busca todos os pontos de ônibus a até `raio` metros de cada residência.
+
+		Os pares são obtidos de uma só vez pela matriz esparsa de distâncias entre a KD-tree das
+		residências e a dos pontos, sem criar listas Python por residência. O resultado segue o
+		formato CSR: os pontos da residência `i` estão em `indices[offsets[i]:offsets[i + 1]]`,
+		ordenados do mais próximo ao mais distante.
+
+		Args:
+			raio (float): Raio de busca em metros.
+
+		Returns:
+			tuple[np.ndarray, np.ndarray, np.ndarray]: Arrays `offsets` (n + 1), `indices` dos
+			pontos de ônibus e `distancias` em metros.
+		"""
+		if raio <= 0:
+			raise ValueError("O raio deve ser maior que zero.")
+		coords_residencias, coords_pontos = self._coordenadas_calculo("residencias"), self._coordenadas_calculo("pontos")
+
+		if self.projecao is not None:
+			raio_indice = raio
+		else:
+			# Corda na esfera unitária equivalente ao raio (com folga numérica; o filtro exato vem depois)
+			raio_indice = 2 * np.sin(min(raio / (2 * self.RAIO_TERRA), np.pi / 2)) * (1 + 1e-9)
+		arvore_residencias = cKDTree(self._pontos_indexaveis(coords_residencias))
+		pares = arvore_residencias.sparse_distance_matrix(self._arvore_pontos_onibus(), raio_indice, output_type="ndarray")
+
+		idx_residencias = pares["i"].astype(np.intp)
+		indices = pares["j"].astype(np.intp)
+		distancias = self._distancia_pares(coords_residencias[idx_residencias], coords_pontos[indices])
+		dentro = distancias <= raio
+		idx_residencias, indices, distancias = idx_residencias[dentro], indices[dentro], distancias[dentro]
+
+		ordem = np.lexsort((distancias, idx_residencias))
+		offsets = np.zeros(len(coords_residencias) + 1, dtype=np.intp)
+		np.cumsum(np.bincount(idx_residencias, minlength=len(coords_residencias)), out=offsets[1:])
+		return offsets, indices[ordem], distancias[ordem]
 
 	def _calcular_proporcao_distancia(self, df: pd.DataFrame, limite=400):
 		total_residencias = len(df)
@@ -178,34 +733,320 @@ class Associador:
 		proporcao = residencias_proximas / total_residencias
 		return proporcao
 
-	def consolidar_associacoes(self) -> pd.DataFrame:
+	def _matriz_incidencia(self, pontos_linhas: dict) -> sparse.csr_matrix:
 		"""
-		Consolida todas as associações (linhas, pontos de ônibus e residências).
+		Monta a matriz esparsa de incidência ponto x linha.
+
+		Args:
+			pontos_linhas (dict): Dicionário {id_linha: set(índices dos pontos de ônibus)}.
 
 		Returns:
-			list: Lista consolidada com linha, ponto de ônibus, residência e distância.
+			sparse.csr_matrix: Matriz (pontos x linhas) com 1 onde o ponto atende a linha.
 		"""
-		try:
-			residencias_pontos: pd.DataFrame = self.associar_residencias_a_pontos()
-			pontos_linhas = self.associar_ponto_a_linha()
-			limite_distancia = 500
-			consolidado = {"id_linha": [], "distancia": [], "proporcao": []}
-			for nome_linha, pontos_onibus_linha in pontos_linhas.items():
-				distancias_associadas = residencias_pontos[residencias_pontos["ponto_onibus"].isin(pontos_onibus_linha)]
+		tamanhos = [len(pontos) for pontos in pontos_linhas.values()]
+		idx_pontos = np.fromiter((ponto for pontos in pontos_linhas.values() for ponto in pontos), dtype=np.intp, count=sum(tamanhos))
+		idx_linhas = np.repeat(np.arange(len(tamanhos)), tamanhos)
+		return sparse.csr_matrix(
+			(np.ones(len(idx_pontos)), (idx_pontos, idx_linhas)),
+			shape=(len(self.coords_pontos_onibus), len(tamanhos)),  # type: ignore
+		)
+
+	def _agregados_por_ponto(self, idx_pontos: np.ndarray, distancias: np.ndarray) -> np.ndarray:
+		"""
+		Agrega as distâncias das residências por ponto de ônibus.
+
+		Args:
+			idx_pontos (np.ndarray): Ponto de ônibus associado a cada residência.
+			distancias (np.ndarray): Distância de cada residência ao seu ponto.
+
+		Returns:
+			np.ndarray: Array (pontos x 3) com soma das distâncias, quantidade de residências e
+			quantidade de residências abaixo de LIMITE_PROPORCAO.
+		"""
+		n_pontos = len(self.coords_pontos_onibus)  # type: ignore
+		return np.column_stack((
+			np.bincount(idx_pontos, weights=distancias, minlength=n_pontos),
+			np.bincount(idx_pontos, minlength=n_pontos),
+			np.bincount(idx_pontos, weights=distancias < self.LIMITE_PROPORCAO, minlength=n_pontos),
+		)).astype(np.float64)
 
-				media_distancia = distancias_associadas["distancia"].mean()
+	def _consolidar_por_linha(self, ids_linhas: list, agregados_linhas: np.ndarray) -> pd.DataFrame:
+		"""Converte os agregados (soma, quantidade, abaixo do limite) por linha em distância média e proporção."""
+		with np.errstate(invalid="ignore", divide="ignore"):
+			media_distancia = agregados_linhas[:, 0] / agregados_linhas[:, 1]
+			proporcao = agregados_linhas[:, 2] / agregados_linhas[:, 1]
+		return pd.DataFrame({"id_linha": ids_linhas, "distancia": media_distancia, "proporcao": proporcao})
 
-				proporcao = (distancias_associadas["distancia"] < limite_distancia).mean()
+	def consolidar_associacoes(
+		self, metodo_linha: str = "vertices", n_workers: Optional[int] = 1, tamanho_tile: Optional[float] = None
+	) -> pd.DataFrame:
+		"""
+		Consolida todas as associações (linhas, pontos de ônibus e residências).
 
-				consolidado["id_linha"].append(nome_linha)
-				consolidado["distancia"].append(media_distancia)
-				consolidado["proporcao"].append(proporcao)
+		Args:
+			metodo_linha (str): Método usado em `associar_ponto_a_linha` ("vertices" ou "strtree").
+			n_workers (Optional[int]): Número de processos para associar as residências. Com 1 (default)
+				a associação é feita no processo atual; None usa todas as CPUs.
+			tamanho_tile (Optional[float]): Lado dos tiles em graus na execução paralela.
+
+		Returns:
+			list: Lista consolidada com linha, ponto de ônibus, residência e distância.
+		"""
+		try:
+			if n_workers == 1:
+				residencias_pontos: pd.DataFrame = self.associar_residencias_a_pontos()
+			else:
+				residencias_pontos = self.associar_residencias_a_pontos_em_paralelo(n_workers, tamanho_tile)
+			pontos_linhas = self.associar_ponto_a_linha(metodo=metodo_linha)
+			incidencia = self._matriz_incidencia(pontos_linhas)
+			agregados = self._agregados_por_ponto(residencias_pontos["ponto_onibus"].to_numpy(), residencias_pontos["distancia"].to_numpy())
 
-			return pd.DataFrame(consolidado)
+			# Estado mantido para as atualizações incrementais
+			self._ponto_por_residencia = residencias_pontos["ponto_onibus"].to_numpy(dtype=np.intp, copy=True)
+			self._distancia_por_residencia = residencias_pontos["distancia"].to_numpy(dtype=np.float64, copy=True)
+			self._pontos_linhas = {nome_linha: set(pontos) for nome_linha, pontos in pontos_linhas.items()}
+			self._agregados_pontos = agregados
+			self.consolidado = self._consolidar_por_linha(list(pontos_linhas), incidencia.T @ agregados)
+			return self.consolidado
 		except Exception as e:
 			print(f"Erro ao consolidar as associações: {e}")
 			return pd.DataFrame()
 
+	def _coordenadas_lote(self, lote: pd.DataFrame) -> np.ndarray:
+		"""Extrai as coordenadas (longitude, latitude) de um lote de residências, normalizando se necessário."""
+		coords = lote[["longitude", "latitude"]].to_numpy(dtype=np.float64)
+		if len(coords) and not self._verificar_formato_coordenadas(lote):
+			coords /= 1000000
+		return coords
+
+	def consolidar_associacoes_em_lotes(self, lotes_residencias: Iterable[pd.DataFrame], metodo_linha: str = "vertices") -> pd.DataFrame:
+		"""
+		Consolida as associações processando as residências em lotes.
+
+		Cada lote (por exemplo, de `pd.read_csv(..., chunksize=...)`) é associado aos pontos de
+		ônibus e acumulado em somas e contagens por ponto; nenhum lote é mantido em memória após
+		ser processado. Os agregados por ponto ficam disponíveis em `agregados_pontos`.
+
+		Args:
+			lotes_residencias (Iterable[pd.DataFrame]): Lotes com as colunas 'longitude' e 'latitude'.
+				A normalização de coordenadas é verificada em cada lote.
+			metodo_linha (str): Método usado em `associar_ponto_a_linha` ("vertices" ou "strtree").
+
+		Returns:
+			pd.DataFrame: DataFrame com as colunas 'id_linha', 'distancia' e 'proporcao', como em
+			`consolidar_associacoes`.
+		"""
+		pontos_linhas = self.associar_ponto_a_linha(metodo=metodo_linha)
+		arvore = self._arvore_pontos_onibus()
+		coords_pontos = self._coordenadas_calculo("pontos")
+
+		agregados = np.zeros((len(self.coords_pontos_onibus), 3))  # type: ignore
+		for lote in lotes_residencias:
+			coords = self._coordenadas_lote(lote)
+			if not len(coords):
+				continue
+			if self.projecao is not None:
+				coords = self._projetar(coords)
+			_, idx_pontos = arvore.query(self._pontos_indexaveis(coords))
+			idx_pontos = np.asarray(idx_pontos, dtype=np.intp)
+			agregados += self._agregados_por_ponto(idx_pontos, self._distancia_pares(coords, coords_pontos[idx_pontos]))
+
+		self.agregados_pontos = pd.DataFrame(agregados, columns=["soma_distancia", "quantidade_residencias", "quantidade_abaixo_limite"])
+		return self._consolidar_por_linha(list(pontos_linhas), self._matriz_incidencia(pontos_linhas).T @ agregados)
+
+	def _verificar_estado_incremental(self):
+		"""Garante que `consolidar_associacoes` já foi executado antes de uma atualização incremental."""
+		if getattr(self, "consolidado", None) is None:
+			raise RuntimeError("Execute consolidar_associacoes antes de atualizar pontos ou residências")
+
+	def _contribuicoes(self, distancias: np.ndarray) -> np.ndarray:
+		"""Retorna a contribuição (distância, 1, abaixo do limite) de cada residência aos agregados."""
+		return np.column_stack((distancias, np.ones(len(distancias)), distancias < self.LIMITE_PROPORCAO)).astype(np.float64)
+
+	def _reatribuir_residencias(self, idx_residencias: np.ndarray, novos_pontos: np.ndarray, novas_distancias: np.ndarray) -> set:
+		"""
+		Troca o ponto associado a um conjunto de residências, ajustando os agregados por ponto.
+
+		Returns:
+			set: Pontos cujos agregados foram alterados.
+		"""
+		antigos = self._ponto_por_residencia[idx_residencias]
+		np.subtract.at(self._agregados_pontos, antigos, self._contribuicoes(self._distancia_por_residencia[idx_residencias]))
+		np.add.at(self._agregados_pontos, novos_pontos, self._contribuicoes(novas_distancias))
+		self._ponto_por_residencia[idx_residencias] = novos_pontos
+		self._distancia_por_residencia[idx_residencias] = novas_distancias
+		return set(antigos.tolist()) | set(novos_pontos.tolist())
+
+	def _atualizar_consolidado(self, pontos_alterados: set, linhas_alteradas: Optional[set] = None):
+		"""Recalcula, no próprio DataFrame consolidado, apenas as linhas que atendem pontos alterados."""
+		linhas_alteradas = set(linhas_alteradas or ())
+		for nome_linha, pontos in self._pontos_linhas.items():
+			if nome_linha not in linhas_alteradas and not pontos.isdisjoint(pontos_alterados):
+				linhas_alteradas.add(nome_linha)
+		if not linhas_alteradas:
+			return
+
+		ids_linhas = [nome for nome in self._pontos_linhas if nome in linhas_alteradas]
+		agregados = np.array([self._agregados_pontos[list(self._pontos_linhas[nome])].sum(axis=0) for nome in ids_linhas]).reshape(-1, 3)
+		atualizado = self._consolidar_por_linha(ids_linhas, agregados)
+		posicoes = pd.Index(self.consolidado["id_linha"]).get_indexer(ids_linhas)
+		for posicao, (_, linha) in zip(posicoes, atualizado.iterrows(), strict=True):
+			# Linhas novas (informadas em adicionar_ponto) são acrescentadas ao final
+			rotulo = self.consolidado.index[posicao] if posicao >= 0 else len(self.consolidado)
+			self.consolidado.loc[rotulo] = linha
+
+	def adicionar_ponto(self, longitude: float, latitude: float, linhas: Iterable = ()) -> int:
+		"""
+		Adiciona um ponto de ônibus e reassocia somente as residências que ficaram mais próximas dele.
+
+		Args:
+			longitude (float): Longitude do novo ponto.
+			latitude (float): Latitude do novo ponto.
+			linhas (Iterable): Identificadores das linhas que passam a atender o ponto.
+
+		Returns:
+			int: Índice do novo ponto de ônibus.
+		"""
+		self._verificar_estado_incremental()
+		linhas = set(linhas)
+		idx_ponto = len(self.coords_pontos_onibus)  # type: ignore
+		coord = np.array([[longitude, latitude]], dtype=self.coords_pontos_onibus.dtype)  # type: ignore
+
+		self.coords_pontos_onibus = np.vstack((self.coords_pontos_onibus, coord))  # type: ignore
+		self._agregados_pontos = np.vstack((self._agregados_pontos, np.zeros((1, 3))))
+		self._invalidar_pontos()
+		if self._gdf_pontos_onibus is not None:
+			novo = gpd.GeoDataFrame({"longitude": [longitude], "latitude": [latitude]}, geometry=[Point(longitude, latitude)], crs=self.EARTH_CRS)
+			self.gdf_pontos_onibus = gpd.GeoDataFrame(pd.concat([self.gdf_pontos_onibus, novo], ignore_index=True), crs=self.EARTH_CRS)
+		for nome_linha in linhas:
+			self._pontos_linhas.setdefault(nome_linha, set()).add(idx_ponto)
+
+		coord_calculo = self._projetar(coord) if self.projecao is not None else coord
+		distancias = self._distancia_pares(coord_calculo, self._coordenadas_calculo("residencias"))
+		afetadas = np.flatnonzero(distancias < self._distancia_por_residencia)
+		pontos_alterados = self._reatribuir_residencias(afetadas, np.full(len(afetadas), idx_ponto), distancias[afetadas])
+		self._atualizar_consolidado(pontos_alterados | {idx_ponto}, linhas)
+		return idx_ponto
+
+	def remover_ponto(self, idx_ponto: int):
+		"""
+		Remove um ponto de ônibus e reassocia apenas as residências que eram atendidas por ele.
+
+		Os índices dos pontos posteriores ao removido são deslocados em uma posição.
+
+		Args:
+			idx_ponto (int): Índice do ponto de ônibus a ser removido.
+		"""
+		self._verificar_estado_incremental()
+		if len(self.coords_pontos_onibus) <= 1:  # type: ignore
+			raise ValueError("Não é possível remover o único ponto de ônibus")
+
+		afetadas = np.flatnonzero(self._ponto_por_residencia == idx_ponto)
+		linhas_alteradas = {nome for nome, pontos in self._pontos_linhas.items() if idx_ponto in pontos}
+
+		self.coords_pontos_onibus = np.delete(self.coords_pontos_onibus, idx_ponto, axis=0)  # type: ignore
+		self._agregados_pontos = np.delete(self._agregados_pontos, idx_ponto, axis=0)
+		self._invalidar_pontos()
+		if self._gdf_pontos_onibus is not None:
+			self.gdf_pontos_onibus = self.gdf_pontos_onibus.drop(index=self.gdf_pontos_onibus.index[idx_ponto]).reset_index(drop=True)
+		self._ponto_por_residencia[self._ponto_por_residencia > idx_ponto] -= 1
+		self._pontos_linhas = {
+			nome: {p - 1 if p > idx_ponto else p for p in pontos if p != idx_ponto} for nome, pontos in self._pontos_linhas.items()
+		}
+
+		novos_pontos, novas_distancias = self._vizinho_mais_proximo_em_blocos(
+			self._coordenadas_calculo("residencias")[afetadas], self._coordenadas_calculo("pontos"), metrica=self._metrica
+		)
+		# As contribuições das residências afetadas saíram junto com a linha do ponto removido
+		np.add.at(self._agregados_pontos, novos_pontos, self._contribuicoes(novas_distancias))
+		self._ponto_por_residencia[afetadas] = novos_pontos
+		self._distancia_por_residencia[afetadas] = novas_distancias
+		self._atualizar_consolidado(set(novos_pontos.tolist()), linhas_alteradas)
+
+	def mover_ponto(self, idx_ponto: int, longitude: float, latitude: float):
+		"""
+		Move um ponto de ônibus, reassociando as residências atendidas por ele e as que ficaram mais próximas.
+
+		Args:
+			idx_ponto (int): Índice do ponto de ônibus a ser movido.
+			longitude (float): Nova longitude do ponto.
+			latitude (float): Nova latitude do ponto.
+		"""
+		self._verificar_estado_incremental()
+		coord = np.array([[longitude, latitude]], dtype=self.coords_pontos_onibus.dtype)  # type: ignore
+		self.coords_pontos_onibus[idx_ponto] = coord[0]  # type: ignore
+		self._invalidar_pontos()
+		if self._gdf_pontos_onibus is not None:
+			rotulo = self.gdf_pontos_onibus.index[idx_ponto]
+			self.gdf_pontos_onibus.loc[rotulo, ["longitude", "latitude"]] = [longitude, latitude]
+			self.gdf_pontos_onibus.loc[rotulo, "geometry"] = Point(longitude, latitude)
+
+		coords_residencias = self._coordenadas_calculo("residencias")
+		distancias = self._distancia_pares(self._projetar(coord) if self.projecao is not None else coord, coords_residencias)
+		atendidas = self._ponto_por_residencia == idx_ponto
+		aproximadas = np.flatnonzero(~atendidas & (distancias < self._distancia_por_residencia))
+		atendidas = np.flatnonzero(atendidas)
+		# Residências do ponto movido podem ter ficado mais perto de outro ponto
+		novos_pontos, novas_distancias = self._vizinho_mais_proximo_em_blocos(
+			coords_residencias[atendidas], self._coordenadas_calculo("pontos"), metrica=self._metrica
+		)
+
+		afetadas = np.concatenate((atendidas, aproximadas))
+		novos_pontos = np.concatenate((novos_pontos, np.full(len(aproximadas), idx_ponto)))
+		novas_distancias = np.concatenate((novas_distancias, distancias[aproximadas]))
+		self._atualizar_consolidado(self._reatribuir_residencias(afetadas, novos_pontos, novas_distancias) | {idx_ponto})
+
+	def adicionar_residencia(self, longitude: float, latitude: float) -> int:
+		"""
+		Adiciona uma residência (em graus decimais) e a associa ao ponto de ônibus mais próximo.
+
+		Args:
+			longitude (float): Longitude da residência.
+			latitude (float): Latitude da residência.
+
+		Returns:
+			int: Índice da nova residência.
+		"""
+		self._verificar_estado_incremental()
+		idx_residencia = len(self.coords_residencias)  # type: ignore
+		coord = np.array([[longitude, latitude]], dtype=self.coords_residencias.dtype)  # type: ignore
+		coord_calculo = self._projetar(coord) if self.projecao is not None else coord
+		idx_ponto, distancia = self._vizinho_mais_proximo_em_blocos(coord_calculo, self._coordenadas_calculo("pontos"), metrica=self._metrica)
+
+		self.coords_residencias = np.vstack((self.coords_residencias, coord))  # type: ignore
+		if "residencias" in self._projecoes:
+			self._projecoes["residencias"] = np.vstack((self._projecoes["residencias"], coord_calculo))
+		if self._gdf_residencias is not None:
+			nova = gpd.GeoDataFrame({"longitude": [longitude], "latitude": [latitude]}, geometry=[Point(longitude, latitude)], crs=self.EARTH_CRS)
+			self.gdf_residencias = gpd.GeoDataFrame(pd.concat([self.gdf_residencias, nova], ignore_index=True), crs=self.EARTH_CRS)
+		self._ponto_por_residencia = np.append(self._ponto_por_residencia, idx_ponto)
+		self._distancia_por_residencia = np.append(self._distancia_por_residencia, distancia)
+		np.add.at(self._agregados_pontos, idx_ponto, self._contribuicoes(distancia))
+		self._atualizar_consolidado(set(idx_ponto.tolist()))
+		return idx_residencia
+
+	def remover_residencia(self, idx_residencia: int):
+		"""
+		Remove uma residência, retirando sua contribuição das linhas que atendem o seu ponto.
+
+		Os índices das residências posteriores à removida são deslocados em uma posição.
+
+		Args:
+			idx_residencia (int): Índice da residência a ser removida.
+		"""
+		self._verificar_estado_incremental()
+		idx_ponto = self._ponto_por_residencia[idx_residencia]
+		self._agregados_pontos[idx_ponto] -= self._contribuicoes(self._distancia_por_residencia[[idx_residencia]])[0]
+
+		self.coords_residencias = np.delete(self.coords_residencias, idx_residencia, axis=0)  # type: ignore
+		if "residencias" in self._projecoes:
+			self._projecoes["residencias"] = np.delete(self._projecoes["residencias"], idx_residencia, axis=0)
+		if self._gdf_residencias is not None:
+			self.gdf_residencias = self.gdf_residencias.drop(index=self.gdf_residencias.index[idx_residencia]).reset_index(drop=True)
+		self._ponto_por_residencia = np.delete(self._ponto_por_residencia, idx_residencia)
+		self._distancia_por_residencia = np.delete(self._distancia_por_residencia, idx_residencia)
+		self._atualizar_consolidado({int(idx_ponto)})
+
 	def get_geodataframe_com_distancia(self) -> gpd.GeoDataFrame:
 		"""
 		Faz o join entre os pontos de ônibus e as distâncias calculadas.
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class CacheAssociacoes:
+	"""
+	Cache em disco, endereçado por conteúdo, para os resultados do Associador.
+
+	Cada entrada é um arquivo NumPy (.npz) cujo nome é o hash das coordenadas e dos
+	parâmetros usados no cálculo. Entradas iguais nunca são recalculadas; quando o
+	diretório ultrapassa `tamanho_max_bytes`, as entradas usadas há mais tempo são removidas.
+
+	Attributes:
+		diretorio (Path): Diretório onde as entradas são armazenadas.
+		tamanho_max_bytes (int): Tamanho máximo ocupado pelo cache em disco.
+	"""
+
+	EXTENSAO = ".npz"
+	TAMANHO_MAX_BYTES = 512 * 1024 * 1024
+
+	def __init__(self, diretorio: Union[str, Path], tamanho_max_bytes: Optional[int] = None):
+		"""
+		Inicializa o cache, criando o diretório se necessário.
+
+		Args:
+			diretorio (Union[str, Path]): Diretório onde as entradas serão armazenadas.
+			tamanho_max_bytes (Optional[int]): Tamanho máximo do cache. Default é TAMANHO_MAX_BYTES.
+		"""
+		self.diretorio = Path(diretorio)
+		self.diretorio.mkdir(parents=True, exist_ok=True)
+		self.tamanho_max_bytes = tamanho_max_bytes if tamanho_max_bytes is not None else self.TAMANHO_MAX_BYTES
+
+	def gerar_chave(self, *arrays: np.ndarray, **parametros) -> str:
+		"""
+		Gera a chave de uma entrada a partir do conteúdo dos arrays e dos parâmetros.
+
+		Args:
+			*arrays (np.ndarray): Arrays de entrada (coordenadas, geometrias em WKB etc.).
+			**parametros: Parâmetros que influenciam o resultado.
+
+		Returns:
+			str: Hash hexadecimal que identifica a entrada.
+		"""
+		h = hashlib.blake2b(digest_size=20)
+		for array in arrays:
+			array = np.ascontiguousarray(array)
+			h.update(f"{array.dtype.str}{array.shape}".encode())
+			h.update(array.tobytes() if array.dtype != object else repr(array.tolist()).encode())
+		h.update(repr(sorted(parametros.items())).encode())
+		return h.hexdigest()
+
+	def _caminho(self, chave: str) -> Path:
+		return self.diretorio / f"{chave}{self.EXTENSAO}"
+
+	def _ler(self, chave: str) -> Optional[dict]:
+		caminho = self._caminho(chave)
+		try:
+			with np.load(caminho, allow_pickle=False) as arquivo:
+				conteudo = {nome: arquivo[nome] for nome in arquivo.files}
+		except (FileNotFoundError, OSError, ValueError):
+			return None
+		# Atualiza o horário de modificação para a política LRU
+		os.utime(caminho)
+		return conteudo
+
+	def _escrever(self, chave: str, **arrays: np.ndarray):
+		descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+		try:
+			with os.fdopen(descritor, "wb") as arquivo:
+				np.savez(arquivo, **arrays)
+			os.replace(temporario, self._caminho(chave))
+		except BaseException:
+			Path(temporario).unlink(missing_ok=True)
+			raise
+		self._aplicar_limite()
+
+	def obter_dataframe(self, chave: str) -> Optional[pd.DataFrame]:
+		"""
+		Recupera um DataFrame do cache.
+
+		Args:
+			chave (str): Chave gerada por `gerar_chave`.
+
+		Returns:
+			Optional[pd.DataFrame]: DataFrame armazenado ou None se a entrada não existir.
+		"""
+		conteudo = self._ler(chave)
+		if conteudo is None:
+			return None
+		return pd.DataFrame({str(coluna): conteudo[f"coluna_{i}"] for i, coluna in enumerate(conteudo["colunas"])})
+
+	def salvar_dataframe(self, chave: str, df: pd.DataFrame):
+		"""
+		Armazena um DataFrame de colunas numéricas no cache.
+
+		Args:
+			chave (str): Chave gerada por `gerar_chave`.
+			df (pd.DataFrame): DataFrame a ser armazenado.
+		"""
+		colunas = {f"coluna_{i}": df[coluna].to_numpy() for i, coluna in enumerate(df.columns)}
+		self._escrever(chave, colunas=np.array(df.columns, dtype=str), **colunas)
+
+	def obter_relacionamento(self, chave: str) -> Optional[dict]:
+		"""
+		Recupera um relacionamento {id_linha: set(índices dos pontos)} do cache.
+
+		Args:
+			chave (str): Chave gerada por `gerar_chave`.
+
+		Returns:
+			Optional[dict]: Relacionamento armazenado ou None se a entrada não existir.
+		"""
+		conteudo = self._ler(chave)
+		if conteudo is None or "ids_json" not in conteudo:
+			return None
+		offsets, indices = conteudo["offsets"], conteudo["indices"]
+		ids = json.loads(str(conteudo["ids_json"]))
+		return {id_linha: set(indices[offsets[i] : offsets[i + 1]]) for i, id_linha in enumerate(ids)}
+
+	def salvar_relacionamento(self, chave: str, relacionamento: dict):
+		"""
+		Armazena um relacionamento {id_linha: set(índices dos pontos)} no cache.
+
+		Os ids são guardados em JSON, e não como um array NumPy, para que ids numéricos ou de
+		tipos mistos voltem com o tipo original (1, e não '1').
+
+		Args:
+			chave (str): Chave gerada por `gerar_chave`.
+			relacionamento (dict): Relacionamento a ser armazenado, com ids de texto ou numéricos.
+		"""
+		tamanhos = [len(pontos) for pontos in relacionamento.values()]
+		indices = np.fromiter((p for pontos in relacionamento.values() for p in sorted(pontos)), dtype=np.intp, count=sum(tamanhos))
+		ids = [id_linha.item() if isinstance(id_linha, np.generic) else id_linha for id_linha in relacionamento]
+		self._escrever(chave, ids_json=np.array(json.dumps(ids)), offsets=np.concatenate(([0], np.cumsum(tamanhos))), indices=indices)
+
+	def invalidar(self, chave: Optional[str] = None):
+		"""
+		Remove uma entrada específica ou, sem chave, todas as entradas do cache.
+
+		Args:
+			chave (Optional[str]): Chave da entrada a ser removida.
+		"""
+		caminhos = [self._caminho(chave)] if chave is not None else self.diretorio.glob(f"*{self.EXTENSAO}")
+		for caminho in caminhos:
+			caminho.unlink(missing_ok=True)
+
+	def tamanho_atual(self) -> int:
+		"""Retorna o espaço, em bytes, ocupado pelas entradas do cache."""
+		return sum(caminho.stat().st_size for caminho in self.diretorio.glob(f"*{self.EXTENSAO}"))
+
+	def _aplicar_limite(self):
+		"""Remove as entradas usadas há mais tempo até o cache caber em `tamanho_max_bytes`."""
+		entradas = sorted(((caminho, caminho.stat()) for caminho in self.diretorio.glob(f"*{self.EXTENSAO}")), key=lambda item: item[1].st_mtime_ns)
+		total = sum(info.st_size for _, info in entradas)
+		for caminho, info in entradas:
+			if total <= self.tamanho_max_bytes:
+				break
+			caminho.unlink(missing_ok=True)
+			total -= info.st_size
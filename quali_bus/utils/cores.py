@@ -1,5 +1,7 @@
 from random import randint
 
+import numpy as np
+
 
 class Cores:
 	"""
@@ -77,6 +79,24 @@ def cor_iqt(iqt: float) -> str:
 		return Cores.PINK
 
 
+FAIXAS_COR_IQT = ([1.0, 2.0, 3.0], [Cores.PINK, Cores.RED, Cores.BLUE, Cores.GREEN])
+
+
+def cores_iqt(iqts) -> np.ndarray:
+	"""
+	Versão vetorizada de `cor_iqt`, atribuindo as cores de um array de IQTs por busca binária.
+
+	Args:
+		iqts (array-like): Valores do Índice de Qualidade do Transporte.
+
+	Returns:
+		np.ndarray: Código hexadecimal da cor de cada IQT (valores ausentes recebem a cor de qualidade muito baixa).
+	"""
+	iqts = np.asarray(iqts, dtype=np.float64)
+	limites, cores = FAIXAS_COR_IQT
+	return np.where(np.isnan(iqts), Cores.PINK, np.asarray(cores)[np.searchsorted(limites, iqts, side="right")])
+
+
 def cor_aleatoria() -> str:
 	cor = "#{:06x}".format(randint(0, 0xFFFFFF))
 	return cor
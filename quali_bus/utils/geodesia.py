@@ -0,0 +1,76 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Union
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import CRS, Geod, Transformer
+
+ELIPSOIDE = "WGS84"
+TAMANHO_MAX_CACHE = 100_000
+
+_GEOD = Geod(ellps=ELIPSOIDE)
+_COMPRIMENTOS: OrderedDict = OrderedDict()
+
+
+def comprimentos_geodesicos(geometrias: Union[gpd.GeoSeries, np.ndarray], crs: Optional[CRS] = None) -> np.ndarray:
+	"""
+	Calcula o comprimento geodésico, em metros, de cada geometria sobre o elipsoide WGS84.
+
+	Os vértices de todas as geometrias são extraídos de uma só vez e as distâncias entre vértices
+	consecutivos de uma mesma parte são calculadas em uma única chamada vetorizada a `Geod.inv`,
+	sem reprojetar as geometrias. Os resultados são memorizados pelo hash do WKB de cada geometria,
+	de modo que chamadas posteriores com as mesmas geometrias não recalculam nada. A memória guarda
+	no máximo `TAMANHO_MAX_CACHE` geometrias, descartando as usadas há mais tempo.
+
+	Args:
+		geometrias (Union[gpd.GeoSeries, np.ndarray]): Geometrias lineares (LineString ou MultiLineString).
+		crs (Optional[CRS]): CRS das coordenadas. Default é o CRS da GeoSeries ou, na ausência dele, EPSG:4326.
+
+	Returns:
+		np.ndarray: Comprimento de cada geometria em metros (NaN para geometrias ausentes).
+	"""
+	if crs is None:
+		crs = getattr(geometrias, "crs", None)
+	crs = CRS.from_user_input(crs) if crs is not None else CRS.from_epsg(4326)
+	geometrias = np.asarray(geometrias, dtype=object)
+
+	chaves = [(crs.srs, hashlib.blake2b(wkb or b"", digest_size=16).digest()) for wkb in shapely.to_wkb(geometrias)]
+	conhecidos, pendentes = {}, {}
+	for posicao, chave in enumerate(chaves):
+		if chave in _COMPRIMENTOS:
+			_COMPRIMENTOS.move_to_end(chave)
+			conhecidos[chave] = _COMPRIMENTOS[chave]
+		elif chave not in pendentes:
+			pendentes[chave] = posicao
+
+	if pendentes:
+		calculados = dict(zip(pendentes, _calcular_comprimentos(geometrias[list(pendentes.values())], crs), strict=True))
+		conhecidos.update(calculados)
+		_COMPRIMENTOS.update(calculados)
+		while len(_COMPRIMENTOS) > TAMANHO_MAX_CACHE:
+			_COMPRIMENTOS.popitem(last=False)
+
+	comprimentos = np.array([conhecidos[chave] for chave in chaves], dtype=float)
+	comprimentos[shapely.is_missing(geometrias)] = np.nan
+	return comprimentos
+
+
+def _calcular_comprimentos(geometrias: np.ndarray, crs: CRS) -> np.ndarray:
+	partes, origem = shapely.get_parts(geometrias, return_index=True)
+	coordenadas, parte = shapely.get_coordinates(partes, return_index=True)
+	if not crs.equals(CRS.from_epsg(4326)):
+		transformador = Transformer.from_crs(crs, 4326, always_xy=True)
+		coordenadas = np.column_stack(transformador.transform(coordenadas[:, 0], coordenadas[:, 1]))
+
+	# Segmentos entre vértices consecutivos; pares que atravessam partes diferentes são descartados
+	mesma_parte = parte[:-1] == parte[1:]
+	inicio, fim = coordenadas[:-1][mesma_parte], coordenadas[1:][mesma_parte]
+	_, _, distancias = _GEOD.inv(inicio[:, 0], inicio[:, 1], fim[:, 0], fim[:, 1])
+	return np.bincount(origem[parte[:-1][mesma_parte]], weights=distancias, minlength=len(geometrias))
+
+
+def limpar_cache_comprimentos():
+	"""Descarta os comprimentos geodésicos memorizados."""
+	_COMPRIMENTOS.clear()
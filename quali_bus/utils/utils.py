@@ -1,7 +1,110 @@
+from datetime import time
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
 
 def converter_para_datetime(df, coluna, formato):
 	"""Converte uma coluna para o formato datetime especificado."""
-	df[coluna] = pd.to_datetime(df[coluna], format=formato)
+	df[coluna] = converter_unicos(df[coluna], formato)
+	return df
+
+
+def converter_unicos(serie: pd.Series, formato: Optional[str] = None) -> pd.Series:
+	"""Converte uma coluna de textos de data/hora para datetime, convertendo cada valor distinto uma única vez.
+
+	Colunas de viagens repetem poucos valores distintos (no máximo 86.400 horários "HH:MM:SS")
+	em milhões de linhas; os valores distintos são convertidos e depois mapeados de volta
+	pelos códigos inteiros de `pd.factorize`.
+
+	Args:
+		serie (pd.Series): Coluna com os valores a serem convertidos.
+		formato (Optional[str]): Formato aceito por `pd.to_datetime` (ex.: "%d/%m/%Y").
+
+	Returns:
+		pd.Series: Coluna datetime64 com o mesmo índice; valores ausentes viram NaT.
+	"""
+	codigos, unicos = pd.factorize(serie)
+	convertidos = pd.to_datetime(pd.Series(unicos, dtype=object), format=formato).to_numpy(dtype="datetime64[ns]")
+	# O código -1 (valor ausente) aponta para o NaT acrescentado ao final
+	valores = np.append(convertidos, np.datetime64("NaT", "ns"))[codigos]
+	return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def horario_para_segundos(serie: pd.Series, formato: str = "%H:%M:%S") -> pd.Series:
+	"""Converte uma coluna de horários para segundos desde a meia-noite, convertendo cada valor distinto uma única vez.
+
+	Args:
+		serie (pd.Series): Coluna com os horários (ex.: "06:30:00" ou `datetime.time`) ou já em segundos.
+		formato (str): Formato dos horários aceito por `pd.to_datetime`.
+
+	Returns:
+		pd.Series: Segundos desde a meia-noite (Int64), com o mesmo índice; valores ausentes viram <NA>.
+	"""
+	if pd.api.types.is_numeric_dtype(serie):
+		# Já convertida para segundos (ex.: pelo perfil de memória)
+		return serie.astype("Int64")
+	codigos, unicos = pd.factorize(serie)
+	# Leitores colunares (Arrow, Parquet) podem entregar objetos `datetime.time` em vez de texto
+	unicos = pd.Series(unicos, dtype=object).map(lambda valor: valor.strftime(formato) if isinstance(valor, time) else valor)
+	horarios = pd.to_datetime(unicos, format=formato)
+	segundos = (horarios.dt.hour * 3600 + horarios.dt.minute * 60 + horarios.dt.second).to_numpy(dtype=np.float64)
+	valores = np.append(segundos, np.nan)[codigos]
+	return pd.Series(valores, index=serie.index, name=serie.name).astype("Int64")
+
+
+def duracao_em_segundos(inicio: pd.Series, fim: pd.Series, formato: str = "%H:%M:%S") -> pd.Series:
+	"""Calcula a duração, em segundos inteiros, entre duas colunas de horários.
+
+	Args:
+		inicio (pd.Series): Horários de início.
+		fim (pd.Series): Horários de término.
+		formato (str): Formato dos horários aceito por `pd.to_datetime`.
+
+	Returns:
+		pd.Series: Duração em segundos (Int64); negativa quando o término é anterior ao início.
+	"""
+	return horario_para_segundos(fim, formato) - horario_para_segundos(inicio, formato)
+
+
+COLUNAS_CATEGORICAS = [
+	"id_linha",
+	"sentido",
+	"sentido_viagem",
+	"empresa",
+	"descricao_trajeto",
+	"tipo_integracao",
+	"disponibilidade_informacao",
+	"valor_tarifa",
+]
+
+
+def otimizar_memoria(
+	df: pd.DataFrame, colunas_categoricas: Optional[list] = None, colunas_horario: Optional[list] = None, formato_horario: str = "%H:%M:%S"
+) -> pd.DataFrame:
+	"""Aplica o perfil de memória: chaves e enumerações como categorias, inteiros reduzidos e horários em segundos.
+
+	Colunas de ponto flutuante são mantidas em float64: vários indicadores são comparados com
+	limiares exatos (ex.: 0.95, 0.98), e a redução para float32 mudaria a pontuação nesses valores.
+
+	Args:
+		df (pd.DataFrame): DataFrame a ser otimizado (não é modificado).
+		colunas_categoricas (Optional[list]): Colunas convertidas para `category`. Default são as
+			colunas de `COLUNAS_CATEGORICAS` presentes no DataFrame.
+		colunas_horario (Optional[list]): Colunas de horário convertidas para segundos desde a meia-noite (Int32).
+		formato_horario (str): Formato das colunas de horário.
+
+	Returns:
+		pd.DataFrame: Cópia do DataFrame com os tipos otimizados.
+	"""
+	df = df.copy()
+	if colunas_categoricas is None:
+		colunas_categoricas = [coluna for coluna in COLUNAS_CATEGORICAS if coluna in df.columns]
+	for coluna in colunas_categoricas:
+		df[coluna] = df[coluna].astype("category")
+	for coluna in colunas_horario or []:
+		df[coluna] = horario_para_segundos(df[coluna], formato_horario).astype("Int32")
+	for coluna in df.select_dtypes(include="integer").columns:
+		df[coluna] = pd.to_numeric(df[coluna], downcast="integer")
 	return df
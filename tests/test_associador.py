@@ -98,3 +98,230 @@ def test_consolidar_associacoes(associador):
 	consolidado = associador.consolidar_associacoes()
 
 	assert not consolidado.empty
+
+
+@pytest.fixture
+def associador_aleatorio():
+	"""Fixture com residências e pontos aleatórios em uma área urbana."""
+	rng = np.random.default_rng(42)
+	residencias = pd.DataFrame({"longitude": rng.uniform(-43.95, -43.85, 500), "latitude": rng.uniform(-16.75, -16.65, 500)})
+	pontos = pd.DataFrame({"longitude": rng.uniform(-43.95, -43.85, 60), "latitude": rng.uniform(-16.75, -16.65, 60)})
+	linhas = gpd.GeoDataFrame(
+		data={
+			"id_linha": ["L001", "L002"],
+			"geometria_linha": [LineString([[-43.94, -16.74], [-43.90, -16.70], [-43.86, -16.66]]), LineString([[-43.94, -16.66], [-43.86, -16.74]])],
+		},
+		geometry="geometria_linha",
+		crs="EPSG:4326",
+	)
+	return Associador(pontos, linhas, residencias)
+
+
+def test_associar_residencias_kdtree_igual_forca_bruta(associador_aleatorio):
+	"""Testa se a busca pela KD-tree retorna o mesmo resultado da busca por força bruta."""
+	kdtree = associador_aleatorio.associar_residencias_a_pontos(metodo="kdtree")
+	referencia = associador_aleatorio.associar_residencias_a_pontos(metodo="forca_bruta")
+
+	assert list(kdtree.columns) == ["residencia", "ponto_onibus", "distancia"]
+	np.testing.assert_array_equal(kdtree["ponto_onibus"], referencia["ponto_onibus"])
+	np.testing.assert_allclose(kdtree["distancia"], referencia["distancia"])
+
+
+def test_associar_residencias_metodo_invalido(associador):
+	"""Testa se um método de busca desconhecido gera erro."""
+	with pytest.raises(ValueError):
+		associador.associar_residencias_a_pontos(metodo="desconhecido")
+
+
+def test_vizinho_mais_proximo_em_blocos_respeita_orcamento(associador_aleatorio):
+	"""Testa se o kernel em blocos com orçamento mínimo de memória coincide com o cálculo completo."""
+	residencias = associador_aleatorio.coords_residencias
+	pontos = associador_aleatorio.coords_pontos_onibus
+	esperado = np.array([associador_aleatorio._distancia_haversine(r.reshape(1, -1), pontos) for r in residencias])
+
+	associador_aleatorio.memoria_max_bytes = 7 * 32  # blocos de 1 x 7 células
+	idx, distancias = associador_aleatorio._vizinho_mais_proximo_em_blocos(residencias, pontos)
+
+	np.testing.assert_array_equal(idx, esperado.argmin(axis=1))
+	np.testing.assert_allclose(distancias, esperado.min(axis=1))
+
+
+def test_associar_ponto_a_linha_euclidiana_em_blocos(associador_aleatorio):
+	"""Testa se a associação de pontos às linhas coincide com a matriz de distâncias completa."""
+	associador_aleatorio.memoria_max_bytes = 256
+	associacoes = associador_aleatorio.associar_ponto_a_linha()
+
+	for _, linha in associador_aleatorio.linhas.iterrows():
+		vertices = np.asarray(linha.geometria_linha.coords)[:, None, :]
+		distancias = np.sqrt(np.sum(np.square(vertices - associador_aleatorio.coords_pontos_onibus), axis=2))
+		assert associacoes[linha.id_linha] == set(np.argmin(distancias, axis=1))
+
+
+def test_associar_ponto_a_linha_strtree(associador_aleatorio):
+	"""Testa se o modo STRtree retorna todos os pontos a até MAX_DISTANCE metros de cada linha."""
+	associacoes = associador_aleatorio.associar_ponto_a_linha(metodo="strtree")
+
+	crs = associador_aleatorio.gdf_pontos_onibus.estimate_utm_crs()
+	pontos = associador_aleatorio.gdf_pontos_onibus.to_crs(crs).geometry
+	linhas = associador_aleatorio.linhas.to_crs(crs)
+	assert set(associacoes) == set(linhas["id_linha"])
+	for _, linha in linhas.iterrows():
+		esperado = set(np.flatnonzero(pontos.distance(linha.geometria_linha).to_numpy() <= Associador.MAX_DISTANCE))
+		assert associacoes[linha.id_linha] == esperado
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_associar_residencias_em_paralelo_igual_sequencial(associador_aleatorio, n_workers):
+	"""Testa se a execução em tiles paralelos reproduz exatamente a associação sequencial."""
+	sequencial = associador_aleatorio.associar_residencias_a_pontos()
+	paralelo = associador_aleatorio.associar_residencias_a_pontos_em_paralelo(n_workers=n_workers, tamanho_tile=0.01)
+
+	np.testing.assert_array_equal(paralelo["residencia"], sequencial["residencia"])
+	np.testing.assert_array_equal(paralelo["ponto_onibus"], sequencial["ponto_onibus"])
+	np.testing.assert_allclose(paralelo["distancia"], sequencial["distancia"])
+
+
+def test_consolidar_associacoes_matriz_incidencia(associador_aleatorio):
+	"""Testa se a consolidação via matriz de incidência coincide com o filtro linha a linha."""
+	consolidado = associador_aleatorio.consolidar_associacoes(metodo_linha="strtree")
+
+	residencias_pontos = associador_aleatorio.associar_residencias_a_pontos()
+	pontos_linhas = associador_aleatorio.associar_ponto_a_linha(metodo="strtree")
+	for _, linha in consolidado.iterrows():
+		associadas = residencias_pontos[residencias_pontos["ponto_onibus"].isin(pontos_linhas[linha.id_linha])]
+		assert np.isclose(linha.distancia, associadas["distancia"].mean())
+		assert np.isclose(linha.proporcao, (associadas["distancia"] < Associador.LIMITE_PROPORCAO).mean())
+
+
+def _consolidado_esperado(associador):
+	"""Recalcula do zero a consolidação a partir do estado atual de pontos, residências e linhas."""
+	associador._arvore_pontos = None
+	residencias_pontos = associador.associar_residencias_a_pontos()
+	linhas = []
+	for nome_linha, pontos in associador._pontos_linhas.items():
+		associadas = residencias_pontos[residencias_pontos["ponto_onibus"].isin(pontos)]
+		linhas.append({
+			"id_linha": nome_linha,
+			"distancia": associadas["distancia"].mean(),
+			"proporcao": (associadas["distancia"] < Associador.LIMITE_PROPORCAO).mean(),
+		})
+	return pd.DataFrame(linhas)
+
+
+def test_atualizacoes_incrementais(associador_aleatorio):
+	"""Testa se adicionar, mover e remover pontos e residências mantém o consolidado correto."""
+	consolidado = associador_aleatorio.consolidar_associacoes(metodo_linha="strtree")
+
+	idx_ponto = associador_aleatorio.adicionar_ponto(-43.90, -16.70, linhas=["L001", "L003"])
+	associador_aleatorio.mover_ponto(3, -43.88, -16.72)
+	associador_aleatorio.remover_ponto(5)
+	associador_aleatorio.adicionar_residencia(-43.901, -16.701)
+	associador_aleatorio.remover_residencia(10)
+
+	assert idx_ponto == 60
+	assert consolidado is associador_aleatorio.consolidado
+	assert len(associador_aleatorio.gdf_pontos_onibus) == len(associador_aleatorio.coords_pontos_onibus) == 60
+	assert len(associador_aleatorio.gdf_residencias) == len(associador_aleatorio.coords_residencias) == 500
+	pd.testing.assert_frame_equal(consolidado.reset_index(drop=True), _consolidado_esperado(associador_aleatorio), check_dtype=False)
+
+
+def test_atualizacao_incremental_sem_consolidar(associador_aleatorio):
+	"""Testa se atualizações exigem uma consolidação prévia."""
+	with pytest.raises(RuntimeError):
+		associador_aleatorio.adicionar_ponto(-43.90, -16.70)
+
+
+def test_consolidar_associacoes_em_lotes(associador_aleatorio):
+	"""Testa se o processamento em lotes reproduz a consolidação com todas as residências em memória."""
+	esperado = associador_aleatorio.consolidar_associacoes(metodo_linha="strtree")
+
+	residencias = pd.DataFrame(associador_aleatorio.coords_residencias * 1000000, columns=["longitude", "latitude"])
+	associador = Associador(associador_aleatorio.gdf_pontos_onibus[["longitude", "latitude"]], associador_aleatorio.linhas)
+	lotes = (residencias.iloc[inicio : inicio + 64] for inicio in range(0, len(residencias), 64))
+	consolidado = associador.consolidar_associacoes_em_lotes(lotes, metodo_linha="strtree")
+
+	pd.testing.assert_frame_equal(consolidado, esperado)
+	assert associador.agregados_pontos["quantidade_residencias"].sum() == len(residencias)
+
+
+def test_modo_compacto(associador_aleatorio):
+	"""Testa se o modo compacto gera os mesmos resultados sem criar geometrias até serem solicitadas."""
+	residencias = pd.DataFrame(associador_aleatorio.coords_residencias, columns=["longitude", "latitude"])
+	pontos = pd.DataFrame(associador_aleatorio.coords_pontos_onibus, columns=["longitude", "latitude"])
+	compacto = Associador(pontos, associador_aleatorio.linhas, residencias, modo_compacto=True)
+
+	assert compacto._gdf_residencias is None and compacto._gdf_pontos_onibus is None
+	assert compacto.coords_residencias.flags["C_CONTIGUOUS"]
+	pd.testing.assert_frame_equal(compacto.consolidar_associacoes(), associador_aleatorio.consolidar_associacoes())
+	assert compacto._gdf_residencias is None
+
+	gdf = compacto.get_geodataframe_com_distancia()
+	assert isinstance(compacto.gdf_residencias, gpd.GeoDataFrame)
+	assert len(gdf) == len(residencias)
+	assert list(gdf.columns) == ["latitude", "longitude", "geometry", "distancia"]
+
+
+def test_modo_compacto_float32(associador_aleatorio):
+	"""Testa o modo compacto com coordenadas em float32."""
+	residencias = pd.DataFrame(associador_aleatorio.coords_residencias, columns=["longitude", "latitude"])
+	pontos = pd.DataFrame(associador_aleatorio.coords_pontos_onibus, columns=["longitude", "latitude"])
+	compacto = Associador(pontos, associador_aleatorio.linhas, residencias, modo_compacto=True, dtype_coordenadas=np.float32)
+
+	assert compacto.coords_residencias.dtype == np.float32
+	associacoes = compacto.associar_residencias_a_pontos()
+	np.testing.assert_allclose(associacoes["distancia"], associador_aleatorio.associar_residencias_a_pontos()["distancia"], atol=1.0)
+
+
+def test_projecao_utm(associador_aleatorio):
+	"""Testa se o modo projetado detecta a zona UTM e reproduz os resultados em Haversine."""
+	residencias = pd.DataFrame(associador_aleatorio.coords_residencias, columns=["longitude", "latitude"])
+	pontos = pd.DataFrame(associador_aleatorio.coords_pontos_onibus, columns=["longitude", "latitude"])
+	projetado = Associador(pontos, associador_aleatorio.linhas, residencias, projecao="utm")
+
+	assert projetado._crs_metrico().to_epsg() == 32723
+	referencia = associador_aleatorio.associar_residencias_a_pontos()
+	resultado = projetado.associar_residencias_a_pontos()
+	assert (resultado["ponto_onibus"] == referencia["ponto_onibus"]).mean() > 0.99
+	np.testing.assert_allclose(resultado["distancia"], referencia["distancia"], rtol=0.01, atol=1)
+	assert "residencias" in projetado._projecoes
+
+	paralelo = projetado.associar_residencias_a_pontos_em_paralelo(n_workers=1)
+	pd.testing.assert_frame_equal(paralelo, resultado)
+
+	projetado.consolidar_associacoes()
+	projetado.adicionar_ponto(-43.9, -16.7, linhas=["L001"])
+	projetado.mover_ponto(0, -43.91, -16.71)
+	projetado.adicionar_residencia(-43.905, -16.705)
+	projetado.remover_residencia(3)
+	pd.testing.assert_frame_equal(projetado.consolidado.reset_index(drop=True), _consolidado_esperado(projetado), check_dtype=False)
+
+
+@pytest.mark.parametrize("projecao", [None, "utm"])
+def test_k_pontos_mais_proximos_e_raio(associador_aleatorio, projecao):
+	"""Testa as buscas em lote de k vizinhos e por raio contra o cálculo completo de distâncias."""
+	residencias = pd.DataFrame(associador_aleatorio.coords_residencias, columns=["longitude", "latitude"])
+	pontos = pd.DataFrame(associador_aleatorio.coords_pontos_onibus, columns=["longitude", "latitude"])
+	associador = Associador(pontos, associador_aleatorio.linhas, residencias, projecao=projecao)
+	coords_residencias, coords_pontos = associador._coordenadas_calculo("residencias"), associador._coordenadas_calculo("pontos")
+	completo = np.array([associador._distancia_pares(r.reshape(1, -1), coords_pontos) for r in coords_residencias])
+
+	offsets, indices, distancias = associador.k_pontos_mais_proximos(3)
+	assert len(offsets) == len(residencias) + 1 and offsets[-1] == len(indices) == 3 * len(residencias)
+	np.testing.assert_allclose(distancias.reshape(-1, 3), np.sort(completo, axis=1)[:, :3])
+	np.testing.assert_array_equal(indices[offsets[:-1]], completo.argmin(axis=1))
+
+	offsets, indices, distancias = associador.pontos_no_raio(800)
+	np.testing.assert_array_equal(np.diff(offsets), (completo <= 800).sum(axis=1))
+	for i in range(0, len(residencias), 50):
+		trecho = slice(offsets[i], offsets[i + 1])
+		assert set(indices[trecho]) == set(np.flatnonzero(completo[i] <= 800))
+		assert np.all(np.diff(distancias[trecho]) >= 0)
+
+	with pytest.raises(ValueError):
+		associador.pontos_no_raio(0)
+
+	associador.coords_pontos_onibus = np.empty((0, 2))
+	associador._invalidar_pontos()
+	for offsets, indices, distancias in [associador.k_pontos_mais_proximos(3), associador.pontos_no_raio(800)]:
+		np.testing.assert_array_equal(offsets, np.zeros(len(residencias) + 1))
+		assert len(indices) == len(distancias) == 0
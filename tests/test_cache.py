@@ -0,0 +1,96 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from quali_bus.utils.associador import Associador
+from quali_bus.utils.cache import CacheAssociacoes
+from shapely.geometry import LineString
+
+
+@pytest.fixture
+def cache(tmp_path):
+	"""Fixture que cria um cache em um diretório temporário."""
+	return CacheAssociacoes(tmp_path / "cache")
+
+
+@pytest.fixture
+def dados_associador():
+	"""Fixture com pontos de ônibus, linhas e residências para o Associador."""
+	rng = np.random.default_rng(0)
+	pontos = pd.DataFrame({"longitude": rng.uniform(-43.95, -43.85, 30), "latitude": rng.uniform(-16.75, -16.65, 30)})
+	residencias = pd.DataFrame({"longitude": rng.uniform(-43.95, -43.85, 200), "latitude": rng.uniform(-16.75, -16.65, 200)})
+	linhas = gpd.GeoDataFrame(
+		data={"id_linha": ["L001"], "geometria_linha": [LineString([[-43.94, -16.74], [-43.90, -16.70], [-43.86, -16.66]])]},
+		geometry="geometria_linha",
+		crs="EPSG:4326",
+	)
+	return pontos, linhas, residencias
+
+
+def test_gerar_chave_depende_do_conteudo(cache):
+	"""Testa se a chave muda quando os arrays ou parâmetros mudam."""
+	coords = np.arange(6, dtype=float).reshape(3, 2)
+
+	assert cache.gerar_chave(coords, metodo="a") == cache.gerar_chave(coords.copy(), metodo="a")
+	assert cache.gerar_chave(coords, metodo="a") != cache.gerar_chave(coords, metodo="b")
+	assert cache.gerar_chave(coords, metodo="a") != cache.gerar_chave(coords + 1, metodo="a")
+
+
+def test_salvar_e_obter_entradas(cache):
+	"""Testa o armazenamento de DataFrames e relacionamentos."""
+	df = pd.DataFrame({"residencia": [0, 1], "ponto_onibus": [3, 4], "distancia": [10.5, 20.0]})
+	cache.salvar_dataframe("df", df)
+	cache.salvar_relacionamento("rel", {"L001": {1, 2}, "L002": set()})
+
+	pd.testing.assert_frame_equal(cache.obter_dataframe("df"), df)
+	assert cache.obter_relacionamento("rel") == {"L001": {1, 2}, "L002": set()}
+	assert cache.obter_dataframe("inexistente") is None
+
+
+def test_relacionamento_preserva_tipo_dos_ids(cache):
+	"""Testa se ids inteiros, numpy e mistos voltam do cache com o tipo original."""
+	relacionamento = {1: {0, 3}, np.int64(2): {1}, "L003": set()}
+	cache.salvar_relacionamento("rel", relacionamento)
+
+	recuperado = cache.obter_relacionamento("rel")
+
+	assert recuperado == {1: {0, 3}, 2: {1}, "L003": set()}
+	assert [type(id_linha) for id_linha in recuperado] == [int, int, str]
+
+
+def test_invalidar(cache):
+	"""Testa a remoção explícita de entradas."""
+	df = pd.DataFrame({"a": [1.0]})
+	cache.salvar_dataframe("x", df)
+	cache.salvar_dataframe("y", df)
+
+	cache.invalidar("x")
+	assert cache.obter_dataframe("x") is None
+	assert cache.obter_dataframe("y") is not None
+
+	cache.invalidar()
+	assert cache.tamanho_atual() == 0
+
+
+def test_remove_entradas_antigas_ao_exceder_tamanho(cache):
+	"""Testa a remoção das entradas usadas há mais tempo quando o limite é excedido."""
+	df = pd.DataFrame({"a": np.arange(1000, dtype=float)})
+	cache.salvar_dataframe("antiga", df)
+	cache.tamanho_max_bytes = int(cache.tamanho_atual() * 1.5)
+	cache.salvar_dataframe("nova", df)
+
+	assert cache.obter_dataframe("antiga") is None
+	assert cache.obter_dataframe("nova") is not None
+
+
+def test_associador_reaproveita_cache(cache, dados_associador, monkeypatch):
+	"""Testa se entradas inalteradas não refazem o cálculo geométrico."""
+	esperado_residencias = Associador(*dados_associador, cache=cache).associar_residencias_a_pontos()
+	esperado_linhas = Associador(*dados_associador, cache=cache).associar_ponto_a_linha(metodo="strtree")
+
+	associador = Associador(*dados_associador, cache=cache)
+	monkeypatch.setattr(associador, "_associar_residencias_kdtree", lambda: pytest.fail("Associação recalculada"))
+	monkeypatch.setattr(associador, "_associar_ponto_a_linha_strtree", lambda _: pytest.fail("Associação recalculada"))
+
+	pd.testing.assert_frame_equal(associador.associar_residencias_a_pontos(), esperado_residencias)
+	assert associador.associar_ponto_a_linha(metodo="strtree") == esperado_linhas
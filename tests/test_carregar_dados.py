@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quali_bus.data_analysis.calcular_indicadores import CalcularIndicadores
+from quali_bus.data_analysis.carregadar_dados import (
+	COLUNAS_ENTRADA,
+	carregar_pontualidade_em_lotes,
+	carregar_viagens_planejadas,
+	carregar_viagens_planejadas_em_lotes,
+	converter_csv_para_parquet,
+	ler_tabela,
+)
+
+
+@pytest.fixture
+def arquivo_rastreamento(tmp_path):
+	"""Fixture com um CSV de rastreamento de viagens, incluindo as colunas descartadas."""
+	rng = np.random.default_rng(1)
+	n = 250
+	horarios = rng.choice(["06:00", "-", "07:15"], size=(n, 4))
+	df = pd.DataFrame({
+		"data_viagem": "01/01/2024",
+		"id_linha": rng.choice(["1501", "4601", "0012"], size=n),
+		"sentido": rng.choice(["ida", "volta"], size=n),
+		"descricao_trajeto": rng.choice(["1501 - Centro (ida)", "4601 - Bairro (volta)", "0012 - Sul (ida)", "Garagem"], size=n),
+		"partida_planejada": horarios[:, 0],
+		"partida_real": horarios[:, 1],
+		"chegada_planejada": horarios[:, 2],
+		"chegada_real": horarios[:, 3],
+		"km_executado": rng.uniform(5, 10, size=n),
+	})
+	for coluna in [
+		"'Veiculo Planejado'",
+		"Veiculo Real",
+		"Motorista",
+		"Vel. Media Km",
+		"Temp.Ponto",
+		"Passageiro",
+		"Status da Viagem",
+		"Desc. Status da Viagem",
+		"Unnamed: 26",
+		"Unnamed: 25",
+		"Unnamed: 24",
+		"Empresa",
+		"Tabela",
+		"Viagem Editada",
+	]:
+		df[coluna] = "x"
+	caminho = tmp_path / "rastreamento.csv"
+	df.to_csv(caminho, index=False)
+	return caminho, df
+
+
+def test_carregar_viagens_planejadas_em_lotes(arquivo_rastreamento):
+	"""Testa se a leitura em lotes produz o mesmo resultado da leitura completa."""
+	caminho, _ = arquivo_rastreamento
+
+	esperado = carregar_viagens_planejadas(caminho)
+	resultado = carregar_viagens_planejadas_em_lotes(caminho, tamanho_lote=37)
+
+	pd.testing.assert_frame_equal(resultado, esperado, check_dtype=False, check_index_type=False)
+
+
+def test_carregar_pontualidade_em_lotes(arquivo_rastreamento):
+	"""Testa se a pontualidade calculada em lotes coincide com o cálculo em memória."""
+	caminho, df = arquivo_rastreamento
+
+	esperado = CalcularIndicadores().calcular_pontualidade(df.drop(columns=df.columns[9:]))
+	resultado = carregar_pontualidade_em_lotes(caminho, tamanho_lote=40)
+
+	pd.testing.assert_frame_equal(resultado, esperado)
+
+
+@pytest.mark.parametrize("extensao", [".csv", ".parquet", ".feather"])
+def test_ler_tabela_com_projecao(arquivo_rastreamento, tmp_path, extensao):
+	"""Testa a leitura de CSV, Parquet e Feather lendo apenas as colunas pedidas."""
+	caminho, df = arquivo_rastreamento
+	colunas = COLUNAS_ENTRADA["pontualidade"]
+	if extensao == ".parquet":
+		caminho = converter_csv_para_parquet(caminho, colunas=colunas, colunas_data=["data_viagem"])
+	elif extensao == ".feather":
+		caminho = tmp_path / "rastreamento.feather"
+		df.to_feather(caminho)
+
+	tabela = ler_tabela(caminho, colunas)
+
+	assert list(tabela.columns) == colunas
+	assert tabela["id_linha"].dtype == "string"
+	assert set(tabela["id_linha"]) == {"1501", "4601", "0012"}
+	pd.testing.assert_frame_equal(CalcularIndicadores().calcular_pontualidade(tabela), CalcularIndicadores().calcular_pontualidade(df[colunas]))
+	if extensao == ".parquet":
+		assert tabela["data_viagem"].dtype == "datetime64[ns]"
+
+
+def test_carregar_dados_arquivos(tmp_path):
+	"""Testa o carregamento das entradas a partir de arquivos com horários tipados pelo leitor colunar."""
+	frequencia = pd.DataFrame({
+		"id_linha": ["0012", "0012"],
+		"horario_inicio_jornada": ["06:00:00", "07:00:00"],
+		"horario_fim_jornada": ["06:30:00", "07:10:00"],
+		"data_jornada": ["01/01/2024", "02/01/2024"],
+		"sentido_viagem": ["IDA", "VOLTA"],
+		"quantidade_passageiros": [10, 20],
+		"coluna_extra": [1, 2],
+	})
+	frequencia.to_csv(tmp_path / "frequencia.csv", index=False)
+	converter_csv_para_parquet(tmp_path / "frequencia.csv")
+
+	for caminho in [tmp_path / "frequencia.csv", tmp_path / "frequencia.parquet"]:
+		tabela = ler_tabela(caminho, COLUNAS_ENTRADA["frequencia"])
+		resultado = CalcularIndicadores().frequencia_atendimento_pontuacao(tabela)
+		assert resultado["id_linha"].tolist() == ["0012"]
+		assert resultado["frequencia_atendimento_pontuacao"].tolist() == [20.0]
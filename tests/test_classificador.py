@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from quali_bus.data_analysis.classificar_indicadores import ClassificarIndicadores
@@ -128,3 +129,40 @@ def test_classificar_linhas(classificator):
 	assert len(classificacao) == 1
 	assert all(classificacao.iloc[0, 1:] == [3, 2, 3, 3, 3, 3, 3, 3, 3, 3])
 	assert classificacao.columns.tolist() == ["id_linha", "I1", "I2", "I3", "I4", "I5", "I6", "I7", "I8", "I9", "I10"]
+
+
+def test_classificar_linhas_vetorizado_igual_escalar(classificator):
+	"""Testa se a classificação vetorizada reproduz os métodos escalares, inclusive nos limites das faixas."""
+	limites = [0, 0.5, 0.7, 0.8, 0.85, 0.9, 0.95, 0.97, 0.98, 0.99, 0.995, 1.0, 1.2, 10, 12, 15, 20, 30, 50, 100, 150, 200, 300, 400, 500]
+	valores = np.array(limites + list(np.random.default_rng(0).uniform(0, 1.1, 30)))
+	textos = list(ClassificarIndicadores.TABELAS["I3"]) + list(ClassificarIndicadores.TABELAS["I9"]) + [" Outro ", "Aumento inferior ao índice"]
+	n = len(valores)
+	dados = pd.DataFrame({
+		"id_linha": [f"L{i}" for i in range(n)],
+		"indicador_via_pavimentada": valores,
+		"distancia": valores[::-1],
+		"tipo_integracao": [f" {textos[i % len(textos)]} " for i in range(n)],
+		"pontualidade": np.roll(valores, 1),
+		"frequencia_atendimento_pontuacao": np.roll(valores, 2),
+		"cumprimento_itinerario": np.roll(valores, 3),
+		"proporcao": np.roll(valores, 4),
+		"indicador_treinamento_motorista": np.roll(valores, 5),
+		"disponibilidade_informacao": [(" " if i % 3 == 0 else "") + textos[(i + 1) % len(textos)] for i in range(n)],
+		"valor_tarifa": [list(ClassificarIndicadores.TABELAS["I10"])[i % 3] + (" " if i % 2 else "") for i in range(n)],
+	})
+
+	pd.testing.assert_frame_equal(classificator.classificar_linhas(dados), classificator.classificar_linhas(dados, vetorizado=False))
+	metodos = {
+		"I3": classificator.integracao_municipal_pontuacao,
+		"I9": classificator.informacao_internet_pontuacao,
+		"I10": classificator.valor_tarifa_pontuacao,
+	}
+	for indicador, metodo in metodos.items():
+		valores = dados[ClassificarIndicadores.COLUNAS_INDICADORES[indicador]]
+		assert classificator.pontuar_indicador(indicador, valores.to_numpy()).tolist() == [metodo(valor) for valor in valores]
+
+
+def test_pontuar_faixas_valores_ausentes(classificator):
+	"""Testa se valores ausentes recebem a pontuação padrão, como nos métodos escalares."""
+	limites, pontuacoes = ClassificarIndicadores.FAIXAS["I4"]
+	np.testing.assert_array_equal(classificator.pontuar_faixas([np.nan, 0.96], limites, pontuacoes), [0, 3])
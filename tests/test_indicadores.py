@@ -1,6 +1,12 @@
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
+import shapely
 from quali_bus.data_analysis.calcular_indicadores import CalcularIndicadores
+from quali_bus.data_analysis.classificar_indicadores import ClassificarIndicadores
+from quali_bus.data_analysis.grafo_indicadores import GrafoIndicadores
+from quali_bus.utils.cores import cor_iqt
 
 
 @pytest.fixture
@@ -145,6 +151,27 @@ def test_calcular_iqt(calculator):
 	assert isinstance(iqt, float), "O resultado do IQT deve ser um número de ponto flutuante"
 
 
+def test_processar_iqt_em_lote(calculator):
+	"""
+	Testa se o IQT, as cores e as classificações em lote coincidem com o cálculo linha a linha.
+	"""
+	matriz = np.random.default_rng(0).integers(0, 4, size=(50, 10))
+	calculator.classificao_linhas = pd.DataFrame(matriz, columns=calculator.indicadores_prioridades["nomeclatura"])
+	calculator.classificao_linhas.insert(0, "id_linha", [f"L{i}" for i in range(50)])
+	calculator.dados_completos = pd.DataFrame({"id_linha": calculator.classificao_linhas["id_linha"], "geometria_linha": None})
+	for coluna in ClassificarIndicadores.COLUNAS_INDICADORES.values():
+		calculator.dados_completos[coluna] = 0
+
+	calculator.processar_iqt()
+
+	esperado = [calculator.calcular_iqt(linha) for linha in matriz.tolist()]
+	np.testing.assert_allclose(calculator.dados_completos["iqt"], esperado)
+	assert calculator.dados_completos["cor"].tolist() == [cor_iqt(iqt) for iqt in esperado]
+	classificador = ClassificarIndicadores()
+	assert calculator.dados_completos["classificacao_iqt"].tolist() == [classificador.classificacao_iqt_pontuacao(iqt) for iqt in esperado]
+	assert list(calculator.matriz["iqt"]) == list(calculator.dados_completos["iqt"])
+
+
 def test_carregar_dados(calculator, sample_lines, sample_frequencia_atendimento_pontuacao, sample_pontualidade, sample_cumprimento):
 	"""
 	Testa o método `carregar_dados` com todos os DataFrames.
@@ -155,3 +182,358 @@ def test_carregar_dados(calculator, sample_lines, sample_frequencia_atendimento_
 	assert not calculator.frequencia.empty, "Dados de frequência não carregados"
 	assert not calculator.pontualidade.empty, "Dados de pontualidade não carregados"
 	assert not calculator.cumprimento.empty, "Dados de cumprimento não carregados"
+
+
+@pytest.fixture
+def dados_pipeline():
+	"""
+	Fixture com linhas, frequência e pontualidade válidas para o pipeline completo.
+	"""
+	linhas = pd.DataFrame({
+		"id_linha": ["1501", "4601"],
+		"geometria_linha": [
+			"LINESTRING (-43.88156644059743 -16.70073765826833, -43.88142926517379 -16.69999706663925, -43.8820968983508 -16.69988680484133)",
+			"LINESTRING Z (-43.88190489230887 -16.69899957081534 0, -43.88129594299133 -16.69831881961529 0, -43.88098272312113 -16.69838557938928 0)",
+		],
+		"indicador_via_pavimentada": [1.0, 0.9],
+		"tipo_integracao": ["Integração tarifária temporal ocorre em determinados pontos, apenas com transferências intramodais", "Outra"],
+		"indicador_treinamento_motorista": [1.0, 0.96],
+		"disponibilidade_informacao": ["Possuir informações em site parcialmente atualizado", "Possuir informação em site desatualizado"],
+		"valor_tarifa": ["Não houve aumento da tarifa", "Aumento equivalente ao índice"],
+	})
+	frequencia = pd.DataFrame({
+		"id_linha": ["4601", "1501", "1501", "4601"],
+		"horario_inicio_jornada": ["06:00:00", "07:00:00", "08:00:00", "09:00:00"],
+		"horario_fim_jornada": ["06:20:00", "07:08:00", "08:12:00", "09:40:00"],
+		"data_jornada": ["01/01/2024", "01/01/2024", "02/01/2024", "02/01/2024"],
+		"sentido_viagem": ["IDA", "IDA", "VOLTA", "VOLTA"],
+		"quantidade_passageiros": [10, 20, 30, 40],
+	})
+	pontualidade = pd.DataFrame({
+		"data_viagem": ["01/01/2024", "01/01/2024", "02/01/2024", "02/01/2024", "02/01/2024"],
+		"id_linha": ["4601", "1501", "1501", "4601", "4601"],
+		"sentido": ["ida", "ida", "volta", "volta", "ida"],
+		"descricao_trajeto": ["4601 - IDA", "1501 - IDA", "1501 - VOLTA", "4601 - VOLTA", "4601 - IDA"],
+		"partida_planejada": ["06:00", "07:00", "-", "09:00", "-"],
+		"partida_real": ["06:01", "07:02", "-", "09:05", "-"],
+		"chegada_planejada": ["06:20", "07:08", "-", "09:40", "-"],
+		"chegada_real": ["06:22", "07:09", "-", "09:41", "-"],
+		"km_executado": [0.2, 0.25, 0.2, 0.1, 0.15],
+	})
+	return linhas, frequencia, pontualidade
+
+
+def test_calcular_indicadores_sob_demanda(calculator, dados_pipeline, monkeypatch):
+	"""
+	Testa se o grafo calcula apenas os nós necessários e reaproveita os resultados memorizados.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	calculator.preparar_indicadores(linhas, frequencia, pontualidade)
+
+	i4 = calculator.calcular_indicadores(["I4"])
+	assert list(i4.columns) == ["id_linha", "pontualidade", "I4"]
+	assert "frequencia" not in calculator.grafo.calculados()
+	assert "dados_linhas" not in calculator.grafo.calculados()
+
+	chamadas = []
+	original = calculator.calcular_pontualidade
+	monkeypatch.setattr(calculator, "calcular_pontualidade", lambda df: chamadas.append(1) or original(df))
+	calculator.grafo.registrar("pontualidade", calculator.carregar_pontualidade, ["entrada_pontualidade"])
+	resultado = calculator.calcular_indicadores(["I4", "I5", "I6"])
+	calculator.calcular_indicadores(["I4"])
+	assert len(chamadas) == 1
+
+	resultado = resultado.set_index("id_linha")
+	assert resultado.loc["1501", "pontualidade"] == 0.5
+	assert resultado.loc["1501", "frequencia_atendimento_pontuacao"] == 10
+	assert resultado.loc["1501", "I5"] == 3
+	cumprimento = calculator.grafo.calcular("cumprimento_itinerario").set_index("id_linha").loc[resultado.index]
+	np.testing.assert_allclose(resultado["cumprimento_itinerario"], cumprimento["km_executado"] / cumprimento["distancia_km"])
+	assert resultado.loc["1501", "cumprimento_itinerario"] > 1
+
+
+def test_preparar_indicadores_declara_colunas_lidas(calculator, dados_pipeline):
+	"""
+	Testa se os nós de carga declaram todas as colunas que leem, acusando a falta antes do cálculo.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	grafo = calculator.preparar_indicadores(linhas, frequencia, pontualidade)
+
+	assert {"sentido", "descricao_trajeto", "partida_planejada", "partida_real"} <= set(grafo.nos["pontualidade"].colunas)
+	assert "data_jornada" in grafo.nos["frequencia"].colunas
+
+	calculator.preparar_indicadores(linhas, frequencia, pontualidade.drop(columns="partida_real"))
+	with pytest.raises(KeyError, match="partida_real"):
+		calculator.calcular_indicadores(["I4"])
+
+
+def test_grafo_indicadores_ciclo_e_colunas():
+	"""
+	Testa os erros de ciclo de dependências e de colunas de entrada ausentes.
+	"""
+	grafo = GrafoIndicadores()
+	grafo.registrar("a", lambda b: b, ["b"])
+	grafo.registrar("b", lambda a: a, ["a"])
+	with pytest.raises(ValueError):
+		grafo.calcular("a")
+
+	grafo.adicionar_entrada("entrada", pd.DataFrame({"id_linha": ["1"]}))
+	grafo.registrar("c", lambda df: df, ["entrada"], ["id_linha", "pontualidade"])
+	with pytest.raises(KeyError):
+		grafo.calcular("c")
+
+
+@pytest.mark.parametrize("n_workers, tipo_pool", [(3, "thread"), (2, "processo")])
+def test_carregar_dados_concorrente(dados_pipeline, n_workers, tipo_pool):
+	"""
+	Testa se as etapas executadas em paralelo produzem os mesmos dados da execução sequencial.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	pontos = pd.DataFrame({"longitude": [-43.8815, -43.8812, -43.8810], "latitude": [-16.7006, -16.6985, -16.6984]})
+	residencias = pd.DataFrame({"longitude": [-43.8816, -43.8811, -43.8820], "latitude": [-16.7001, -16.6990, -16.6999]})
+
+	sequencial, paralelo = CalcularIndicadores(), CalcularIndicadores()
+	sequencial.carregar_dados(linhas, frequencia, pontualidade, pontos, residencias)
+	paralelo.carregar_dados(linhas, frequencia, pontualidade, pontos, residencias, n_workers=n_workers, tipo_pool=tipo_pool)
+
+	for atributo in ["frequencia", "pontualidade", "cumprimento", "dados_geograficos"]:
+		pd.testing.assert_frame_equal(getattr(paralelo, atributo), getattr(sequencial, atributo))
+	assert isinstance(paralelo.associador.consolidado, pd.DataFrame)
+
+	with pytest.raises(ValueError):
+		paralelo.carregar_dados(linhas, frequencia, pontualidade, tipo_pool="gpu")
+
+
+@pytest.mark.parametrize("perfil_memoria", [False, True])
+def test_carregar_dados_processos_apos_grafo(dados_pipeline, perfil_memoria):
+	"""
+	Testa se o pool de processos funciona depois que o grafo preguiçoso (com funções locais) foi montado.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	calculadora = CalcularIndicadores(perfil_memoria=perfil_memoria)
+	calculadora.carregar_dados(linhas, frequencia, pontualidade)
+	calculadora.preparar_indicadores(linhas, frequencia, pontualidade)
+	esperado = {atributo: getattr(calculadora, atributo) for atributo in ["frequencia", "pontualidade", "cumprimento"]}
+
+	calculadora.carregar_dados(linhas, frequencia, pontualidade, n_workers=2, tipo_pool="processo")
+
+	for atributo, df in esperado.items():
+		pd.testing.assert_frame_equal(getattr(calculadora, atributo), df)
+
+
+def test_frequencia_atendimento_pontuacao_segundos_inteiros(calculator, dados_pipeline):
+	"""
+	Testa se a frequência calculada com segundos inteiros coincide com a conversão linha a linha.
+	"""
+	_, frequencia, _ = dados_pipeline
+	frequencia = frequencia.assign(horario_fim_jornada=["06:20:59", "07:08:00", "08:12:30", "08:40:00"])
+
+	resultado = calculator.frequencia_atendimento_pontuacao(frequencia)
+
+	duracao = pd.to_datetime(frequencia["horario_fim_jornada"], format="%H:%M:%S") - pd.to_datetime(
+		frequencia["horario_inicio_jornada"], format="%H:%M:%S"
+	)
+	esperado = frequencia.assign(minutos=duracao.apply(lambda x: int(x.total_seconds() / 60))).groupby("id_linha")["minutos"].mean()
+	np.testing.assert_allclose(resultado.set_index("id_linha")["frequencia_atendimento_pontuacao"], esperado.to_numpy())
+
+
+def test_calcular_iqt_periodos(calculator, dados_pipeline):
+	"""
+	Testa o IQT por período e em janela móvel contra o cálculo sobre os dados filtrados.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	calculator.dados_linhas = calculator.carregar_dados_linha(linhas)
+
+	resultado = calculator.calcular_iqt_periodos(frequencia, pontualidade, granularidade="dia", janelas=[2])
+	mensal = calculator.calcular_iqt_periodos(frequencia, pontualidade)
+
+	assert set(resultado["janela"]) == {1, 2}
+	assert len(mensal) == 2 and (mensal["periodo"] == pd.Timestamp("2024-01-01")).all()
+
+	def esperado(freq, pont):
+		referencia = CalcularIndicadores()
+		referencia.preparar_indicadores(linhas, freq, pont)
+		return referencia.calcular_indicadores(["I4", "I5", "I6"]).set_index("id_linha")
+
+	colunas = ["pontualidade", "frequencia_atendimento_pontuacao", "cumprimento_itinerario", "I4", "I5", "I6"]
+	completo = esperado(frequencia, pontualidade)[colunas]
+	janela = resultado[(resultado["janela"] == 2) & (resultado["periodo"] == pd.Timestamp("2024-01-02"))].set_index("id_linha")[colunas]
+	pd.testing.assert_frame_equal(janela.sort_index(), completo.sort_index(), check_dtype=False, check_index_type=False)
+	pd.testing.assert_frame_equal(
+		mensal.set_index("id_linha")[colunas].sort_index(), completo.sort_index(), check_dtype=False, check_index_type=False
+	)
+
+	dia = esperado(frequencia[frequencia["data_jornada"] == "02/01/2024"], pontualidade[pontualidade["data_viagem"] == "02/01/2024"])[colunas]
+	diario = resultado[(resultado["janela"] == 1) & (resultado["periodo"] == pd.Timestamp("2024-01-02"))].set_index("id_linha")[colunas]
+	pd.testing.assert_frame_equal(diario.sort_index(), dia.sort_index(), check_dtype=False, check_index_type=False)
+	matriz = resultado[calculator.indicadores_prioridades["nomeclatura"]].to_numpy()
+	np.testing.assert_allclose(resultado["iqt"], calculator.calcular_iqt_lote(matriz))
+
+
+def test_acumular_viagens_incremental(calculator, dados_pipeline, tmp_path):
+	"""
+	Testa se acumular lotes diários (com salvamento entre execuções) equivale a processar o histórico completo.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	for data in ["01/01/2024", "02/01/2024"]:
+		if data != "01/01/2024":
+			calculator = CalcularIndicadores()
+			calculator.carregar_estatisticas(tmp_path / "estatisticas.csv")
+		calculator.acumular_viagens(frequencia[frequencia["data_jornada"] == data], pontualidade[pontualidade["data_viagem"] == data])
+		calculator.salvar_estatisticas(tmp_path / "estatisticas.csv")
+
+	completo = CalcularIndicadores()
+	esperados = {
+		"frequencia": completo.frequencia_atendimento_pontuacao(frequencia),
+		"pontualidade": completo.calcular_pontualidade(pontualidade),
+		"cumprimento": completo.cumprimento_itinerario(pontualidade),
+	}
+	for atributo, esperado in esperados.items():
+		resultado = getattr(calculator, atributo).sort_values("id_linha").reset_index(drop=True)
+		pd.testing.assert_frame_equal(resultado, esperado.sort_values("id_linha").reset_index(drop=True))
+
+	calculator.dados_linhas = calculator.carregar_dados_linha(linhas)
+	indicadores = calculator.indicadores_acumulados().set_index("id_linha")
+	assert indicadores.loc["1501", "pontualidade"] == 0.5
+	assert {"I4", "I5", "I6", "iqt", "classificacao_iqt"} <= set(indicadores.columns)
+
+
+def test_perfil_memoria(dados_pipeline):
+	"""
+	Testa se o perfil de memória mantém 'id_linha' categórico e produz as mesmas pontuações e IQT.
+
+	Inclui indicadores exatamente sobre os limiares das faixas.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	linhas = linhas.assign(indicador_via_pavimentada=[0.95, 0.9], indicador_treinamento_motorista=[0.98, 0.90])
+	pontos = pd.DataFrame({"longitude": [-43.8815, -43.8812, -43.8810], "latitude": [-16.7006, -16.6985, -16.6984]})
+	residencias = pd.DataFrame({"longitude": [-43.8816, -43.8811, -43.8820], "latitude": [-16.7001, -16.6990, -16.6999]})
+
+	resultados = []
+	for perfil_memoria in [False, True]:
+		calculadora = CalcularIndicadores(perfil_memoria=perfil_memoria)
+		calculadora.carregar_dados(linhas, frequencia, pontualidade, pontos, residencias)
+		calculadora.classificar_linha()
+		calculadora.processar_iqt()
+		resultados.append(calculadora)
+
+	padrao, otimizado = resultados
+	for atributo in ["frequencia", "pontualidade", "cumprimento"]:
+		assert isinstance(getattr(otimizado, atributo)["id_linha"].dtype, pd.CategoricalDtype)
+		pd.testing.assert_frame_equal(getattr(otimizado, atributo).astype({"id_linha": "string"}), getattr(padrao, atributo))
+	pd.testing.assert_frame_equal(
+		otimizado.classificao_linhas.astype({"id_linha": "string"}), padrao.classificao_linhas.astype({"id_linha": "string"}), check_dtype=False
+	)
+	assert padrao.classificao_linhas.set_index("id_linha").loc["1501", ["I1", "I8"]].tolist() == [2, 2]
+	np.testing.assert_allclose(otimizado.dados_completos["iqt"], padrao.dados_completos["iqt"])
+	assert len(padrao.dados_completos) == 2
+
+
+def test_perfil_memoria_etapas_posteriores(dados_pipeline):
+	"""
+	Testa se 'id_linha' continua categórico na junção, no grafo, nos períodos e no acúmulo, com os mesmos resultados.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	resultados = []
+	for perfil_memoria in [False, True]:
+		calculadora = CalcularIndicadores(perfil_memoria=perfil_memoria)
+		calculadora.carregar_dados(linhas, frequencia, pontualidade)
+		calculadora.dados_geograficos = pd.DataFrame({"id_linha": ["1501", "4601"], "distancia": [200.0, 100.0], "proporcao": [0.5, 1.0]})
+		calculadora.merge_dados()
+		calculadora.preparar_indicadores(linhas, frequencia, pontualidade)
+		etapas = {
+			"dados_completos": pd.DataFrame(calculadora.dados_completos.drop(columns="geometria_linha")),
+			"grafo": calculadora.calcular_indicadores(["I4", "I5", "I6"]),
+			"estatisticas": calculadora._estatisticas_frequencia(frequencia, calculadora._tipo_id_comum(frequencia["id_linha"])),
+			"periodos": calculadora.calcular_iqt_periodos(frequencia, pontualidade),
+		}
+		calculadora.acumular_viagens(frequencia, pontualidade)
+		etapas["frequencia_acumulada"] = calculadora.frequencia
+		resultados.append(etapas)
+
+	padrao, otimizado = resultados
+	for etapa, df in otimizado.items():
+		assert isinstance(df["id_linha"].dtype, pd.CategoricalDtype), etapa
+		pd.testing.assert_frame_equal(
+			df.astype({"id_linha": "string"}).sort_values("id_linha", kind="stable").reset_index(drop=True),
+			padrao[etapa].astype({"id_linha": "string"}).sort_values("id_linha", kind="stable").reset_index(drop=True),
+			check_dtype=False,
+			check_categorical=False,
+		)
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_merge_dados_alinhado_por_id_linha(dados_pipeline, capsys):
+	"""
+	Testa se a junção independe da ordem das linhas e informa as linhas sem correspondência.
+	"""
+	linhas, frequencia, pontualidade = dados_pipeline
+	calculadora = CalcularIndicadores()
+	calculadora.carregar_dados(linhas, frequencia, pontualidade)
+	calculadora.cumprimento = calculadora.cumprimento.iloc[::-1].reset_index(drop=True)
+	calculadora.dados_geograficos = pd.DataFrame({
+		"id_linha": ["4601", "1501", "9999"],
+		"distancia": [100.0, 200.0, 300.0],
+		"proporcao": [1.0, 0.5, 0.0],
+	})
+
+	calculadora.merge_dados()
+
+	completos = calculadora.dados_completos.set_index("id_linha")
+	assert isinstance(calculadora.dados_completos, gpd.GeoDataFrame)
+	assert sorted(completos.index) == ["1501", "4601"]
+	np.testing.assert_allclose(completos["cumprimento_itinerario"], completos["km_executado"] / completos["distancia_km"])
+	assert completos.loc["1501", "distancia"] == 200.0
+	assert calculadora.linhas_sem_correspondencia == {
+		"dados_linhas": ["9999"],
+		"cumprimento": ["9999"],
+		"frequencia": ["9999"],
+		"pontualidade": ["9999"],
+	}
+	assert "9999" in capsys.readouterr().out
+
+
+def test_carregar_dados_linha_wkb(dados_pipeline):
+	"""
+	Testa se geometrias em WKB e WKB hexadecimal produzem as mesmas LineStrings 2D que o WKT.
+	"""
+	linhas, _, _ = dados_pipeline
+	calculadora = CalcularIndicadores()
+	esperado = calculadora.carregar_dados_linha(linhas)
+	geometrias = shapely.from_wkt(linhas["geometria_linha"].to_numpy())
+
+	for valores in (shapely.to_wkb(geometrias), shapely.to_wkb(geometrias, hex=True)):
+		resultado = calculadora.carregar_dados_linha(linhas.assign(geometria_linha=valores))
+		assert not shapely.has_z(resultado.geometry.values).any()
+		assert resultado.geometry.geom_equals_exact(esperado.geometry, tolerance=0).all()
+
+	invalidas = linhas.assign(geometria_linha=["LINESTRING (0 0, 1 1)", "POINT (0 0)"])
+	assert not calculadora._validar_geometry_wkt(invalidas).iloc[1]
+	assert calculadora.carregar_dados_linha(invalidas).empty
+
+
+def test_cria_geometry_pontos_rota(dados_pipeline, capsys):
+	"""
+	Testa a extração vetorizada dos vértices das rotas, com e sem objetos Point, pulando valores que não são LineString.
+	"""
+	linhas, _, _ = dados_pipeline
+	calculadora = CalcularIndicadores()
+	dados_linhas = calculadora.carregar_dados_linha(linhas)
+	dados_linhas.loc[len(dados_linhas)] = dados_linhas.iloc[0]
+	dados_linhas.loc[2, ["id_linha", "geometria_linha"]] = ["9999", shapely.Point(0, 0)]
+	dados_linhas = pd.concat([dados_linhas, pd.DataFrame({"id_linha": ["8888"], "geometria_linha": ["LINESTRING (0 0, 1 1)"]})], ignore_index=True)
+
+	pontos = calculadora._cria_geometry_pontos_rota(dados_linhas)
+
+	saida = capsys.readouterr().out
+	assert "linha 2 não é um LineString" in saida and "linha 3 não é um LineString" in saida
+	assert pontos.crs.to_epsg() == 32723
+	assert pontos["id_linha"].tolist() == ["1501"] * 3 + ["4601"] * 3
+	assert pontos["ponto_ordem"].tolist() == [0, 1, 2, 0, 1, 2]
+	esperado = np.concatenate([shapely.get_coordinates(geometria) for geometria in dados_linhas["geometria_linha"][:2]])
+	np.testing.assert_array_equal(shapely.get_coordinates(pontos.geometry.values), esperado)
+
+	id_linha, ponto_ordem, coordenadas = calculadora._cria_geometry_pontos_rota(dados_linhas, retornar_arrays=True)
+	assert id_linha.tolist() == pontos["id_linha"].tolist()
+	np.testing.assert_array_equal(ponto_ordem, pontos["ponto_ordem"])
+	np.testing.assert_array_equal(coordenadas, esperado)
@@ -0,0 +1,86 @@
+import hashlib
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import Geod
+from shapely.geometry import LineString, MultiLineString
+from quali_bus.utils import geodesia
+from quali_bus.utils.geodesia import _COMPRIMENTOS, comprimentos_geodesicos, limpar_cache_comprimentos
+from quali_bus.utils.utils import converter_para_datetime, converter_unicos, duracao_em_segundos, horario_para_segundos, otimizar_memoria
+
+
+def test_converter_unicos_igual_to_datetime():
+	"""Testa se a conversão por valores distintos coincide com pd.to_datetime, inclusive com ausentes."""
+	serie = pd.Series(["01/02/2024", "03/02/2024", None, "01/02/2024"], index=[10, 11, 12, 13], name="data")
+
+	convertida = converter_unicos(serie, "%d/%m/%Y")
+
+	pd.testing.assert_series_equal(convertida, pd.to_datetime(serie, format="%d/%m/%Y"))
+	df = converter_para_datetime(pd.DataFrame({"data": serie}), "data", "%d/%m/%Y")
+	assert df["data"].dtype == "datetime64[ns]"
+
+
+def test_duracao_em_segundos():
+	"""Testa a conversão de horários em segundos inteiros e o cálculo de durações."""
+	inicio = pd.Series(["06:00:00", "23:50:00", "06:00:00", np.nan])
+	fim = pd.Series(["06:20:30", "00:10:00", "07:00:00", "08:00:00"])
+
+	assert horario_para_segundos(inicio).tolist()[:3] == [21600, 85800, 21600]
+	duracao = duracao_em_segundos(inicio, fim)
+	assert duracao.dtype == "Int64"
+	assert duracao.tolist()[:3] == [1230, -85200, 3600]
+	assert pd.isna(duracao.iloc[3])
+
+
+def test_otimizar_memoria():
+	"""Testa a conversão de chaves para categorias, a redução de inteiros e os horários em segundos."""
+	df = pd.DataFrame({
+		"id_linha": ["1501", "4601", "1501"],
+		"quantidade_passageiros": [10, 20, 30],
+		"km_executado": [1.5, 2.0, 2.5],
+		"horario_inicio_jornada": ["06:00:00", "06:30:00", "07:00:00"],
+	})
+
+	otimizado = otimizar_memoria(df, colunas_horario=["horario_inicio_jornada"])
+
+	assert isinstance(otimizado["id_linha"].dtype, pd.CategoricalDtype)
+	assert otimizado["quantidade_passageiros"].dtype == np.int8
+	assert otimizado["km_executado"].dtype == np.float64
+	assert otimizado["horario_inicio_jornada"].tolist() == [21600, 23400, 25200]
+	assert horario_para_segundos(otimizado["horario_inicio_jornada"]).tolist() == [21600, 23400, 25200]
+	assert df["id_linha"].dtype == object
+
+
+def test_comprimentos_geodesicos():
+	"""Testa o comprimento geodésico vetorizado, a independência do CRS e a memorização por geometria."""
+	linha = LineString([(-48.5, -15.8), (-48.4, -15.8), (-48.4, -15.7)])
+	multilinha = MultiLineString([[(-48.5, -15.8), (-48.4, -15.8)], [(-48.4, -15.7), (-48.3, -15.7)]])
+	geometrias = gpd.GeoSeries([linha, None, multilinha, linha], crs=4326)
+	geod = Geod(ellps="WGS84")
+	esperado_multilinha = geod.line_length([-48.5, -48.4], [-15.8, -15.8]) + geod.line_length([-48.4, -48.3], [-15.7, -15.7])
+	limpar_cache_comprimentos()
+
+	comprimentos = comprimentos_geodesicos(geometrias)
+
+	np.testing.assert_allclose(comprimentos[[0, 2, 3]], [geod.geometry_length(linha), esperado_multilinha, geod.geometry_length(linha)])
+	assert np.isnan(comprimentos[1])
+	assert len(_COMPRIMENTOS) == 3
+	np.testing.assert_allclose(comprimentos_geodesicos(geometrias.to_crs(31983)), comprimentos)
+
+
+def test_comprimentos_geodesicos_cache_limitado(monkeypatch):
+	"""Testa se a memória dos comprimentos descarta as geometrias usadas há mais tempo ao atingir o limite."""
+	monkeypatch.setattr(geodesia, "TAMANHO_MAX_CACHE", 2)
+	linhas = [LineString([(-48.5, -15.8), (-48.5 + 0.01 * i, -15.7)]) for i in range(1, 4)]
+	limpar_cache_comprimentos()
+
+	primeiros = comprimentos_geodesicos(gpd.GeoSeries(linhas[:2], crs=4326))
+	comprimentos_geodesicos(gpd.GeoSeries(linhas[:1], crs=4326))
+	comprimentos_geodesicos(gpd.GeoSeries(linhas[2:], crs=4326))
+
+	assert len(_COMPRIMENTOS) == 2
+	chave_descartada = ("EPSG:4326", hashlib.blake2b(shapely.to_wkb(linhas[1]), digest_size=16).digest())
+	assert chave_descartada not in _COMPRIMENTOS
+	np.testing.assert_allclose(comprimentos_geodesicos(gpd.GeoSeries(linhas[:2], crs=4326)), primeiros)